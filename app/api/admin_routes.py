@@ -1,38 +1,57 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from app.api.deps import require_admin
+from app.api.templating import render, render_cached
+from app.services.firestore_service import list_doctors_page_async
 
-router = APIRouter()
-templates = Jinja2Templates(directory="app/api/templates")
+# 모든 관리자 화면 / API 는 관리자 세션 필요 (app/api/deps.py)
+router = APIRouter(dependencies=[Depends(require_admin)])
 
-# 기존 HTML 기반 관리자 화면
+# 한 페이지에 보여 줄 의사 수
+DIRECTORY_PAGE_SIZE = 50
+
+# 보건소는 세션 값만, 잘못된 next 는 400
+async def _directory_page(session: dict, limit: int, next_token: str | None, department: str | None):
+    try:
+        return await list_doctors_page_async(session["hospital_id"], limit, next_token, department)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 기존 HTML 기반 관리자 화면 (로그인한 관리자의 보건소 의사 목록, 페이지 단위)
 @router.get("/admin/employees", response_class=HTMLResponse)
-async def admin_employees(request: Request):
-    employees = [
-        {"name": "김현수", "email": "hkim@example.com", "department": "내과"},
-        {"name": "이서연", "email": "slee@example.com", "department": "소아과"},
-    ]
-    return templates.TemplateResponse("admin_employees.html", {
-        "request": request,
-        "employees": employees
+async def admin_employees(
+    request: Request,
+    department: str | None = None,
+    next: str | None = None,
+    session: dict = Depends(require_admin)
+):
+    employees, next_token = await _directory_page(session, DIRECTORY_PAGE_SIZE, next, department)
+    return render(request, "admin_employees.html", {
+        "employees": employees,
+        "department": department,
+        "next_token": next_token,
+        "active_tab": "employees"
     })
 
 @router.get("/admin/manage", response_class=HTMLResponse)
 async def admin_manage_page(request: Request):
-    return templates.TemplateResponse("admin_manage.html", {"request": request})
+    return render_cached(request, "admin_manage.html", active_tab="manage")
 
-# ✅ JSON 기반 직원 목록 API
+# ✅ JSON 기반 직원 목록 API (next 로 다음 페이지)
 @router.get("/api/admin/employees")
-async def get_employees_api():
-    employees = [
-        {"name": "김현수", "email": "hkim@example.com", "department": "내과"},
-        {"name": "이서연", "email": "slee@example.com", "department": "소아과"},
-    ]
+async def get_employees_api(
+    limit: int = Query(DIRECTORY_PAGE_SIZE, ge=1, le=200),
+    next: str | None = Query(None, description="이전 응답의 next"),
+    department: str | None = None,
+    session: dict = Depends(require_admin)
+):
+    employees, next_token = await _directory_page(session, limit, next, department)
     return {
         "status_code": 200,
         "message": "직원 목록 조회 완료",
-        "data": employees
+        "data": employees,
+        "next": next_token
     }
 
 # ✅ JSON 기반 관리자 페이지 안내
@@ -1,12 +1,17 @@
+from urllib.parse import urlsplit
+
 from fastapi import APIRouter, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
+from app.api.deps import clear_session_cookie, client_ip, set_session_cookie
+from app.api.templating import render, render_cached
+from app.core.config import SESSION_TTL
 from app.services.auth_service import process_login
+from app.services.session_service import issue_token
+from app.utils.serialization import FastJSONResponse
 from fastapi import status
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/api/templates")
 
 # 🔁 역할 한글 ↔ 영문 코드 매핑
 ROLE_MAP = {
@@ -32,10 +37,44 @@ class AdminLoginRequest(BaseModel):
     public_health_center: str
     password: str
 
+# 로그인 결과 → 세션 토큰
+def _issue(result: dict) -> str:
+    return issue_token(
+        result["hospital_id"],
+        result["role"],
+        doctor_id=result.get("doctor_id"),
+        department=result.get("department"),
+        license_number=result.get("license_number"),
+    )
+
+# 시도 제한에 걸린 API 로그인 → 429 + Retry-After
+def _rate_limited_response(result: dict):
+    return FastJSONResponse(
+        {"status_code": status.HTTP_429_TOO_MANY_REQUESTS, "error": result["error"], "retry_after": result["retry_after"]},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={"Retry-After": str(result["retry_after"])},
+    )
+
+# 로그인 후 돌아갈 주소는 같은 사이트 경로만 허용
+# 브라우저는 역슬래시를 "/" 로 바꾸고 탭 / 줄바꿈을 지우므로 ("/\evil.com" → "//evil.com") 이런 문자가 있으면 거절
+def _safe_next(next_url: str | None) -> str | None:
+    if not next_url or not next_url.startswith("/") or next_url.startswith("//"):
+        return None
+    if "\\" in next_url or any(ord(ch) < 0x20 or ord(ch) == 0x7F for ch in next_url):
+        return None
+    parts = urlsplit(next_url)
+    if parts.scheme or parts.netloc:
+        return None
+    return next_url
+
 # 🖥 1. 브라우저용 로그인 페이지 렌더링
 @router.get("/login", response_class=HTMLResponse)
-async def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+async def login_page(request: Request, next: str | None = None):
+    # 돌아갈 주소가 없는 기본 로그인 화면은 한 번 그린 것을 재사용
+    next = _safe_next(next)
+    if next is None:
+        return render_cached(request, "login.html")
+    return render(request, "login.html", {"next": next})
 
 # 🖥 2. 브라우저 폼 제출용 로그인 처리
 @router.post("/login")
@@ -44,39 +83,53 @@ async def login_form(
     public_health_center: str = Form(...),
     role: str = Form(...),
     department: str = Form(None),
-    password: str = Form(...)
+    password: str = Form(...),
+    next: str = Form(None)
 ):
     role = ROLE_MAP.get(role, role)
 
-    result = await process_login(public_health_center, role, department, password)
+    result = await process_login(public_health_center, role, department, password, client_ip=client_ip(request))
 
     if result.get("message"):
-        if role == "doctor":
-            return RedirectResponse(url="/doctor/consultation", status_code=302)
-        elif role == "admin":
-            return RedirectResponse(url="/admin/employees", status_code=302)
+        home = "/doctor/consultation" if role == "doctor" else "/admin/employees"
+        response = RedirectResponse(url=_safe_next(next) or home, status_code=302)
+        set_session_cookie(response, _issue(result))
+        return response
     else:
-        return templates.TemplateResponse("login.html", {
-            "request": request,
+        return render(request, "login.html", {
+            "next": _safe_next(next),
             "error": result.get("error", "로그인 실패")
-        })
+        }, status_code=429 if result.get("rate_limited") else 200)
+
+# 🖥 로그아웃 (세션 쿠키 삭제)
+@router.get("/logout")
+async def logout():
+    response = RedirectResponse(url="/login", status_code=302)
+    clear_session_cookie(response)
+    return response
 
 # ✅ 3. 의사 로그인 (Postman/API용)
 @router.post("/api/login/doctor")
-async def login_doctor_api(data: DoctorLoginRequest):
+async def login_doctor_api(data: DoctorLoginRequest, request: Request):
     result = await process_login(
         public_health_center=data.public_health_center,
         role="doctor",
         department=data.department,
-        password=data.password
+        password=data.password,
+        client_ip=client_ip(request)
     )
+    if result.get("rate_limited"):
+        return _rate_limited_response(result)
 
     if result.get("message"):
         return {
             "status_code": status.HTTP_200_OK,
             "message": result["message"],
             "role": "doctor",
-            "redirect_url": "/doctor/consultation"
+            "redirect_url": "/doctor/consultation",
+            "access_token": _issue(result),
+            "token_type": "bearer",
+            "expires_in": SESSION_TTL
         }
 
     return {
@@ -86,20 +139,26 @@ async def login_doctor_api(data: DoctorLoginRequest):
 
 # ✅ 4. 관리자 로그인 (Postman/API용)
 @router.post("/api/login/admin")
-async def login_admin_api(data: AdminLoginRequest):
+async def login_admin_api(data: AdminLoginRequest, request: Request):
     result = await process_login(
         public_health_center=data.public_health_center,
         role="admin",
         department=None,
-        password=data.password
+        password=data.password,
+        client_ip=client_ip(request)
     )
+    if result.get("rate_limited"):
+        return _rate_limited_response(result)
 
     if result.get("message"):
         return {
             "status_code": status.HTTP_200_OK,
             "message": result["message"],
             "role": "admin",
-            "redirect_url": "/admin/employees"
+            "redirect_url": "/admin/employees",
+            "access_token": _issue(result),
+            "token_type": "bearer",
+            "expires_in": SESSION_TTL
         }
 
     return {
@@ -1,8 +1,16 @@
 # app/api/common_routes.py
 
 from fastapi import APIRouter, UploadFile, File, Body
+from pydantic import BaseModel
 # from app.services.storage_service import upload_profile_image
-from app.services.fcm_service import send_push_notification
+from app.services.fcm_service import send_push_notifications_async
+from app.services.notification_outbox import enqueue_notification_async, notification_outbox_stats_async
+from app.services.executor import blocking_executor
+from app.services.password_service import password_hash_stats
+from app.services.auth_service import login_limit_stats
+from app.services.dynamodb_service import hospital_index
+from app.api.templating import template_stats
+from app.utils.request_profile import route_profiles
 
 router = APIRouter()
 
@@ -26,9 +34,83 @@ async def push_notification(
     body: str = Body(...),
     data: dict = Body(default={})
 ):
-    response = send_push_notification(token, title, body, data)
+    # FCM 응답을 기다리지 않고 아웃박스에 넣은 뒤 바로 응답 (전송은 백그라운드 워커)
+    notification_id, coalesced = await enqueue_notification_async(token, title, body, data)
+    return {
+        "status_code": 202,
+        "message": "이미 대기 중인 같은 알림이 있음" if coalesced else "푸시 알림 전송 대기열에 추가됨",
+        "notification_id": notification_id,
+        "coalesced": coalesced
+    }
+
+# 📣 여러 명에게 한 번에 푸시 (tokens: 같은 내용, recipients: 수신자별 내용)
+class PushRecipient(BaseModel):
+    token: str
+    title: str | None = None
+    body: str | None = None
+    data: dict | None = None
+
+@router.post("/api/send-notification/batch")
+async def push_notification_batch(
+    title: str = Body(""),
+    body: str = Body(""),
+    data: dict = Body(default={}),
+    tokens: list[str] = Body(default=[]),
+    recipients: list[PushRecipient] = Body(default=[])
+):
+    targets = [{"token": token} for token in dict.fromkeys(tokens)]
+    targets += [recipient.model_dump(exclude_none=True) for recipient in recipients]
+    if not targets:
+        return {
+            "status_code": 400,
+            "message": "tokens 또는 recipients 가 필요합니다."
+        }
+
+    result = await send_push_notifications_async(targets, title, body, data)
+    return {
+        "status_code": 200,
+        "message": f"푸시 알림 {result['success_count']}/{len(targets)}건 전송됨",
+        "data": result
+    }
+
+# 📮 푸시 알림 아웃박스 상태 (대기 건수, 전송 지연)
+@router.get("/api/stats/notifications")
+async def notification_stats():
+    return {
+        "status_code": 200,
+        "data": await notification_outbox_stats_async()
+    }
+
+# 🧵 블로킹 호출 스레드 풀 상태 (대기/실행 중 작업 수, 평균 대기·실행 시간)
+# password_hash 는 비밀번호 해시 전용 풀
+@router.get("/api/stats/executor")
+async def executor_stats():
+    return {
+        "status_code": 200,
+        "data": blocking_executor.stats(),
+        "password_hash": password_hash_stats()
+    }
+
+# 🪣 로그인 시도 제한 / 없는 보건소 이름 캐시 상태
+@router.get("/api/stats/login")
+async def login_stats():
+    return {
+        "status_code": 200,
+        "data": {**login_limit_stats(), "hospital_index": hospital_index.stats()}
+    }
+
+# 🖼 템플릿 / 정적 파일 캐시 상태
+@router.get("/api/stats/templates")
+async def templates_stats():
+    return {
+        "status_code": 200,
+        "data": template_stats()
+    }
+
+# 🔬 라우트별 요청당 백엔드 사용량 (RCU / WCU, Firestore 문서 읽기·쓰기, 호출 수) — 읽기가 많은 순
+@router.get("/api/stats/profile")
+async def profile_stats(limit: int = 20):
     return {
         "status_code": 200,
-        "message": "푸시 알림 전송됨",
-        "fcm_response": response
-    }
\ No newline at end of file
+        "data": route_profiles.top(limit)
+    }
@@ -0,0 +1,105 @@
+# app/api/deps.py
+# 🔐 라우터에서 쓰는 로그인 세션 의존성
+#   웹 화면은 쿠키(SESSION_COOKIE_NAME), Postman / 앱은 Authorization: Bearer <token>
+#   router = APIRouter(dependencies=[Depends(require_doctor)]) 처럼 라우터 전체에 걸거나,
+#   session: dict = Depends(require_doctor) 로 받아서 핸들러 안에서 hospital_id / doctor_id 를 씀
+
+from urllib.parse import quote
+
+from fastapi import Request, Response
+from fastapi.responses import RedirectResponse
+
+from app.core.config import SESSION_COOKIE_NAME, SESSION_COOKIE_SECURE, SESSION_TTL, TRUSTED_PROXY_HOPS
+from app.services.session_service import verify_token
+from app.utils.exceptions import AuthError
+from app.utils.serialization import FastJSONResponse
+
+
+# 로그인 시도 제한용 클라이언트 IP
+# 프록시 뒤에서는 X-Forwarded-For 의 오른쪽 TRUSTED_PROXY_HOPS 번째 (신뢰하는 프록시가 직접 본 주소)
+# 클라이언트가 넣은 왼쪽 값은 쓰지 않음 (매 요청 바꿔서 IP 별 제한을 피할 수 있으므로)
+def client_ip(request: Request, trusted_hops: int | None = None) -> str:
+    if trusted_hops is None:
+        trusted_hops = TRUSTED_PROXY_HOPS
+    peer = request.client.host if request.client else "unknown"
+    if trusted_hops <= 0:
+        return peer
+    hops = [hop.strip() for value in request.headers.getlist("x-forwarded-for") for hop in value.split(",")]
+    hops = [hop for hop in hops if hop]
+    if len(hops) < trusted_hops:
+        return peer
+    return hops[-trusted_hops]
+
+
+def _token_from(request: Request) -> str | None:
+    authorization = request.headers.get("authorization")
+    if authorization:
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() == "bearer" and token:
+            return token.strip()
+    return request.cookies.get(SESSION_COOKIE_NAME)
+
+
+# 한 요청 안에서는 한 번만 검증 (라우터 의존성 + 핸들러 의존성이 겹쳐도)
+def get_session(request: Request) -> dict:
+    session = getattr(request.state, "session", None)
+    if session is not None:
+        return session
+    token = _token_from(request)
+    if not token:
+        raise AuthError("로그인이 필요합니다.")
+    claims = verify_token(token)
+    session = request.state.session = {
+        "hospital_id": claims["hid"],
+        "role": claims["role"],
+        "doctor_id": claims.get("did"),
+        "license_number": claims.get("lic"),
+        "department": claims.get("dep"),
+        "expires_at": claims["exp"],
+    }
+    return session
+
+
+# 검증은 수 µs 라서 async 로 둠 (sync 의존성은 요청마다 스레드 풀을 거침)
+def require_role(*roles: str):
+    async def dependency(request: Request) -> dict:
+        session = get_session(request)
+        if session["role"] not in roles:
+            raise AuthError("접근 권한이 없습니다.", status_code=403)
+        return session
+    return dependency
+
+require_doctor = require_role("doctor")
+require_admin = require_role("admin")
+
+
+def set_session_cookie(response: Response, token: str):
+    response.set_cookie(
+        SESSION_COOKIE_NAME,
+        token,
+        max_age=SESSION_TTL,
+        httponly=True,
+        secure=SESSION_COOKIE_SECURE,
+        samesite="lax",
+    )
+
+def clear_session_cookie(response: Response):
+    response.delete_cookie(SESSION_COOKIE_NAME)
+
+
+def _wants_html(request: Request) -> bool:
+    return not request.url.path.startswith("/api/") and "text/html" in request.headers.get("accept", "")
+
+
+# main.py 에서 app.add_exception_handler(AuthError, auth_error_handler) 로 등록
+async def auth_error_handler(request: Request, error: AuthError):
+    if _wants_html(request) and error.status_code == 401:
+        target = request.url.path + (f"?{request.url.query}" if request.url.query else "")
+        response = RedirectResponse(url=f"/login?next={quote(target)}", status_code=302)
+        clear_session_cookie(response)
+        return response
+    return FastJSONResponse(
+        {"status_code": error.status_code, "error": error.message},
+        status_code=error.status_code,
+        headers={"WWW-Authenticate": "Bearer"} if error.status_code == 401 else None,
+    )
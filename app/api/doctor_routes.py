@@ -1,73 +1,117 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel
+from app.api.deps import require_doctor
+from app.api.templating import render
+from app.services.executor import run_blocking
+from app.services.waiting_queue import get_watcher, load_consultation, waiting_queue_stats
+from app.utils.serialization import dumps
 
-router = APIRouter(prefix="/doctor", tags=["Doctor"])
-templates = Jinja2Templates(directory="app/api/templates")
-
-# ✅ 하드코딩된 진료 목록 (공통으로 사용)
-dummy_consultations = [
-    {
-        "consultation_id": "c123",
-        "name": "홍길동",
-        "birth": "040201",
-        "symptoms": "기침, 열",
-        "requested_at": "2025-04-22 10:30"
-    },
-    {
-        "consultation_id": "c124",
-        "name": "김미소",
-        "birth": "980912",
-        "symptoms": "발진, 두드러기",
-        "requested_at": "2025-04-22 11:00"
-    }
-]
+# 모든 의사 화면 / API 는 의사 세션 필요 (app/api/deps.py)
+router = APIRouter(prefix="/doctor", tags=["Doctor"], dependencies=[Depends(require_doctor)])
+
+# SSE 연결 유지용 주석 전송 간격(초) (프록시가 유휴 연결을 끊지 않도록)
+SSE_HEARTBEAT = 15.0
+
+# 로그인한 의사의 보건소 × 진료과 대기열 (요청 값으로 바꿀 수 없음)
+def _session_watcher(session: dict):
+    if not session["department"]:
+        return None
+    return get_watcher(session["hospital_id"], session["department"])
 
 # ✅ 기존 웹 페이지: 대기 목록
+# 첫 화면은 현재 대기 목록, 이후 /doctor/consultation/stream 으로 실시간 갱신
 @router.get("/consultation", response_class=HTMLResponse)
-async def consultation_list(request: Request):
-    return templates.TemplateResponse("consultation_list.html", {
-        "request": request,
-        "consultations": dummy_consultations,
+async def consultation_list(request: Request, session: dict = Depends(require_doctor)):
+    watcher = _session_watcher(session)
+    return render(request, "consultation_list.html", {
+        "consultations": await watcher.current() if watcher else [],
+        "department": session["department"],
         "active_tab": "consultation"
     })
 
-# ✅ 기존 웹 페이지: 영상 진료 화면
-@router.get("/video-call/{consultation_id}", response_class=HTMLResponse)
-async def video_call_page(request: Request, consultation_id: str):
-    # 진료 ID에 따라 하드코딩된 데이터 반환
-    consultation = next((c for c in dummy_consultations if c["consultation_id"] == consultation_id), {
-        "consultation_id": consultation_id,
-        "patient_id": "p001",
-        "doctor_id": "d001",
-        "previous_date": "2024-01-10",
-        "previous_disease_code": "DIS001"
+def _sse(event: dict) -> bytes:
+    return b"event: " + event["type"].encode() + b"\nid: " + str(event.get("version", 0)).encode() + \
+        b"\ndata: " + dumps(event) + b"\n\n"
+
+# 📡 실시간 대기열 (Server-Sent Events)
+# 처음에 snapshot(전체 목록), 이후 add / update / remove 이벤트만 전송
+@router.get("/consultation/stream")
+async def consultation_stream(request: Request, session: dict = Depends(require_doctor)):
+    watcher = _session_watcher(session)
+    if watcher is None:
+        return {"status_code": 400, "error": "진료과가 등록되지 않은 계정입니다."}
+
+    async def events():
+        subscriber = watcher.subscribe()
+        try:
+            yield b": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=SSE_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                yield _sse(event)
+        finally:
+            watcher.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
     })
 
-    patient = {
-        "name": consultation.get("name", "홍길동"),
-        "birth": consultation.get("birth", "040324"),
-        "gender": "남",
-        "symptom_area": "목",
-        "main_symptom": consultation.get("symptoms", "기침")
+# ✅ 실시간 대기열 감시 상태 (진료과별 구독자 수, 조회 횟수)
+@router.get("/consultation/stream/stats")
+async def consultation_stream_stats():
+    return {
+        "status_code": 200,
+        "data": waiting_queue_stats()
     }
 
-    return templates.TemplateResponse("video_call.html", {
-        "request": request,
+# 로그인한 의사가 볼 수 있는 진료 신청만
+# 보건소가 세션과 같아야 하고 (보건소가 없는 신청도 404), 담당 의사가 아직 없는 신청은 같은 보건소일 때만 허용
+async def _consultation_for(consultation_id: str, session: dict) -> dict:
+    consultation = await run_blocking(load_consultation, consultation_id)
+    if (
+        consultation is None
+        or not consultation.get("patient_id")
+        or consultation.get("hospital_id") != session["hospital_id"]
+        or consultation.get("doctor_id") not in (None, session["doctor_id"])
+    ):
+        raise HTTPException(status_code=404, detail="해당 ID의 진료 내역이 없습니다.")
+    return consultation
+
+def _patient_view(consultation: dict) -> dict:
+    return {
+        "name": consultation.get("name"),
+        "birth": consultation.get("birth"),
+        "gender": consultation.get("gender"),
+        "symptom_area": consultation.get("symptom_area"),
+        "main_symptom": consultation.get("main_symptom") or consultation.get("symptoms"),
+    }
+
+# ✅ 기존 웹 페이지: 영상 진료 화면
+# 처방전은 실제 진료 신청의 환자 / 로그인한 의사(세션) 기준으로 저장
+@router.get("/video-call/{consultation_id}", response_class=HTMLResponse)
+async def video_call_page(request: Request, consultation_id: str, session: dict = Depends(require_doctor)):
+    consultation = await _consultation_for(consultation_id, session)
+    return render(request, "video_call.html", {
         "consultation_id": consultation_id,
         "consultation": consultation,
-        "patient": patient,
+        "patient": _patient_view(consultation),
         "active_tab": "video"
     })
 
 # ✅ Postman용 JSON API: 대기 목록 조회
 @router.get("/consultation/json")
-async def get_consultation_list():
+async def get_consultation_list(session: dict = Depends(require_doctor)):
+    watcher = _session_watcher(session)
     return {
         "status_code": 200,
         "message": "대기 진료 목록 조회 성공",
-        "data": dummy_consultations
+        "data": await watcher.current() if watcher else []
     }
 
 # ✅ Postman용 JSON API: 영상진료 연결
@@ -75,27 +119,19 @@ class VideoRequest(BaseModel):
     consultation_id: str
 
 @router.post("/video-call/json")
-async def start_video_call(data: VideoRequest):
-    consultation = next((c for c in dummy_consultations if c["consultation_id"] == data.consultation_id), None)
-
-    if not consultation:
+async def start_video_call(data: VideoRequest, session: dict = Depends(require_doctor)):
+    try:
+        consultation = await _consultation_for(data.consultation_id, session)
+    except HTTPException as e:
         return {
             "status_code": 404,
-            "error": "해당 ID의 진료 내역이 없습니다."
+            "error": e.detail
         }
 
-    patient = {
-        "name": consultation["name"],
-        "birth": consultation["birth"],
-        "gender": "남",
-        "symptom_area": "목",
-        "main_symptom": consultation["symptoms"]
-    }
-
     return {
         "status_code": 200,
         "message": f"{data.consultation_id} 영상진료방 연결됨",
         "consultation": consultation,
-        "patient": patient,
+        "patient": _patient_view(consultation),
         "room_url": f"/doctor/video-call/{data.consultation_id}"
-    }
\ No newline at end of file
+    }
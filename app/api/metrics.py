@@ -0,0 +1,84 @@
+# app/api/metrics.py
+# 📈 /metrics (Prometheus 텍스트 형식) + 요청별 지표를 남기는 ASGI 미들웨어
+#   - 라벨은 요청 경로가 아니라 매칭된 라우트 템플릿 (/api/doctor/{doctor_id} …), 못 찾으면 "<unmatched>"
+#     라우트는 Router 가 scope["route"] 에 넣어 두므로 응답이 끝난 뒤에 읽음
+#     (그래서 처리 중 요청 수는 아직 라우트를 모르는 시점에 올리는 method 라벨만 있음)
+#   - BaseHTTPMiddleware 를 쓰지 않아서 스트리밍 응답(SSE / NDJSON)도 그대로 흘러가고 끝까지의 시간이 기록됨
+#   - METRICS_TOKEN 을 설정하면 Authorization: Bearer <token> 이 있어야 /metrics 를 읽을 수 있음
+#   - REQUEST_PROFILING 이면 요청마다 백엔드 사용량을 집계해서 라우트별로 누적 (app/utils/request_profile.py)
+#     PROFILE_HEADERS 이면 응답에 X-Request-Profile / Server-Timing 헤더로도 붙임
+#     (헤더는 응답 시작 시점 값 — 스트리밍 본문을 만들면서 나간 호출은 라우트별 누적에만 들어감)
+
+import hmac
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from app.core.config import METRICS_TOKEN, PROFILE_HEADERS, REQUEST_PROFILING
+from app.utils.metrics import http_request_duration, http_request_errors, http_requests_in_flight, render_metrics
+from app.utils.request_profile import end_profile, route_profiles, start_profile
+
+UNMATCHED_ROUTE = "<unmatched>"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    def __init__(self, app, profiling: bool = REQUEST_PROFILING, profile_headers: bool = PROFILE_HEADERS):
+        self.app = app
+        self.profiling = profiling
+        self.profile_headers = profiling and profile_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        profile, profile_token = start_profile() if self.profiling else (None, None)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.profile_headers:
+                    headers = [*message.get("headers", ()), (b"x-request-profile", profile.header_value().encode())]
+                    server_timing = profile.server_timing()
+                    if server_timing:
+                        headers.append((b"server-timing", server_timing.encode()))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        in_flight = http_requests_in_flight.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException:
+            status = 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration.labels(method, path, str(status)).observe(elapsed)
+            if status >= 500:
+                http_request_errors.labels(method, path, str(status)).inc()
+            if profile is not None:
+                end_profile(profile_token)
+                route_profiles.record(path, profile)
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    if METRICS_TOKEN:
+        # Bearer 방식만 (접두어 없이 토큰만 보낸 경우도 거절)
+        scheme, _, supplied = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.strip().encode(), METRICS_TOKEN.encode()):
+            return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
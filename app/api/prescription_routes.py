@@ -1,40 +1,107 @@
-from fastapi import APIRouter, Form, Request
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, Query
 from fastapi.responses import RedirectResponse
-from pydantic import BaseModel
-import uuid
+from pydantic import BaseModel, Field
+from app.api.deps import require_doctor
+from app.services.drug_search import search_drugs, drug_index
+from app.services.executor import run_blocking
+from app.services.prescription_service import submit_consultation
 
-router = APIRouter()
+# 처방 저장 / 의약품 검색은 의사 세션 필요, 처방한 의사는 요청 본문이 아니라 세션 기준 (app/api/deps.py)
+router = APIRouter(dependencies=[Depends(require_doctor)])
+
+
+# 기록에는 세션의 숫자 doctor_id 와 보건소만 씀 (doctor_id-index 가 N 타입, 요청 본문 값은 받지 않음)
+async def _submit(session: dict, patient_id: str, disease_code: str, items: list, **kwargs) -> dict:
+    doctor_id = session["doctor_id"]
+    if doctor_id is None:
+        raise HTTPException(status_code=403, detail="의사 번호가 등록되지 않은 계정입니다. 관리자에게 문의하세요.")
+    try:
+        return await run_blocking(
+            submit_consultation, doctor_id, session["hospital_id"], patient_id, disease_code, items, **kwargs,
+        )
+    except LookupError:
+        raise HTTPException(status_code=404, detail="진료 신청을 찾을 수 없습니다.")
 
 # HTML Form 기반 기존 라우터 (유지)
 @router.post("/prescription/submit")
 async def submit_prescription(
     request: Request,
     patient_id: str = Form(...),
-    doctor_id: str = Form(...),
     disease_code: str = Form(...),
     medication_code: str = Form(...),
     days: int = Form(...),
-    memo: str = Form("")
+    memo: str = Form(""),
+    session: dict = Depends(require_doctor)
 ):
-    prescription_id = str(uuid.uuid4())
-    # TODO: DB에 저장 처리
+    await _submit(session, patient_id, disease_code, [{"medication_code": medication_code, "days": days}], memo=memo)
     return RedirectResponse(url="/doctor/consultation", status_code=302)
 
 # ✅ JSON 기반 API 버전 (Postman 테스트용)
 class PrescriptionRequest(BaseModel):
     patient_id: str
-    doctor_id: str
     disease_code: str
     medication_code: str
     days: int
     memo: str = ""
 
 @router.post("/api/prescription/submit")
-async def submit_prescription_api(data: PrescriptionRequest):
-    prescription_id = str(uuid.uuid4())
-    # TODO: DB 저장 처리 (DynamoDB or 기타)
+async def submit_prescription_api(data: PrescriptionRequest, session: dict = Depends(require_doctor)):
+    result = await _submit(
+        session, data.patient_id, data.disease_code,
+        [{"medication_code": data.medication_code, "days": data.days}],
+        memo=data.memo,
+    )
+    return {
+        "status_code": 200,
+        "message": "처방전 저장 완료",
+        "prescription_id": result["prescription_id"]
+    }
+
+# ✅ 진료 마무리: 처방 의약품 여러 줄 + 진단 기록을 한 번에 저장
+# (TransactWriteItems, 새 키마다 attribute_not_exists 조건 → 둘 다 쓰이거나 둘 다 안 쓰임, app/services/prescription_service.py)
+class PrescriptionItem(BaseModel):
+    medication_code: str
+    medication_name: str = ""
+    dosage_amount: str = ""
+    dosage_times: str = ""
+    usage: str = ""
+    days: int = Field(..., ge=1)
+
+class PrescriptionBatchRequest(BaseModel):
+    patient_id: str
+    disease_code: str
+    diagnosis_text: str = ""
+    memo: str = ""
+    # 이미 저장된 진단 기록에 처방만 붙일 때
+    diagnosis_id: int | None = None
+    # 진료 신청(대기 목록의 consultation_id), 주면 저장과 함께 대기 목록에서 빠짐
+    consultation_id: int | None = None
+    items: list[PrescriptionItem] = Field(..., min_length=1, max_length=100)
+
+@router.post("/api/prescription/batch")
+async def submit_prescription_batch(data: PrescriptionBatchRequest, session: dict = Depends(require_doctor)):
+    result = await _submit(
+        session, data.patient_id, data.disease_code,
+        [item.model_dump() for item in data.items],
+        diagnosis_text=data.diagnosis_text,
+        memo=data.memo,
+        diagnosis_id=data.diagnosis_id,
+        request_id=data.consultation_id,
+    )
     return {
         "status_code": 200,
         "message": "처방전 저장 완료",
-        "prescription_id": prescription_id
-    }
\ No newline at end of file
+        "data": result
+    }
+
+# 💊 처방 의약품 자동완성 (인메모리 인덱스, DynamoDB 조회 없음)
+@router.get("/api/drugs/search")
+async def search_drugs_api(
+    q: str = Query(..., min_length=1, description="약품명 일부, 초성(ㅌㅇㄹ) 가능"),
+    k: int = Query(10, ge=1, le=50, description="최대 결과 수")
+):
+    return {
+        "status_code": 200,
+        "message": "의약품 검색 완료" if drug_index.loaded else "의약품 목록 적재 중",
+        "data": search_drugs(q, k)
+    }
@@ -0,0 +1,174 @@
+# app/api/templating.py
+# 🖼 라우터들이 같이 쓰는 템플릿 환경 / 정적 파일
+#   - Jinja 환경은 프로세스에 하나 (base.html 등을 라우터마다 따로 컴파일하지 않음)
+#   - 컴파일 결과는 TEMPLATE_CACHE_DIR 에 bytecode 로 남겨서 재시작 때는 파싱 없이 읽음
+#   - 기동 시 precompile_templates() 로 전부 미리 컴파일 (첫 요청이 컴파일을 기다리지 않도록)
+#   - 요청마다 달라지는 값이 없는 화면은 render_cached() 로 한 번 그린 결과를 ETag 와 함께 재사용
+#   - /static 파일은 내용 해시가 붙은 주소(static_url)로 내보내고, 그 주소는 1년 immutable 캐시
+#     압축되는 형식(css / js / svg …)은 gzip 본을 미리 만들어 두고 Accept-Encoding 에 맞춰 보냄
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import threading
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from starlette.datastructures import Headers
+
+from app.core.config import STATIC_MAX_AGE, TEMPLATE_AUTO_RELOAD, TEMPLATE_CACHE_DIR
+
+TEMPLATE_DIR = "app/api/templates"
+STATIC_DIR = "app/api/static"
+
+# 미리 gzip 해 둘 형식 (png / jpg 같은 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+
+
+# ---------- 정적 파일 ----------
+# Accept-Encoding 이 gzip 을 받는지 (gzip;q=0 처럼 거부한 경우 / 없으면 * 의 q 값을 따름)
+def _accepts_gzip(header: str) -> bool:
+    weights = {}
+    for part in header.lower().split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.strip()] = q
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+
+class HashedStaticFiles(StaticFiles):
+    def __init__(self, directory: str = STATIC_DIR, max_age: int = STATIC_MAX_AGE):
+        super().__init__(directory=directory)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._urls = {}        # 원래 경로 → 해시 붙은 경로
+        self._originals = {}   # 해시 붙은 경로 → 원래 경로
+        self._compressed = {}  # 원래 경로 → (gzip 본문, ETag)
+        self._loaded = False
+
+    # images/logo.png → images/logo.3f2a9c1d.png (+ 압축 가능한 파일은 gzip 본 준비)
+    def build_manifest(self):
+        urls, originals, compressed = {}, {}, {}
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                full_path = os.path.join(root, filename)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                with open(full_path, "rb") as f:
+                    content = f.read()
+                digest = hashlib.sha256(content).hexdigest()
+                stem, ext = os.path.splitext(path)
+                hashed = f"{stem}.{digest[:8]}{ext}"
+                urls[path] = hashed
+                originals[hashed] = path
+                media_type = mimetypes.guess_type(path)[0] or ""
+                if len(content) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+                    body = gzip.compress(content, compresslevel=9, mtime=0)
+                    if len(body) < len(content):
+                        compressed[path] = (body, f'"{digest[:16]}-gz"')
+        with self._lock:
+            self._urls, self._originals, self._compressed = urls, originals, compressed
+            self._loaded = True
+        return len(urls)
+
+    def _ensure_manifest(self):
+        if not self._loaded:
+            self.build_manifest()
+
+    def url(self, path: str) -> str:
+        self._ensure_manifest()
+        path = path.lstrip("/")
+        return "/static/" + self._urls.get(path, path)
+
+    async def get_response(self, path: str, scope) -> Response:
+        self._ensure_manifest()
+        original = self._originals.get(path)
+        immutable = original is not None
+        path = original or path
+        cache_control = f"public, max-age={self.max_age}, immutable" if immutable else "public, max-age=300"
+
+        request_headers = Headers(scope=scope)
+        compressed = self._compressed.get(path)
+        if compressed and _accepts_gzip(request_headers.get("accept-encoding", "")):
+            body, etag = compressed
+            headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+            if request_headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+            headers["Content-Encoding"] = "gzip"
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            return Response(body, media_type=media_type, headers=headers)
+
+        response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = cache_control
+        if compressed:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+static_files = HashedStaticFiles()
+
+
+# ---------- 템플릿 ----------
+os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=select_autoescape(["html", "xml"]),
+    bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+    auto_reload=TEMPLATE_AUTO_RELOAD,
+    cache_size=-1,
+)
+_env.globals["static_url"] = static_files.url
+
+templates = Jinja2Templates(env=_env)
+
+
+def render(request: Request, name: str, context: dict | None = None, status_code: int = 200):
+    return templates.TemplateResponse(request, name, context or {}, status_code=status_code)
+
+
+# 요청과 무관한 화면: (이름, 값) 별로 한 번만 그림
+_pages = {}
+_pages_lock = threading.Lock()
+
+def render_cached(request: Request, name: str, **context) -> Response:
+    key = (name, tuple(sorted(context.items())))
+    page = _pages.get(key)
+    if page is None or TEMPLATE_AUTO_RELOAD:
+        body = _env.get_template(name).render(**context).encode()
+        page = (body, f'"{hashlib.sha256(body).hexdigest()[:16]}"')
+        with _pages_lock:
+            _pages[key] = page
+    body, etag = page
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+
+def precompile_templates() -> int:
+    names = _env.list_templates(filter_func=lambda name: name.endswith(".html"))
+    for name in names:
+        _env.get_template(name)
+    static_files.build_manifest()
+    return len(names)
+
+
+def template_stats() -> dict:
+    return {
+        "compiled": len(_env.cache) if _env.cache is not None else 0,
+        "cached_pages": len(_pages),
+        "static_files": len(static_files._urls),
+        "precompressed": len(static_files._compressed),
+        "bytecode_cache_dir": TEMPLATE_CACHE_DIR,
+    }
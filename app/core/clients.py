@@ -0,0 +1,160 @@
+# app/core/clients.py
+# 🔌 프로세스당 하나씩 쓰는 SDK 클라이언트 (DynamoDB / Firestore)
+# 모듈마다 boto3.resource / firestore.client() 를 새로 만들지 않고 여기서 받아 쓴다.
+# FastAPI lifespan 에서 init_clients() → warm_up() 순서로 호출해 첫 요청 전에 커넥션을 열어 둔다.
+# boto3 / firebase_admin 은 import 만으로 수백 ms 가 걸리므로 클라이언트를 처음 만들 때 import 한다.
+# (기동 순서는 app/core/startup.py 의 STARTUP_MODE 참고)
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import (
+    AWS_ACCESS_KEY_ID,
+    AWS_REGION,
+    AWS_SECRET_ACCESS_KEY,
+    DYNAMODB_CONNECT_TIMEOUT,
+    DYNAMODB_MAX_ATTEMPTS,
+    DYNAMODB_MAX_POOL_CONNECTIONS,
+    DYNAMODB_READ_TIMEOUT,
+)
+from app.services.firebase_service import init_firebase
+
+logger = logging.getLogger(__name__)
+
+# 기동 시 커넥션을 미리 열어 둘 테이블
+WARM_UP_TABLES = ("hospitals", "care_requests", "diagnosis_records", "prescription_records", "drugs", "diseases")
+
+
+# boto3 리소스의 조건식 빌더는 placeholder 카운터를 공유해서 여러 스레드가 동시에 쓰면
+# #n0/:v0 이름이 섞일 수 있다. 스레드마다 따로 쓰도록 감싼다.
+class _ThreadLocalConditionBuilder:
+    def __init__(self):
+        self._local = threading.local()
+
+    def _builder(self):
+        builder = getattr(self._local, "builder", None)
+        if builder is None:
+            from boto3.dynamodb.conditions import ConditionExpressionBuilder
+            builder = self._local.builder = ConditionExpressionBuilder()
+        return builder
+
+    def reset(self):
+        self._builder().reset()
+
+    def build_expression(self, condition, is_key_condition=False):
+        return self._builder().build_expression(condition, is_key_condition=is_key_condition)
+
+
+def _dynamodb_config():
+    from botocore.config import Config
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=DYNAMODB_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=DYNAMODB_CONNECT_TIMEOUT,
+        read_timeout=DYNAMODB_READ_TIMEOUT,
+        retries={"mode": "adaptive", "max_attempts": DYNAMODB_MAX_ATTEMPTS},
+    )
+
+
+class ClientRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dynamodb = None
+        self._firebase_ready = False
+        self._firestore = None
+        self._tables = {}
+
+    def dynamodb(self):
+        if self._dynamodb is None:
+            with self._lock:
+                if self._dynamodb is None:
+                    import boto3
+                    from app.utils.dynamodb_types import install_native_types
+                    from app.utils.metrics import install_botocore_metrics
+                    resource = boto3.resource(
+                        "dynamodb",
+                        aws_access_key_id=AWS_ACCESS_KEY_ID,
+                        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+                        config=_dynamodb_config(),
+                    )
+                    install_native_types(resource)
+                    # 모든 DynamoDB 호출의 지연 / 처리 중 수 / 오류를 테이블 × 동작별로 기록 (/metrics)
+                    install_botocore_metrics(resource.meta.client, "dynamodb")
+                    resource._injector._condition_builder = _ThreadLocalConditionBuilder()
+                    self._dynamodb = resource
+        return self._dynamodb
+
+    def table(self, name: str):
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables.setdefault(name, self.dynamodb().Table(name))
+        return table
+
+    # Firestore / RTDB / FCM 이 공유하는 firebase_admin 기본 앱
+    def firebase(self):
+        if not self._firebase_ready:
+            with self._lock:
+                if not self._firebase_ready:
+                    init_firebase()
+                    self._firebase_ready = True
+
+    def firestore(self):
+        if self._firestore is None:
+            self.firebase()
+            with self._lock:
+                if self._firestore is None:
+                    from firebase_admin import firestore
+                    self._firestore = firestore.client()
+        return self._firestore
+
+    def init(self):
+        self.dynamodb()
+        try:
+            self.firestore()
+        except Exception:
+            # Firebase 키가 없는 환경(로컬 DynamoDB 만 쓰는 경우 등)에서도 기동은 계속
+            logger.exception("firestore client init failed")
+
+    # 첫 요청이 TLS 핸드셰이크를 기다리지 않도록 가벼운 호출로 커넥션을 미리 연다
+    def warm_up(self, tables=WARM_UP_TABLES):
+        client = self.dynamodb().meta.client
+
+        def describe(name):
+            try:
+                client.describe_table(TableName=name)
+            except Exception as e:
+                logger.warning("warm-up describe_table(%s) failed: %s", name, e)
+
+        # 테이블 수만큼 동시에 호출해서 풀에 커넥션 여러 개를 만들어 둠
+        with ThreadPoolExecutor(max_workers=len(tables)) as pool:
+            list(pool.map(describe, tables))
+
+        if self._firestore is not None:
+            try:
+                self._firestore.collection("admins").limit(1).get()
+            except Exception as e:
+                logger.warning("warm-up firestore failed: %s", e)
+
+
+registry = ClientRegistry()
+
+
+def get_dynamodb():
+    return registry.dynamodb()
+
+def get_table(name: str):
+    return registry.table(name)
+
+def get_firestore():
+    return registry.firestore()
+
+def ensure_firebase():
+    registry.firebase()
+
+def init_clients():
+    registry.init()
+
+def warm_up_clients():
+    registry.warm_up()
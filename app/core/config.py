@@ -0,0 +1,110 @@
+# app/core/config.py
+# ⚙️ 환경변수는 여기서 한 번만 읽는다 (다른 모듈은 load_dotenv 를 호출하지 않고 여기 값을 import)
+
+import os
+import tempfile
+from dotenv import load_dotenv
+
+# app/.env 가 있으면 그것을, 없으면 프로젝트 루트의 .env 를 사용
+load_dotenv()
+
+# AWS
+AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
+AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
+AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
+
+# Firebase
+FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
+FIREBASE_DB_URL = os.getenv("FIREBASE_DB_URL")
+
+# 외부 API
+POSTAL_CODE_KEY = os.getenv("POSTAL_CODE_KEY")
+
+# 로그인 세션 토큰 (HMAC 서명 키, 유효 시간(초), 쿠키 이름 / https 전용 여부)
+# SESSION_SECRET 이 없으면 프로세스마다 임시 키를 만들어서 재시작하거나 인스턴스가 바뀌면 다시 로그인해야 함
+SESSION_SECRET = os.getenv("SESSION_SECRET")
+SESSION_TTL = int(os.getenv("SESSION_TTL", "43200"))
+SESSION_COOKIE_NAME = os.getenv("SESSION_COOKIE_NAME", "silmedy_session")
+SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "false").lower() in ("1", "true", "yes")
+
+# 비밀번호 해시 (scrypt 비용 N / r / p, 해시 전용 스레드 수)
+# N 을 올리면 해시 한 번에 드는 시간과 메모리(128 * N * r 바이트)가 같이 늘어남
+PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", "16384"))
+PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "4"))
+
+# 로그인 시도 제한 (분당 허용 횟수 = 버킷 크기)
+#   IP 별: 모든 시도에 차감 / 보건소 별: 실패한 시도에만 차감하고 모든 시도에 적용 (여러 IP 로 나눠 오는 대입 공격 차단)
+LOGIN_ATTEMPTS_PER_IP = int(os.getenv("LOGIN_ATTEMPTS_PER_IP", "10"))
+LOGIN_FAILURES_PER_CENTER = int(os.getenv("LOGIN_FAILURES_PER_CENTER", "30"))
+# 없는 보건소 이름을 기억하는 시간(초) / 최대 개수 (같은 이름으로 DynamoDB 를 반복 조회하지 않도록)
+HOSPITAL_NEGATIVE_TTL = float(os.getenv("HOSPITAL_NEGATIVE_TTL", "60"))
+HOSPITAL_NEGATIVE_CACHE_SIZE = int(os.getenv("HOSPITAL_NEGATIVE_CACHE_SIZE", "10000"))
+# 앞단 프록시 수 (Render 로드밸런서 하나면 1, 직접 받으면 0)
+# X-Forwarded-For 의 왼쪽 값은 클라이언트가 마음대로 넣을 수 있으므로, 신뢰하는 프록시가 붙인 오른쪽에서 N 번째 값을 클라이언트 IP 로 씀
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+# 기동 방식: eager(준비 끝나고 listen) / background(listen 후 백그라운드 예열) / lazy(첫 사용 시 생성)
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+
+# DynamoDB 클라이언트 (커넥션 풀 / 재시도 / 타임아웃)
+DYNAMODB_MAX_POOL_CONNECTIONS = int(os.getenv("DYNAMODB_MAX_POOL_CONNECTIONS", "50"))
+DYNAMODB_MAX_ATTEMPTS = int(os.getenv("DYNAMODB_MAX_ATTEMPTS", "5"))
+DYNAMODB_CONNECT_TIMEOUT = float(os.getenv("DYNAMODB_CONNECT_TIMEOUT", "2"))
+DYNAMODB_READ_TIMEOUT = float(os.getenv("DYNAMODB_READ_TIMEOUT", "10"))
+
+# 캐시 / 인덱스 갱신 주기(초)
+HOSPITAL_INDEX_TTL = int(os.getenv("HOSPITAL_INDEX_TTL", "300"))
+DRUG_INDEX_TTL = int(os.getenv("DRUG_INDEX_TTL", "600"))
+PATIENT_CACHE_TTL = float(os.getenv("PATIENT_CACHE_TTL", "30"))
+CATALOG_TTL = int(os.getenv("CATALOG_TTL", "300"))
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "300"))
+
+# FCM 일괄 발송 (청크 크기 ≤ 500, 동시 청크 수, 일시 오류 재시도 횟수, 무효 토큰 기억 시간(초))
+FCM_BATCH_SIZE = int(os.getenv("FCM_BATCH_SIZE", "500"))
+FCM_CHUNK_CONCURRENCY = int(os.getenv("FCM_CHUNK_CONCURRENCY", "2"))
+FCM_MAX_RETRIES = int(os.getenv("FCM_MAX_RETRIES", "3"))
+FCM_INVALID_TOKEN_TTL = int(os.getenv("FCM_INVALID_TOKEN_TTL", "86400"))
+
+# 푸시 알림 아웃박스 (SQLite 파일, 워커 수, 같은 알림 합치는 시간(초), 최대 전송 시도)
+NOTIFICATION_OUTBOX_PATH = os.getenv("NOTIFICATION_OUTBOX_PATH", "notification_outbox.sqlite3")
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "2"))
+NOTIFICATION_COALESCE_WINDOW = float(os.getenv("NOTIFICATION_COALESCE_WINDOW", "10"))
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+
+# 통화 발화 스트리밍 저장 (N개 또는 T ms 마다 한 청크로 저장)
+TRANSCRIPT_FLUSH_ITEMS = int(os.getenv("TRANSCRIPT_FLUSH_ITEMS", "20"))
+TRANSCRIPT_FLUSH_MS = int(os.getenv("TRANSCRIPT_FLUSH_MS", "500"))
+
+# 실시간 대기열 (진료과별 변경 감지 주기(초))
+WAITING_QUEUE_POLL_INTERVAL = float(os.getenv("WAITING_QUEUE_POLL_INTERVAL", "3"))
+
+# 처방전 / 진단 기록 ID 의 worker 번호 (app/utils/id_generator.py)
+#   ID_WORKER_ID    : 이 인스턴스(레플리카)에 배정한 첫 번호 (0 ~ 1023, 인스턴스끼리 범위가 겹치지 않게 직접 배정)
+#   ID_WORKER_SLOTS : 이 인스턴스에서 띄우는 프로세스 수 (uvicorn --workers), 프로세스마다 ID_WORKER_ID + 0 ~ SLOTS-1 중 하나를 잠금 파일로 임대
+# ID_WORKER_ID 를 비우면 호스트 안에서만 겹치지 않는 번호를 임대함 (레플리카가 여럿이면 반드시 지정)
+ID_WORKER_ID = int(os.getenv("ID_WORKER_ID")) if os.getenv("ID_WORKER_ID") else None
+ID_WORKER_SLOTS = int(os.getenv("ID_WORKER_SLOTS", "1"))
+ID_WORKER_LOCK_DIR = os.getenv("ID_WORKER_LOCK_DIR") or os.path.join(tempfile.gettempdir(), "silmedy-id-workers")
+
+# 템플릿 (컴파일 결과 bytecode 캐시 위치, 파일 변경 감지 여부 — 개발 중에만 true)
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "silmedy-jinja")
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "false").lower() in ("1", "true", "yes")
+# /static 에서 해시가 붙은 주소로 받은 파일의 브라우저 캐시 기간(초)
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "31536000"))
+
+# /metrics (Prometheus) — 설정하면 Authorization: Bearer <token> 이 있어야 읽을 수 있음
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# 요청 단위 백엔드 사용량 집계 (DynamoDB 소비 용량 / Firestore 문서 수, app/utils/request_profile.py)
+# 응답 헤더(X-Request-Profile / Server-Timing)는 PROFILE_HEADERS=true 일 때만 (개발 / 진단용)
+# PROFILE_LOG_INTERVAL(초)마다 요청당 읽기가 많은 라우트 PROFILE_LOG_TOP 개를 로그로 남김 (0 이면 안 남김)
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "true").lower() in ("1", "true", "yes")
+PROFILE_HEADERS = os.getenv("PROFILE_HEADERS", "false").lower() in ("1", "true", "yes")
+PROFILE_LOG_INTERVAL = float(os.getenv("PROFILE_LOG_INTERVAL", "300"))
+PROFILE_LOG_TOP = int(os.getenv("PROFILE_LOG_TOP", "10"))
+
+# 스레드 풀
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "32"))
+EXPORT_MAX_WORKERS = int(os.getenv("EXPORT_MAX_WORKERS", "8"))
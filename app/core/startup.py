@@ -0,0 +1,52 @@
+# app/core/startup.py
+# 🚀 기동 방식 (STARTUP_MODE)
+#   eager      : SDK 클라이언트 생성 → 커넥션 예열 → 인덱스 적재까지 끝낸 뒤 요청을 받는다 (기본값)
+#   background : 바로 listen 하고, 같은 작업을 백그라운드 스레드에서 진행한다
+#                (먼저 들어온 요청은 필요한 클라이언트/인덱스를 그 자리에서 만든다)
+#   lazy       : 기동 시 아무것도 하지 않고 첫 사용 시 만든다 (인덱스 갱신 스레드도 첫 조회 때 시작)
+# 스핀다운되는 인스턴스(render.yaml)는 background 로 두면 첫 응답이 SDK 핸드셰이크를 기다리지 않는다.
+# 측정: python scripts/cold_start.py
+
+import logging
+import threading
+import time
+
+from app.core.config import STARTUP_MODE
+
+logger = logging.getLogger(__name__)
+
+STARTUP_MODES = ("eager", "background", "lazy")
+
+
+def _warm_up(tasks):
+    from app.core.clients import init_clients, warm_up_clients
+
+    started = time.perf_counter()
+    init_clients()
+    try:
+        warm_up_clients()
+    except Exception:
+        logger.exception("client warm-up failed")
+    for task in tasks:
+        task()
+    logger.info("startup warm-up finished in %.0f ms", (time.perf_counter() - started) * 1000)
+
+def _warm_up_in_background(tasks):
+    try:
+        _warm_up(tasks)
+    except Exception:
+        # 예열이 실패해도 요청 경로에서 다시 만들어지므로 로그만 남김
+        logger.exception("background warm-up failed")
+
+
+# lifespan 에서 호출: tasks 는 인덱스/카탈로그 start 함수들
+def run_startup(tasks=(), mode: str = STARTUP_MODE):
+    if mode not in STARTUP_MODES:
+        logger.warning("unknown STARTUP_MODE %r, using eager", mode)
+        mode = "eager"
+    logger.info("startup mode: %s", mode)
+
+    if mode == "eager":
+        _warm_up(tasks)
+    elif mode == "background":
+        threading.Thread(target=_warm_up_in_background, args=(tasks,), name="startup-warm-up", daemon=True).start()
@@ -1,10 +1,10 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
 from app.services.firebase_service import init_firebase
 
 
-# ✅ firebase_service는 import만 해도 내부에서 자동 초기화됨
+# ✅ Firebase 초기화는 처음 쓸 때 한 번 (app/core/clients.py)
 from app.services import firebase_service
 
 from app.api import auth_routes
@@ -12,9 +12,41 @@ from app.api import doctor_routes
 from app.api import prescription_routes
 from app.api import admin_routes
 from app.api import common_routes
+from app.api import metrics
+from app.api.deps import auth_error_handler
+from app.api.templating import precompile_templates, static_files
+from app.core.startup import run_startup
+from app.services.dynamodb_service import start_hospital_index, stop_hospital_index
+from app.services.drug_search import start_drug_index, stop_drug_index
+from app.services.notification_outbox import start_notification_outbox, stop_notification_outbox
+from app.services.waiting_queue import stop_waiting_watchers
+from app.utils.exceptions import AuthError
+from app.utils.serialization import FastJSONResponse
 
-app = FastAPI()
-app.mount("/static", StaticFiles(directory="app/api/static"), name="static")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 🔌 공용 SDK 클라이언트 생성 + 커넥션 예열 (첫 요청이 핸드셰이크를 기다리지 않도록)
+    # 🏥 보건소 / 💊 의약품 인덱스는 기동 시 한 번 적재 후 백그라운드에서 갱신
+    # 🖼 템플릿은 미리 컴파일, 정적 파일은 해시 주소 / gzip 본 준비
+    # 언제 할지는 STARTUP_MODE 에 따름 (app/core/startup.py)
+    run_startup([precompile_templates, start_hospital_index, start_drug_index])
+    # 📮 재시작 전에 쌓여 있던 알림부터 이어서 전송
+    start_notification_outbox()
+    yield
+    stop_waiting_watchers()
+    stop_notification_outbox()
+    stop_drug_index()
+    stop_hospital_index()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+# 🔐 세션 없음 / 만료 → 화면은 /login 으로, API 는 401 / 403 JSON
+app.add_exception_handler(AuthError, auth_error_handler)
+# 해시가 붙은 주소(static_url)는 오래 캐시, 압축 가능한 파일은 미리 만든 gzip 본으로 응답
+app.mount("/static", static_files, name="static")
+# 📈 라우트 / 백엔드 호출별 지연·오류 지표 (GET /metrics)
+app.add_middleware(metrics.MetricsMiddleware)
 
 # 라우터 등록
 app.include_router(auth_routes.router)
@@ -22,6 +54,7 @@ app.include_router(doctor_routes.router)
 app.include_router(prescription_routes.router)
 app.include_router(admin_routes.router)
 app.include_router(common_routes.router)
+app.include_router(metrics.router)
 
 @app.get("/")
 async def root():
@@ -1,25 +1,116 @@
-from app.services.firestore_service import get_admin_by_id, get_doctor_by_id_and_department
-from app.services.dynamodb_service import get_hospital_id_by_name  # 추가
+import logging
+import math
 
-async def process_login(public_health_center, role, department, password):
+from app.core.config import LOGIN_ATTEMPTS_PER_IP, LOGIN_FAILURES_PER_CENTER
+from app.services.firestore_service import (
+    get_admin_by_id_async,
+    get_doctor_by_id_and_department_async,
+    update_admin_password_async,
+    update_doctor_password_async,
+)
+from app.services.dynamodb_service import get_hospital_id_by_name_async
+from app.services.password_service import hash_password_async, verify_password_async
+from app.utils.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# 🪣 로그인 시도 제한 (DynamoDB / Firestore 조회 전에 거름)
+#   IP 별: 시도할 때마다 차감
+#   보건소 별: 실패할 때마다 차감하고, 모든 시도에 적용 (IP 를 바꿔 가며 오는 대입 공격도 보건소 단위로 막힘)
+ip_limiter = RateLimiter(rate=LOGIN_ATTEMPTS_PER_IP / 60, burst=LOGIN_ATTEMPTS_PER_IP)
+center_limiter = RateLimiter(rate=LOGIN_FAILURES_PER_CENTER / 60, burst=LOGIN_FAILURES_PER_CENTER)
+
+
+def _rate_limited(retry_after: float) -> dict:
+    return {
+        "error": "로그인 시도가 너무 많습니다. 잠시 후 다시 시도하세요.",
+        "rate_limited": True,
+        "retry_after": math.ceil(retry_after),
+    }
+
+def login_limit_stats() -> dict:
+    return {"ip": ip_limiter.stats(), "center": center_limiter.stats()}
+
+
+# 진단 / 처방 기록과 care_requests 의 doctor_id-index 는 숫자 doctor_id 를 씀
+# 의사 문서에 doctor_id 필드가 있으면 그 값, 없으면 숫자로만 된 면허번호(문서 id), 둘 다 아니면 None
+def _doctor_number(user: dict):
+    for value in (user.get("doctor_id"), user.get("license_number")):
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isdigit():
+            return int(value)
+    return None
+
+
+# 평문 / 예전 비용으로 저장된 비밀번호는 로그인 성공 시 새 해시로 교체 (실패해도 로그인은 그대로 진행)
+async def _upgrade_password(update, key, password):
+    try:
+        await update(key, await hash_password_async(password))
+    except Exception:
+        logger.exception("password upgrade failed for %s", key)
+
+
+# 조회 전에 확인: 제한에 걸리면 오류 dict (rate_limited / retry_after 포함), 아니면 None
+def check_login_limits(client_ip, public_health_center):
+    allowed, retry_after = ip_limiter.acquire(client_ip)
+    if not allowed:
+        return _rate_limited(retry_after)
+    allowed, retry_after = center_limiter.check(public_health_center)
+    if not allowed:
+        return _rate_limited(retry_after)
+    return None
+
+def record_login_failure(client_ip, public_health_center):
+    center_limiter.acquire(public_health_center)
+
+
+# client_ip 를 주면 IP / 보건소별 시도 제한을 먼저 확인
+async def process_login(public_health_center, role, department, password, client_ip=None):
+    if client_ip is not None:
+        limited = check_login_limits(client_ip, public_health_center)
+        if limited:
+            return limited
+
+    result = await _login(public_health_center, role, department, password)
+    if client_ip is not None and not result.get("message"):
+        record_login_failure(client_ip, public_health_center)
+    return result
+
+
+async def _login(public_health_center, role, department, password):
     role_map = {
         "의사": "doctor",
         "관리자": "admin"
     }
     mapped_role = role_map.get(role, role)
 
-    hospital_id = get_hospital_id_by_name(public_health_center)
+    hospital_id = await get_hospital_id_by_name_async(public_health_center)
     if hospital_id is None:
         return {"error": "보건소 정보가 잘못되었습니다."}
 
+    # 성공하면 세션 토큰에 담을 정보(보건소 id / 역할 / 의사 면허번호 / 진료과)를 같이 돌려줌
     if mapped_role == "doctor":
-        user = get_doctor_by_id_and_department(hospital_id, department)
-        if user and user["password"] == password:
-            return {"message": "로그인 성공"}
+        user = await get_doctor_by_id_and_department_async(hospital_id, department)
+        matched, needs_rehash = await verify_password_async(password, user and user.get("password"))
+        if matched:
+            if needs_rehash:
+                await _upgrade_password(update_doctor_password_async, user["license_number"], password)
+            return {
+                "message": "로그인 성공",
+                "hospital_id": hospital_id,
+                "role": "doctor",
+                "doctor_id": _doctor_number(user),
+                "license_number": user.get("license_number"),
+                "department": user.get("department", department),
+            }
 
     elif mapped_role == "admin":
-        user = get_admin_by_id(hospital_id)
-        if user and user["password"] == password:
-            return {"message": "로그인 성공"}
+        user = await get_admin_by_id_async(hospital_id)
+        matched, needs_rehash = await verify_password_async(password, user and user.get("password"))
+        if matched:
+            if needs_rehash:
+                await _upgrade_password(update_admin_password_async, hospital_id, password)
+            return {"message": "로그인 성공", "hospital_id": hospital_id, "role": "admin"}
 
-    return {"error": "아이디 또는 비밀번호가 올바르지 않습니다."}
\ No newline at end of file
+    return {"error": "아이디 또는 비밀번호가 올바르지 않습니다."}
@@ -0,0 +1,150 @@
+# app/services/call_state_service.py
+# 📞 영상 통화 상태 변경 (생성 / 시작 / 종료 / 텍스트 저장)
+# RTDB 와 Firestore 쓰기를 동시에 보내서 전환 한 번에 왕복 한 번 시간만 걸리게 한다.
+#  - RTDB 는 루트 기준 multi-path update 한 번으로 필요한 필드만 갱신
+#  - Firestore 는 미리 get() 하지 않고 바로 update (문서가 없으면 NotFound 로 판단)
+#  - 한쪽이라도 실패하면 CallStateError (어느 저장소가 실패했는지 errors 에 담김)
+#  - 없는 방이면 같이 보낸 RTDB 값을 되돌림: 이전 값을 아는 경로는 그 값으로, 모르면 키를 지움 (None 을 쓰지 않음)
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from app.core.clients import ensure_firebase, get_firestore
+from app.utils.exceptions import CallStateError
+from app.utils.metrics import track
+
+KST = timezone(timedelta(hours=9))
+
+# RTDB 쓰기용 전용 풀 (공용 blocking 풀 작업 안에서 같은 풀을 다시 기다리지 않도록 분리)
+_call_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="call-state")
+
+
+def _rtdb_update(paths: dict):
+    from firebase_admin import db as realtime_db
+
+    with track("rtdb", "calls", "update"):
+        realtime_db.reference("/").update(paths)
+
+def _rtdb_delete(paths):
+    from firebase_admin import db as realtime_db
+
+    for path in paths:
+        with track("rtdb", "calls", "delete"):
+            realtime_db.reference(path).delete()
+
+def _rtdb_rollback(rtdb_paths: dict, previous: dict):
+    restore = {path: previous[path] for path in rtdb_paths if previous.get(path) is not None}
+    if restore:
+        _rtdb_update(restore)
+    _rtdb_delete([path for path in rtdb_paths if path not in restore])
+
+def _is_not_found(error) -> bool:
+    from google.api_core.exceptions import NotFound
+
+    return isinstance(error, NotFound)
+
+
+# rtdb_previous: 되돌릴 때 쓸 경로별 이전 값 (모르는 경로는 지움)
+def _apply(room_id: str, transition: str, rtdb_paths: dict | None, firestore_write, rtdb_previous: dict | None = None):
+    ensure_firebase()
+    # RTDB 는 풀에서, Firestore 는 현재 스레드에서 동시에 진행
+    # (컨텍스트를 복사해 넘겨서 RTDB 호출도 현재 요청의 사용량 집계에 들어감)
+    rtdb_future = _call_pool.submit(contextvars.copy_context().run, _rtdb_update, rtdb_paths) if rtdb_paths else None
+
+    errors = {}
+    not_found = False
+    try:
+        with track("firestore", "calls", transition, writes=1):
+            firestore_write()
+    except Exception as e:
+        errors["firestore"] = str(e)
+        not_found = _is_not_found(e)
+    if rtdb_future is not None:
+        try:
+            rtdb_future.result()
+        except Exception as e:
+            errors["rtdb"] = str(e)
+    if not_found and rtdb_paths and "rtdb" not in errors:
+        # 없는 방에 대한 시작/종료 → 같이 보낸 RTDB 상태값을 되돌림 (실패해도 원래 오류를 보고)
+        try:
+            _rtdb_rollback(rtdb_paths, rtdb_previous or {})
+        except Exception:
+            pass
+    if errors:
+        attempted = ("rtdb", "firestore") if rtdb_paths else ("firestore",)
+        raise CallStateError(room_id, transition, errors, attempted=attempted, not_found=not_found)
+
+
+def _call_doc(room_id: str):
+    return get_firestore().collection("calls").document(room_id)
+
+
+def create_call(doctor_id: str, patient_id: str) -> dict:
+    created = datetime.now(KST)
+    timestamp = created.strftime("%Y%m%d_%H%M%S")
+    safe_patient_id = patient_id.split("@")[0]
+    room_id = f"doctor_{doctor_id}_patient_{safe_patient_id}_{timestamp}"
+
+    _apply(
+        room_id,
+        "create",
+        {f"calls/{room_id}": {
+            "doctor_id": doctor_id,
+            "patient_id": patient_id,
+            "is_accepted": False,
+            "status": "waiting",
+            "created_at": timestamp
+        }},
+        lambda: _call_doc(room_id).set({
+            "doctor_id": doctor_id,
+            "patient_id": patient_id,
+            "is_accepted": False,
+            "started_at": None,
+            "ended_at": None,
+            "doctor_text": [],
+            "patient_text": []
+        }),
+    )
+    return {"room_id": room_id, "created_at": timestamp}
+
+
+def start_call(room_id: str) -> datetime:
+    started_at = datetime.now(KST)
+    _apply(
+        room_id,
+        "start",
+        {f"calls/{room_id}/status": "accepted"},
+        lambda: _call_doc(room_id).update({
+            "started_at": started_at,
+            "is_accepted": True
+        }),
+    )
+    return started_at
+
+
+def end_call(room_id: str) -> datetime:
+    ended_at = datetime.now(KST)
+    _apply(
+        room_id,
+        "end",
+        {f"calls/{room_id}/status": "ended"},
+        lambda: _call_doc(room_id).update({
+            "ended_at": ended_at
+        }),
+    )
+    return ended_at
+
+
+# 텍스트는 Firestore 에만 저장 (없는 방이면 update 가 NotFound → CallStateError.not_found)
+def append_call_text(room_id: str, role: str, text: str):
+    from firebase_admin import firestore
+
+    _apply(
+        room_id,
+        "text",
+        None,
+        lambda: _call_doc(room_id).update({
+            f"{role}_text": firestore.ArrayUnion([text])
+        }),
+    )
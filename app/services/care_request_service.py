@@ -0,0 +1,38 @@
+# app/services/care_request_service.py
+# 🩺 진료 신청 대기 상태 (희소 GSI 키)
+# 대기 중인 신청에만 대기열 GSI 의 키 속성을 두고, 진료가 끝나면(is_solved) 속성을 지워서 인덱스에서 뺀다.
+# 대기 목록 조회는 FilterExpression 없이 인덱스만 읽으므로 해결된 신청 / 다른 보건소 신청은 훑지도 않음 (ScannedCount == 반환 수)
+#   waiting_key       : "보건소#진료과" (waiting-index, 실시간 대기열 app/services/waiting_queue.py)
+#   waiting_doctor_id : 담당 의사 번호 (waiting_doctor_id-index, 의사별 대기 목록 /test/care-requests/waiting)
+# 신청을 만드는 쪽(환자 앱)은 waiting_fields() 값을 같이 저장해야 하고, 예전 신청은 scripts/backfill_waiting_index.py 로 채움
+
+from app.services.dynamodb_schema import CARE_REQUEST_WAITING_FIELDS
+
+TABLE_CARE_REQUESTS = "care_requests"
+
+
+def waiting_key(hospital_id, department) -> str:
+    return f"{int(hospital_id)}#{department}"
+
+
+# 대기 중인 신청에 둘 인덱스 키 속성 (해결됐으면 빈 dict, 보건소 / 진료과나 의사가 없으면 그 키만 뺌)
+def waiting_fields(request: dict) -> dict:
+    if request.get("is_solved"):
+        return {}
+    fields = {}
+    if request.get("hospital_id") is not None and request.get("department"):
+        fields["waiting_key"] = waiting_key(request["hospital_id"], request["department"])
+    if request.get("doctor_id") is not None:
+        fields["waiting_doctor_id"] = int(request["doctor_id"])
+    return fields
+
+
+# 진료 마무리 트랜잭션에 넣을 해결 처리 (그 보건소의 신청일 때만, 인덱스 키 속성은 모두 지움)
+def solve_update(request_id: int, hospital_id: int) -> dict:
+    return {"Update": {
+        "TableName": TABLE_CARE_REQUESTS,
+        "Key": {"request_id": request_id},
+        "UpdateExpression": "SET is_solved = :solved REMOVE " + ", ".join(CARE_REQUEST_WAITING_FIELDS),
+        "ConditionExpression": "hospital_id = :hospital_id",
+        "ExpressionAttributeValues": {":solved": True, ":hospital_id": hospital_id},
+    }}
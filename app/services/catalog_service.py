@@ -0,0 +1,115 @@
+# app/services/catalog_service.py
+# 📚 거의 바뀌지 않는 참조 카탈로그(병원, 질병 코드, 의약품)의 직렬화된 스냅샷
+# 요청마다 scan + JSON 인코딩을 하지 않고 미리 만들어 둔 본문과 ETag 를 그대로 돌려준다.
+# 본문이 실제로 바뀐 경우에만 버전/ETag 가 바뀌므로 클라이언트는 If-None-Match 로 304 를 받는다.
+
+import time
+import hashlib
+import logging
+import threading
+
+from app.core.clients import get_table
+from app.core.config import CATALOG_MAX_AGE, CATALOG_TTL
+from app.services.dynamodb_service import get_all_hospitals, iter_scan
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+class CatalogSnapshot:
+    __slots__ = ("version", "body", "etag", "count", "built_at")
+
+    def __init__(self, version: int, body: bytes, etag: str, count: int):
+        self.version = version
+        self.body = body
+        self.etag = etag
+        self.count = count
+        self.built_at = time.time()
+
+
+class Catalog:
+    def __init__(self, name: str, loader, sort_key: str, ttl: int = CATALOG_TTL):
+        self.name = name
+        self._loader = loader
+        self._sort_key = sort_key
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def refresh(self) -> bool:
+        # scan 순서가 바뀌어도 같은 ETag 가 나오도록 정렬 후 직렬화
+        items = sorted(self._loader(), key=lambda item: str(item.get(self._sort_key, "")))
+        body = dumps({self.name: items}, sort_keys=True)
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        with self._lock:
+            current = self._snapshot
+            if current is not None and current.etag == etag:
+                return False
+            version = current.version + 1 if current else 1
+            self._snapshot = CatalogSnapshot(version, body, etag, len(items))
+        logger.info("catalog %s v%d (%d items)", self.name, version, len(items))
+        return True
+
+    def snapshot(self) -> CatalogSnapshot:
+        if self._snapshot is None:
+            self.refresh()
+        return self._snapshot
+
+    def _run(self):
+        while not self._stop.wait(self._ttl):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("catalog %s refresh failed", self.name)
+
+    def start(self):
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("catalog %s initial load failed", self.name)
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"catalog-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+catalogs = {
+    # 병원 목록은 로그인용 인덱스가 이미 들고 있으므로 다시 scan 하지 않음
+    "hospitals": Catalog("hospitals", get_all_hospitals, sort_key="hospital_id"),
+    "diseases": Catalog("diseases", lambda: iter_scan(get_table("diseases")), sort_key="disease_code"),
+    "drugs": Catalog("drugs", lambda: iter_scan(get_table("drugs")), sort_key="drug_id"),
+}
+
+
+def get_catalog(name: str) -> Catalog | None:
+    return catalogs.get(name)
+
+def start_catalogs():
+    for catalog in catalogs.values():
+        catalog.start()
+
+def stop_catalogs():
+    for catalog in catalogs.values():
+        catalog.stop()
+
+
+# If-None-Match 헤더가 현재 ETag 와 일치하는지 (목록, *, 약한 비교 허용)
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+def cache_headers(snapshot: CatalogSnapshot) -> dict:
+    return {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}, must-revalidate",
+        "X-Catalog-Version": str(snapshot.version),
+    }
@@ -1,10 +1,3 @@
 # app/services/config.py
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
-AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
-AWS_REGION = os.getenv("AWS_REGION")
-POSTAL_CODE_KEY = os.getenv("POSTAL_CODE_KEY")
\ No newline at end of file
+# 설정은 app/core/config.py 로 옮겨졌음 (기존 import 경로 유지용)
+from app.core.config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, POSTAL_CODE_KEY  # noqa: F401
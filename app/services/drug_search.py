@@ -0,0 +1,390 @@
+# app/services/drug_search.py
+# 💊 의약품 자동완성 인메모리 인덱스
+# 처방 입력 중 타이핑마다 DynamoDB 를 읽지 않도록 drugs 테이블을 한 번 적재하고,
+# 자모 단위 접두어 / 초성 / 부분 문자열 / 오타 허용 검색을 메모리에서 처리한다.
+# 카탈로그 변경은 주기적으로 다시 읽어 바뀐 항목만 반영한 새 인덱스를 만들고 통째로 교체한다
+# (검색은 이벤트 루프에서 락 없이 그 순간의 인덱스만 읽음).
+
+import bisect
+import logging
+import threading
+from collections import defaultdict
+
+from app.core.clients import get_table
+from app.core.config import DRUG_INDEX_TTL
+from app.services.dynamodb_service import TABLE_DRUGS, iter_scan
+
+logger = logging.getLogger(__name__)
+
+# drugs 테이블 컬럼명이 데이터 출처마다 달라서 순서대로 찾아 씀
+DRUG_ID_FIELDS = ("drug_id", "item_seq", "medication_code", "code")
+DRUG_NAME_FIELDS = ("name", "drug_name", "item_name", "medication_name")
+
+# 한글 음절 분해용 자모 표
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+             "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 겹받침은 입력 중 다음 음절로 넘어갈 수 있으므로 낱자로 풀어서 비교
+COMPOUND_JAMO = {"ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+                 "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ"}
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+
+# 검색 순위 (작을수록 먼저)
+MATCH_EXACT = 0
+MATCH_PREFIX = 1
+MATCH_INITIALS = 2
+MATCH_SUBSTRING = 3
+MATCH_FUZZY = 4
+MATCH_NAMES = {
+    MATCH_EXACT: "exact",
+    MATCH_PREFIX: "prefix",
+    MATCH_INITIALS: "initials",
+    MATCH_SUBSTRING: "substring",
+    MATCH_FUZZY: "fuzzy",
+}
+
+# 짧은 검색어가 카탈로그 대부분과 일치할 때 순위 매길 후보 상한
+MAX_CANDIDATES = 200
+
+
+def normalize(text: str) -> str:
+    return "".join(str(text).lower().split())
+
+# "타이렌" → "ㅌㅏㅇㅣㄹㅔㄴ" : 입력 중인 마지막 음절의 받침도 다음 음절 초성과 이어서 비교됨
+def to_jamo(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            offset = code - HANGUL_BASE
+            out.append(CHOSEONG[offset // 588])
+            out.append(JUNGSEONG[(offset % 588) // 28])
+            jong = JONGSEONG[offset % 28]
+            out.append(COMPOUND_JAMO.get(jong, jong))
+        else:
+            out.append(COMPOUND_JAMO.get(ch, ch))
+    return "".join(out)
+
+def to_initials(text: str) -> str:
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+def is_initials_query(text: str) -> bool:
+    return bool(text) and all(ch in CHOSEONG for ch in text)
+
+# 자모 3-gram ≈ 음절 하나 단위라 2-gram 보다 후보가 훨씬 적게 나옴
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# query 가 text 의 어떤 접두어와 max_distance 이내로 같은지 (오타 허용 자동완성용)
+def _prefix_distance(query: str, text: str, max_distance: int):
+    text = text[:len(query) + max_distance]
+    previous = list(range(len(text) + 1))
+    for i, qc in enumerate(query, 1):
+        current = [i]
+        for j, tc in enumerate(text, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (qc != tc)))
+        if min(current) > max_distance:
+            return None
+        previous = current
+    distance = min(previous)
+    return distance if distance <= max_distance else None
+
+def _field(item: dict, fields):
+    for field in fields:
+        value = item.get(field)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+class _Entry:
+    __slots__ = ("drug_id", "name", "item", "key", "jamo", "initials", "grams")
+
+    def __init__(self, drug_id, name, item):
+        self.drug_id = drug_id
+        self.name = name
+        self.item = item
+        self.key = normalize(name)
+        self.jamo = to_jamo(self.key)
+        self.initials = to_initials(self.key)
+        self.grams = _trigrams(self.jamo)
+
+    # 이름이 그대로면 검색 키는 다시 계산하지 않고 내용만 바꾼 새 항목
+    def with_item(self, item):
+        entry = _Entry.__new__(_Entry)
+        for slot in _Entry.__slots__:
+            setattr(entry, slot, getattr(self, slot))
+        entry.item = item
+        return entry
+
+
+# 검색이 보는 인덱스 한 벌. 만든 뒤에는 고치지 않고, 바뀔 때마다 새로 만들어 통째로 교체한다.
+class _Snapshot:
+    __slots__ = ("entries", "by_jamo", "by_initials", "grams")
+
+    def __init__(self, entries=None, by_jamo=None, by_initials=None, grams=None):
+        self.entries = entries or {}
+        self.by_jamo = by_jamo or []          # (jamo, drug_id) 정렬 리스트 → 접두어 검색
+        self.by_initials = by_initials or []  # (initials, drug_id) 정렬 리스트 → 초성 검색
+        self.grams = grams or {}              # 자모 3-gram → drug_id 집합 → 부분 문자열 / 오타 검색
+
+    # 기존 스냅샷은 그대로 두고 바뀐 항목만 반영한 새 스냅샷 (손대는 3-gram 집합만 복사)
+    def apply(self, upserts, removals):
+        entries = dict(self.entries)
+        grams = dict(self.grams)
+        copied = set()
+        added, dropped = {}, []
+
+        def postings(gram):
+            if gram not in copied:
+                copied.add(gram)
+                grams[gram] = set(grams.get(gram, ()))
+            return grams.setdefault(gram, set())
+
+        def drop(entry):
+            # 같은 호출에서 방금 넣은 항목이면 정렬 리스트에는 아직 없음
+            if added.get(entry.drug_id) is entry:
+                del added[entry.drug_id]
+            else:
+                dropped.append(entry)
+            for gram in entry.grams:
+                postings(gram).discard(entry.drug_id)
+
+        for drug_id in removals:
+            entry = entries.pop(drug_id, None)
+            if entry is not None:
+                drop(entry)
+        for entry in upserts:
+            current = entries.get(entry.drug_id)
+            entries[entry.drug_id] = entry
+            if current is not None and current.name == entry.name:
+                continue
+            if current is not None:
+                drop(current)
+            added[entry.drug_id] = entry
+            for gram in entry.grams:
+                postings(gram).add(entry.drug_id)
+        for gram in copied:
+            if not grams[gram]:
+                del grams[gram]
+
+        # 최초 적재처럼 바뀐 항목이 많으면 하나씩 insort 하지 않고 한 번 정렬
+        if len(added) + len(dropped) > 64:
+            by_jamo = sorted((e.jamo, e.drug_id) for e in entries.values())
+            by_initials = sorted((e.initials, e.drug_id) for e in entries.values())
+        else:
+            by_jamo, by_initials = list(self.by_jamo), list(self.by_initials)
+            for keys, field in ((by_jamo, "jamo"), (by_initials, "initials")):
+                for entry in dropped:
+                    pair = (getattr(entry, field), entry.drug_id)
+                    pos = bisect.bisect_left(keys, pair)
+                    if pos < len(keys) and keys[pos] == pair:
+                        del keys[pos]
+                for entry in added.values():
+                    bisect.insort(keys, (getattr(entry, field), entry.drug_id))
+        return _Snapshot(entries, by_jamo, by_initials, grams)
+
+
+def _entry_for(item: dict, current: dict):
+    drug_id = _field(item, DRUG_ID_FIELDS)
+    name = _field(item, DRUG_NAME_FIELDS)
+    if drug_id is None or not name:
+        return None
+    drug_id = str(drug_id)
+    name = str(name)
+    entry = current.get(drug_id)
+    if entry is not None and entry.name == name:
+        return entry.with_item(item)
+    return _Entry(drug_id, name, item)
+
+
+class DrugSearchIndex:
+    def __init__(self, table_name: str, ttl: int = DRUG_INDEX_TTL):
+        self._table_name = table_name
+        self._ttl = ttl
+        # 쓰는 쪽(sync / upsert / remove)끼리만 순서를 맞추는 락. 검색은 잡지 않는다.
+        self._write_lock = threading.Lock()
+        self._snapshot = _Snapshot()
+        self._loaded = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._started = False
+
+    # ---------- 변경 반영 ----------
+    # 새 스냅샷은 검색과 상관없이 만들고, 다 만든 뒤 참조 하나만 바꿔 끼움 (HospitalIndex.refresh 와 같은 방식)
+    def upsert(self, item: dict):
+        with self._write_lock:
+            snapshot = self._snapshot
+            entry = _entry_for(item, snapshot.entries)
+            if entry is None:
+                return False
+            self._snapshot = snapshot.apply([entry], ())
+            return True
+
+    def remove(self, drug_id):
+        with self._write_lock:
+            snapshot = self._snapshot
+            if str(drug_id) in snapshot.entries:
+                self._snapshot = snapshot.apply((), [str(drug_id)])
+
+    # 전체 카탈로그를 받아 달라진 항목만 반영
+    def sync(self, items):
+        items = list(items)
+        with self._write_lock:
+            snapshot = self._snapshot
+            current = snapshot.entries
+            seen = set()
+            upserts = []
+            for item in items:
+                drug_id = _field(item, DRUG_ID_FIELDS)
+                if drug_id is None:
+                    continue
+                drug_id = str(drug_id)
+                seen.add(drug_id)
+                entry = current.get(drug_id)
+                if entry is None or entry.item != item:
+                    entry = _entry_for(item, current)
+                    if entry is not None:
+                        upserts.append(entry)
+            removals = [drug_id for drug_id in current if drug_id not in seen]
+            if upserts or removals:
+                self._snapshot = snapshot.apply(upserts, removals)
+            self._loaded = True
+        return len(upserts) + len(removals)
+
+    # ---------- 검색 ----------
+    @staticmethod
+    def _prefix_ids(keys, prefix: str, limit: int):
+        ids = []
+        pos = bisect.bisect_left(keys, (prefix, ""))
+        while pos < len(keys) and len(ids) < limit and keys[pos][0].startswith(prefix):
+            ids.append(keys[pos][1])
+            pos += 1
+        return ids
+
+    # 이벤트 루프에서 바로 불림: 시작할 때 스냅샷 하나를 잡고 끝까지 그것만 봄 (락 없음)
+    def search(self, query: str, k: int = 10):
+        if not self._loaded:
+            self.start_background()
+        q = normalize(query)
+        if not q:
+            return []
+        q_jamo = to_jamo(q)
+        snapshot = self._snapshot
+        entries = snapshot.entries
+        matches = {}
+
+        def add(drug_id, rank):
+            if rank < matches.get(drug_id, MATCH_FUZZY + 1):
+                matches[drug_id] = rank
+
+        if is_initials_query(q):
+            for drug_id in self._prefix_ids(snapshot.by_initials, q, MAX_CANDIDATES):
+                add(drug_id, MATCH_INITIALS)
+        else:
+            for drug_id in self._prefix_ids(snapshot.by_jamo, q_jamo, MAX_CANDIDATES):
+                add(drug_id, MATCH_EXACT if entries[drug_id].jamo == q_jamo else MATCH_PREFIX)
+
+        # 접두어로 k개를 못 채우면 이름 중간 일치로 넓히고, 그래도 없으면 오타 허용
+        grams = _trigrams(q_jamo)
+        if len(matches) < k and grams:
+            postings = sorted((snapshot.grams.get(g, ()) for g in grams), key=len)
+            if postings[0]:
+                for drug_id in set(postings[0]).intersection(*postings[1:]):
+                    if q_jamo in entries[drug_id].jamo:
+                        add(drug_id, MATCH_SUBSTRING)
+
+        max_distance = 1 + len(q_jamo) // 12
+        # 오타 하나가 3-gram 을 최대 3개 깨뜨리므로 남는 3-gram 수로 후보를 거른다
+        threshold = len(grams) - 3 * max_distance
+        if not matches and threshold >= 1:
+            counts = defaultdict(int)
+            for gram in grams:
+                for drug_id in snapshot.grams.get(gram, ()):
+                    counts[drug_id] += 1
+            for drug_id, count in counts.items():
+                if count >= threshold and _prefix_distance(q_jamo, entries[drug_id].jamo, max_distance) is not None:
+                    add(drug_id, MATCH_FUZZY)
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda pair: (pair[1], len(entries[pair[0]].key), entries[pair[0]].key),
+        )[:k]
+        return [
+            {
+                "drug_id": drug_id,
+                "name": entries[drug_id].name,
+                "match": MATCH_NAMES[rank],
+                "item": entries[drug_id].item,
+            }
+            for drug_id, rank in ranked
+        ]
+
+    # ---------- 적재 / 갱신 ----------
+    def refresh(self):
+        changed = self.sync(iter_scan(get_table(self._table_name)))
+        if changed:
+            logger.info("drug index updated: %d changed, %d total", changed, len(self))
+        return changed
+
+    def _run(self):
+        while not self._stop.wait(self._ttl):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("drug index refresh failed")
+
+    def start(self):
+        # 백그라운드 기동과 첫 검색이 겹쳐도 적재는 한 번만
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception("drug index initial load failed")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="drug-index", daemon=True)
+        self._thread.start()
+
+    # 검색은 이벤트 루프에서 바로 불리므로 적재를 기다리지 않고 스레드로 넘긴다
+    # (STARTUP_MODE=lazy 에서는 첫 검색이 적재를 시작하고, 그동안은 빈 결과)
+    def start_background(self):
+        if not self._started:
+            threading.Thread(target=self.start, name="drug-index-load", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        with self._start_lock:
+            self._started = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self):
+        return len(self._snapshot.entries)
+
+
+drug_index = DrugSearchIndex(TABLE_DRUGS)
+
+
+def search_drugs(query: str, k: int = 10):
+    return drug_index.search(query, k)
+
+def start_drug_index():
+    drug_index.start()
+
+def stop_drug_index():
+    drug_index.stop()
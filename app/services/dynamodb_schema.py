@@ -0,0 +1,135 @@
+# app/services/dynamodb_schema.py
+# 🗂 DynamoDB 테이블/GSI 정의
+# 조회 패턴별 GSI 를 여기서 선언하고, 조회 코드는 이 이름으로 Query 한다.
+#   python -m app.services.dynamodb_schema   → 없는 테이블 생성 + 빠진 GSI 추가
+
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 보건소 이름 → hospital_id (로그인)
+HOSPITALS_BY_NAME = "name-index"
+# 의사별 진료 신청
+CARE_REQUESTS_BY_DOCTOR = "doctor_id-index"
+# 의사별 대기 중인 진료 신청 (대기 목록), 희소 인덱스: waiting_doctor_id 는 대기 중인 신청에만 있음
+CARE_REQUESTS_WAITING_BY_DOCTOR = "waiting_doctor_id-index"
+# 보건소 × 진료과별 대기 중인 진료 신청 (실시간 대기열)
+# 희소 인덱스: waiting_key 는 대기 중인 신청에만 있고 해결되면 지움 (app/services/care_request_service.py)
+# 예전 department-index 는 보건소 / is_solved 를 필터로 걸러서 다른 보건소 신청까지 훑었음 (있으면 콘솔에서 삭제)
+CARE_REQUESTS_WAITING = "waiting-index"
+# 환자별 진단 이력 (진단일 순)
+DIAGNOSIS_BY_PATIENT = "patient_id-index"
+
+# 희소 인덱스 키 속성 (진료가 끝나면 모두 지움)
+CARE_REQUEST_WAITING_FIELDS = ("waiting_key", "waiting_doctor_id")
+
+TABLES = {
+    "hospitals": {
+        "key": [("hospital_id", "N", "HASH")],
+        "indexes": {
+            HOSPITALS_BY_NAME: [("name", "S", "HASH")],
+        },
+    },
+    "care_requests": {
+        "key": [("request_id", "N", "HASH")],
+        "indexes": {
+            CARE_REQUESTS_BY_DOCTOR: [("doctor_id", "N", "HASH")],
+            CARE_REQUESTS_WAITING_BY_DOCTOR: [("waiting_doctor_id", "N", "HASH")],
+            CARE_REQUESTS_WAITING: [("waiting_key", "S", "HASH")],
+        },
+    },
+    "diagnosis_records": {
+        "key": [("diagnosis_id", "N", "HASH")],
+        "indexes": {
+            DIAGNOSIS_BY_PATIENT: [("patient_id", "S", "HASH"), ("diagnosed_at", "S", "RANGE")],
+        },
+    },
+    "prescription_records": {
+        "key": [("prescription_id", "N", "HASH")],
+        "indexes": {},
+    },
+}
+
+
+def _key_schema(attributes):
+    return [{"AttributeName": name, "KeyType": key_type} for name, _, key_type in attributes]
+
+def _attribute_definitions(*attribute_lists):
+    definitions = {}
+    for attributes in attribute_lists:
+        for name, attr_type, _ in attributes:
+            definitions[name] = attr_type
+    return [{"AttributeName": name, "AttributeType": attr_type} for name, attr_type in definitions.items()]
+
+def _gsi(index_name, attributes):
+    return {
+        "IndexName": index_name,
+        "KeySchema": _key_schema(attributes),
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+
+def _wait_active(client, table_name, index_name=None, poll: float = 5.0):
+    while True:
+        table = client.describe_table(TableName=table_name)["Table"]
+        if index_name is None:
+            ready = table["TableStatus"] == "ACTIVE"
+        else:
+            statuses = {gsi["IndexName"]: gsi["IndexStatus"] for gsi in table.get("GlobalSecondaryIndexes", [])}
+            ready = statuses.get(index_name) == "ACTIVE"
+        if ready:
+            return
+        time.sleep(poll)
+
+
+# 없는 테이블은 GSI 포함해서 만들고, 이미 있는 테이블에는 빠진 GSI 만 하나씩 추가
+# (DynamoDB 는 update_table 한 번에 GSI 하나만 만들 수 있음)
+def create_tables(dynamodb, tables=None, wait: bool = True):
+    client = dynamodb.meta.client
+    existing = set(client.list_tables()["TableNames"])
+
+    for table_name, spec in (tables or TABLES).items():
+        if table_name not in existing:
+            params = {
+                "TableName": table_name,
+                "KeySchema": _key_schema(spec["key"]),
+                "AttributeDefinitions": _attribute_definitions(spec["key"], *spec["indexes"].values()),
+                "BillingMode": "PAY_PER_REQUEST",
+            }
+            if spec["indexes"]:
+                params["GlobalSecondaryIndexes"] = [_gsi(name, attrs) for name, attrs in spec["indexes"].items()]
+            client.create_table(**params)
+            logger.info("created table %s", table_name)
+            if wait:
+                _wait_active(client, table_name)
+            continue
+
+        description = client.describe_table(TableName=table_name)["Table"]
+        present = {gsi["IndexName"] for gsi in description.get("GlobalSecondaryIndexes", [])}
+        on_demand = description.get("BillingModeSummary", {}).get("BillingMode") == "PAY_PER_REQUEST"
+        for index_name, attributes in spec["indexes"].items():
+            if index_name in present:
+                continue
+            gsi = _gsi(index_name, attributes)
+            if not on_demand:
+                # 프로비저닝 모드 테이블은 GSI 에도 처리량을 지정해야 하므로 테이블 값을 따라감
+                throughput = description["ProvisionedThroughput"]
+                gsi["ProvisionedThroughput"] = {
+                    "ReadCapacityUnits": throughput["ReadCapacityUnits"],
+                    "WriteCapacityUnits": throughput["WriteCapacityUnits"],
+                }
+            client.update_table(
+                TableName=table_name,
+                AttributeDefinitions=_attribute_definitions(attributes),
+                GlobalSecondaryIndexUpdates=[{"Create": gsi}],
+            )
+            logger.info("creating index %s on %s", index_name, table_name)
+            if wait:
+                _wait_active(client, table_name, index_name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    from app.core.clients import get_dynamodb
+    create_tables(get_dynamodb())
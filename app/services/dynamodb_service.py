@@ -1,27 +1,329 @@
-import boto3
-import os
-from dotenv import load_dotenv
+import json
+import base64
+import time
+import queue
+import logging
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from botocore.exceptions import ClientError
+from app.core.clients import get_table
+from app.core.config import EXPORT_MAX_WORKERS, HOSPITAL_INDEX_TTL, HOSPITAL_NEGATIVE_CACHE_SIZE, HOSPITAL_NEGATIVE_TTL
+from app.services.dynamodb_schema import HOSPITALS_BY_NAME
+from app.services.executor import run_blocking, to_async
+from app.utils.cache import TTLCache
+from app.utils.id_generator import next_id
 
-load_dotenv()
-
-dynamodb = boto3.resource(
-    'dynamodb',
-    region_name=os.getenv("AWS_REGION"),
-    aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
-)
+logger = logging.getLogger(__name__)
 
 # ⚠️ 테이블 이름 정확히!
-table_hospitals = dynamodb.Table("hospitals")
+# 테이블 객체는 공용 클라이언트 레지스트리(app/core/clients.py)에서 받아 씀
+TABLE_HOSPITALS = "hospitals"
+TABLE_DRUGS = "drugs"
+
+# 🔁 scan 페이지 순회 (1MB 단위로 끊기는 결과를 LastEvaluatedKey 따라 끝까지 읽음)
+def iter_scan(table, **kwargs):
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+# 🔎 GSI Query (scan + FilterExpression 대신 결과 크기에 비례하는 읽기)
+# 아직 GSI 가 만들어지지 않은 테이블이면 같은 조건의 scan 으로 대신하고 경고를 남긴다.
+_warned_missing_indexes = set()
+
+def _is_missing_index(error: ClientError) -> bool:
+    err = error.response.get("Error", {})
+    return err.get("Code") in ("ValidationException", "ResourceNotFoundException") and "index" in err.get("Message", "").lower()
+
+def _scan_fallback_kwargs(table, index_name, key_condition, kwargs):
+    if (table.name, index_name) not in _warned_missing_indexes:
+        _warned_missing_indexes.add((table.name, index_name))
+        logger.warning("index %s missing on %s, falling back to scan (run app.services.dynamodb_schema)", index_name, table.name)
+    fallback = {k: v for k, v in kwargs.items() if k not in ("ScanIndexForward", "ExclusiveStartKey")}
+    existing_filter = fallback.get("FilterExpression")
+    fallback["FilterExpression"] = key_condition if existing_filter is None else key_condition & existing_filter
+    return fallback
+
+def iter_query(table, index_name: str, key_condition, **kwargs):
+    params = dict(kwargs, IndexName=index_name, KeyConditionExpression=key_condition)
+    try:
+        response = table.query(**params)
+    except ClientError as e:
+        if not _is_missing_index(e):
+            raise
+        yield from iter_scan(table, **_scan_fallback_kwargs(table, index_name, key_condition, kwargs))
+        return
+
+    while True:
+        yield from response.get("Items", [])
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        params["ExclusiveStartKey"] = last_key
+        response = table.query(**params)
+
+def query_page(table, index_name: str, key_condition, limit: int, next_token: str | None = None, **kwargs):
+    if next_token:
+        kwargs["ExclusiveStartKey"] = decode_cursor(next_token)
+    try:
+        response = table.query(IndexName=index_name, KeyConditionExpression=key_condition, Limit=limit, **kwargs)
+    except ClientError as e:
+        if not _is_missing_index(e):
+            raise
+        fallback = _scan_fallback_kwargs(table, index_name, key_condition, kwargs)
+        if next_token:
+            fallback["ExclusiveStartKey"] = kwargs["ExclusiveStartKey"]
+        response = table.scan(Limit=limit, **fallback)
+    return response.get("Items", []), encode_cursor(response.get("LastEvaluatedKey"))
+
+
+# ⚡ 병렬 세그먼트 scan
+# 세그먼트(Segment/TotalSegments)마다 스레드가 페이지를 읽어 크기 제한 큐로 넘기므로
+# 소비 속도보다 빨리 읽어도 메모리에 쌓이는 양은 queue_size 를 넘지 않는다.
+def parallel_scan(table, total_segments: int = 4, max_workers: int | None = None, queue_size: int = 1000, **kwargs):
+    max_workers = min(total_segments, max_workers or EXPORT_MAX_WORKERS)
+    items = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    done = object()
+
+    def put(value):
+        while not stop.is_set():
+            try:
+                items.put(value, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def scan_segment(segment: int):
+        try:
+            for item in iter_scan(table, Segment=segment, TotalSegments=total_segments, **kwargs):
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"scan-{table.name}")
+    try:
+        for segment in range(total_segments):
+            # 세그먼트 스레드의 호출도 현재 요청의 사용량 집계에 들어가도록 컨텍스트 복사 (세그먼트마다 따로)
+            executor.submit(contextvars.copy_context().run, scan_segment, segment)
+
+        remaining = total_segments
+        while remaining:
+            value = items.get()
+            if value is done:
+                remaining -= 1
+            elif isinstance(value, Exception):
+                raise value
+            else:
+                yield value
+    finally:
+        # 소비자가 중간에 끊어도(클라이언트 연결 종료 등) 남은 세그먼트는 정리
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# 📄 커서 토큰: LastEvaluatedKey 를 클라이언트가 해석할 필요 없는 문자열로 인코딩
+def encode_cursor(last_key) -> str | None:
+    if not last_key:
+        return None
+    raw = json.dumps(last_key, default=lambda o: {"$n": str(o)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+# 토큰은 사용자가 바꿀 수 있으므로 "$n" 값도 그대로 믿지 않음
+# (숫자가 아닌 문자열은 decimal.InvalidOperation(ArithmeticError), 문자열이 아니면 TypeError, NaN / 무한대는 키가 될 수 없음)
+def _cursor_number(value) -> Decimal:
+    number = Decimal(value) if isinstance(value, str) else None
+    if number is None or not number.is_finite():
+        raise ValueError("잘못된 페이지 토큰입니다.")
+    return number
+
+def decode_cursor(token: str):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        key = json.loads(raw, object_hook=lambda d: _cursor_number(d["$n"]) if d.keys() == {"$n"} else d)
+    except (ValueError, ArithmeticError):
+        raise ValueError("잘못된 페이지 토큰입니다.")
+    if not isinstance(key, dict):
+        raise ValueError("잘못된 페이지 토큰입니다.")
+    return key
+
+def scan_page(table, limit: int, next_token: str | None = None, **kwargs):
+    if next_token:
+        kwargs["ExclusiveStartKey"] = decode_cursor(next_token)
+    response = table.scan(Limit=limit, **kwargs)
+    return response.get("Items", []), encode_cursor(response.get("LastEvaluatedKey"))
+
+
+# 🆔 next_id() 로 키를 만드는 새 기록 저장
+# 키가 이미 있으면 덮어쓰지 않고 (worker 번호가 겹친 경우) 새 ID 로 다시 시도, build(id) → 저장할 아이템
+ID_CONFLICT_RETRIES = 3
+
+def is_conditional_check_failed(error: ClientError) -> bool:
+    err = error.response.get("Error", {})
+    if err.get("Code") == "ConditionalCheckFailedException":
+        return True
+    reasons = error.response.get("CancellationReasons") or []
+    return err.get("Code") == "TransactionCanceledException" and any(
+        reason.get("Code") == "ConditionalCheckFailed" for reason in reasons
+    )
+
+def put_new_item(table, key: str, build, retries: int = ID_CONFLICT_RETRIES) -> dict:
+    for attempt in range(retries + 1):
+        item = build(next_id())
+        try:
+            table.put_item(Item=item, ConditionExpression=f"attribute_not_exists({key})")
+            return item
+        except ClientError as e:
+            if not is_conditional_check_failed(e) or attempt == retries:
+                raise
+            logger.warning("id collision on %s.%s=%s, retrying with a new id", table.name, key, item[key])
+
+
+# 🏥 보건소 이름 → hospital_id 인메모리 인덱스
+# 로그인마다 hospitals 테이블 전체를 scan 하지 않도록 프로세스당 한 번 적재하고,
+# 백그라운드 스레드가 TTL 주기로 (또는 refresh() 호출 시) 다시 읽어 교체한다.
+# 인덱스에도 GSI 에도 없는 이름은 잠시 기억해서 같은 이름으로 DynamoDB 를 반복 조회하지 않는다.
+class HospitalIndex:
+    def __init__(self, table_name: str, ttl: int = HOSPITAL_INDEX_TTL):
+        self._table_name = table_name
+        self._ttl = ttl
+        self._unknown = TTLCache(maxsize=HOSPITAL_NEGATIVE_CACHE_SIZE, ttl=HOSPITAL_NEGATIVE_TTL)
+        self.unknown_hits = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._by_name = {}
+        self._items = []
+        self._loaded_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def _table(self):
+        return get_table(self._table_name)
+
+    def refresh(self):
+        items = list(iter_scan(self._table))
+        by_name = {item["name"]: item.get("hospital_id") for item in items if item.get("name")}
+        # 읽기 쪽은 락 없이 참조만 하므로 통째로 교체
+        with self._lock:
+            self._items = items
+            self._by_name = by_name
+            self._loaded_at = time.monotonic()
+        # 새로 추가된 보건소가 있을 수 있으므로 없는 이름 기록은 비움
+        self._unknown.clear()
+        return len(items)
+
+    # 첫 적재는 한 번만 (백그라운드 기동과 첫 요청이 겹쳐도 scan 은 한 번)
+    # STARTUP_MODE=lazy 로 start() 없이 쓰이면 첫 조회 때 갱신 스레드도 같이 띄운다.
+    def _ensure_loaded(self):
+        if self._loaded_at is None:
+            with self._load_lock:
+                if self._loaded_at is None:
+                    self.refresh()
+            self._start_refresher()
+
+    def get_id(self, name: str):
+        self._ensure_loaded()
+        hospital_id = self._by_name.get(name)
+        if hospital_id is not None:
+            return hospital_id
+        if self.is_unknown(name):
+            return None
+
+        # 마지막 갱신 이후 추가된 보건소일 수 있으므로 해당 이름만 직접 조회
+        from boto3.dynamodb.conditions import Key
+        item = next(iter_query(self._table, HOSPITALS_BY_NAME, Key("name").eq(name)), None)
+        if item is None:
+            self._unknown.set(name, True)
+            return None
+        with self._lock:
+            self._by_name = {**self._by_name, name: item.get("hospital_id")}
+            self._items = self._items + [item]
+        return item.get("hospital_id")
+
+    # I/O 없이 인덱스에 있는 값만 확인 (적재 전이거나 없으면 None)
+    def peek(self, name: str):
+        return self._by_name.get(name)
+
+    # 최근에 조회해서 없었던 이름인지 (I/O 없음)
+    def is_unknown(self, name: str) -> bool:
+        if name in self._unknown:
+            self.unknown_hits += 1
+            return True
+        return False
+
+    def stats(self) -> dict:
+        return {
+            "hospitals": len(self._by_name),
+            "unknown_names": len(self._unknown),
+            "unknown_hits": self.unknown_hits,
+        }
+
+    def all(self):
+        self._ensure_loaded()
+        return list(self._items)
+
+    def _run(self):
+        while not self._stop.wait(self._ttl):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("hospital index refresh failed")
+
+    def _start_refresher(self):
+        with self._load_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="hospital-index", daemon=True)
+                self._thread.start()
+
+    def start(self):
+        try:
+            self._ensure_loaded()
+        except Exception:
+            # 기동은 막지 않고 첫 조회 시 다시 적재
+            logger.exception("hospital index initial load failed")
+        self._start_refresher()
+
+    def stop(self):
+        self._stop.set()
+
+
+hospital_index = HospitalIndex(TABLE_HOSPITALS)
 
 # 병원 이름으로 hospital_id 조회 함수
 def get_all_hospitals():
-    response = table_hospitals.scan()
-    return response.get("Items", [])
+    return hospital_index.all()
 
 def get_hospital_id_by_name(public_health_center: str):
-    response = table_hospitals.scan(
-        FilterExpression=Attr("name").eq(public_health_center)
-    )
-    items = response.get("Items", [])
-    return items[0].get("hospital_id") if items else None
\ No newline at end of file
+    return hospital_index.get_id(public_health_center)
+
+# async 핸들러용: 인덱스 적중 시 스레드 전환 없이 바로 반환
+async def get_hospital_id_by_name_async(public_health_center: str):
+    hospital_id = hospital_index.peek(public_health_center)
+    if hospital_id is not None:
+        return hospital_id
+    if hospital_index.is_unknown(public_health_center):
+        return None
+    return await run_blocking(hospital_index.get_id, public_health_center)
+
+get_all_hospitals_async = to_async(get_all_hospitals)
+
+def refresh_hospitals():
+    return hospital_index.refresh()
+
+def start_hospital_index():
+    hospital_index.start()
+
+def stop_hospital_index():
+    hospital_index.stop()
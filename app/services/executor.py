@@ -0,0 +1,90 @@
+# app/services/executor.py
+# 🧵 블로킹 SDK 호출(boto3, firebase_admin)을 이벤트 루프 밖에서 실행하는 공용 스레드 풀
+# async 핸들러에서 DynamoDB/Firestore/FCM 을 직접 부르면 워커 전체가 멈추므로
+# 반드시 run_blocking(...) 으로 감싸서 호출한다.
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import BLOCKING_POOL_SIZE
+
+
+class BlockingExecutor:
+    def __init__(self, max_workers: int = BLOCKING_POOL_SIZE, name: str = "blocking-io"):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._queued = 0
+        self._running = 0
+        self._max_running = 0
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        # 요청 단위 contextvar 가 워커 스레드에서도 보이도록 컨텍스트 복사
+        context = contextvars.copy_context()
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+
+        def call():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._max_running = max(self._max_running, self._running)
+                self._queue_wait_total += started_at - submitted_at
+            failed = False
+            try:
+                return context.run(func, *args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._failed += failed
+                    self._run_time_total += elapsed
+
+        return await loop.run_in_executor(self._executor, call)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "queued": self._queued,
+                "running": self._running,
+                "max_running": self._max_running,
+                "avg_queue_wait_ms": round(self._queue_wait_total / completed * 1000, 3),
+                "avg_run_ms": round(self._run_time_total / completed * 1000, 3),
+            }
+
+
+blocking_executor = BlockingExecutor()
+
+
+async def run_blocking(func, *args, **kwargs):
+    return await blocking_executor.run(func, *args, **kwargs)
+
+
+# 동기 서비스 함수를 그대로 async 버전으로 노출할 때 사용
+def to_async(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await blocking_executor.run(func, *args, **kwargs)
+    return wrapper
@@ -1,16 +1,162 @@
 # app/services/fcm_service.py
 
-from firebase_admin import messaging
+import time
+import random
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
-def send_push_notification(token: str, title: str, body: str, data: dict = {}):
-    message = messaging.Message(
+from app.core.clients import ensure_firebase
+from app.core.config import FCM_BATCH_SIZE, FCM_CHUNK_CONCURRENCY, FCM_INVALID_TOKEN_TTL, FCM_MAX_RETRIES
+from app.services.executor import to_async
+from app.utils.cache import TTLCache
+from app.utils.metrics import track
+
+logger = logging.getLogger(__name__)
+
+# send_each 한 번에 보낼 수 있는 최대 메시지 수 (SDK 제한)
+FCM_SEND_EACH_LIMIT = 500
+
+# 만료/삭제된 토큰은 한동안 다시 보내지 않음 (호출 측에는 invalid_tokens 로 알려서 저장소에서 지우게 함)
+_invalid_tokens = TTLCache(maxsize=100_000, ttl=FCM_INVALID_TOKEN_TTL)
+
+
+def _build_message(token: str, title: str, body: str, data: dict | None):
+    from firebase_admin import messaging
+
+    return messaging.Message(
         notification=messaging.Notification(
             title=title,
             body=body
         ),
         token=token,
-        data={k: str(v) for k, v in data.items()}  # data는 string만 허용
+        data={k: str(v) for k, v in (data or {}).items()}  # data는 string만 허용
     )
 
-    response = messaging.send(message)
-    return response
\ No newline at end of file
+def send_push_notification(token: str, title: str, body: str, data: dict = {}):
+    from firebase_admin import messaging
+
+    ensure_firebase()
+    message = _build_message(token, title, body, data)
+
+    with track("fcm", "messages", "send"):
+        response = messaging.send(message)
+    return response
+
+
+# async 핸들러용 (FCM HTTPS 왕복 동안 이벤트 루프를 막지 않음)
+send_push_notification_async = to_async(send_push_notification)
+
+
+# ---------- 여러 명에게 한 번에 보내기 ----------
+
+# 토큰 자체가 잘못된 경우 → 다시 보내도 소용없으므로 정리 대상
+def _is_invalid_token(error) -> bool:
+    from firebase_admin import exceptions, messaging
+
+    if isinstance(error, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+        return True
+    return isinstance(error, exceptions.InvalidArgumentError) and "registration token" in str(error).lower()
+
+# 일시적인 오류 → 백오프 후 재시도
+def _is_transient(error) -> bool:
+    from firebase_admin import exceptions
+
+    return isinstance(error, (
+        exceptions.UnavailableError,
+        exceptions.InternalError,
+        exceptions.ResourceExhaustedError,
+        exceptions.DeadlineExceededError,
+        exceptions.UnknownError,
+    ))
+
+def _error_result(token: str, error) -> dict:
+    return {
+        "token": token,
+        "success": False,
+        "error": str(error),
+        "code": getattr(error, "code", type(error).__name__),
+    }
+
+
+def _send_chunk(chunk, max_retries: int = FCM_MAX_RETRIES):
+    from firebase_admin import messaging
+
+    results = {}
+    pending = chunk
+    for attempt in range(max_retries + 1):
+        try:
+            with track("fcm", "messages", "send_each"):
+                responses = messaging.send_each([message for _, _, message in pending]).responses
+        except Exception as e:
+            # 배치 호출 전체가 실패하면 모든 메시지를 같은 오류로 처리
+            responses = [messaging.SendResponse(None, e)] * len(pending)
+
+        retry = []
+        for (index, token, message), response in zip(pending, responses):
+            if response.success:
+                results[index] = {"token": token, "success": True, "message_id": response.message_id}
+                continue
+            error = response.exception
+            if _is_invalid_token(error):
+                _invalid_tokens.set(token, True)
+                results[index] = dict(_error_result(token, error), invalid_token=True)
+            elif _is_transient(error) and attempt < max_retries:
+                retry.append((index, token, message))
+            elif _is_transient(error):
+                # 재시도를 다 써도 일시 오류면 호출 측(아웃박스 등)이 나중에 다시 보낼 수 있게 표시
+                results[index] = dict(_error_result(token, error), transient=True)
+            else:
+                results[index] = _error_result(token, error)
+
+        if not retry:
+            break
+        pending = retry
+        # 지수 백오프 + 지터 (0.5s, 1s, 2s … 최대 8s)
+        time.sleep(min(8.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2))
+    return results
+
+
+# recipients: [{"token": ..., "title"?: ..., "body"?: ..., "data"?: ...}]
+# 수신자별 값이 없으면 공통 title/body/data 를 사용. 결과는 recipients 순서 그대로 돌려준다.
+def send_push_notifications(recipients, title: str = "", body: str = "", data: dict | None = None,
+                            max_retries: int = FCM_MAX_RETRIES):
+    ensure_firebase()
+    results = {}
+    messages = []
+    for index, recipient in enumerate(recipients):
+        token = recipient["token"]
+        if token in _invalid_tokens:
+            results[index] = {"token": token, "success": False, "error": "invalid token (cached)",
+                              "code": "NOT_FOUND", "invalid_token": True}
+            continue
+        message = _build_message(
+            token,
+            recipient.get("title") or title,
+            recipient.get("body") or body,
+            {**(data or {}), **(recipient.get("data") or {})},
+        )
+        messages.append((index, token, message))
+
+    batch_size = max(1, min(FCM_BATCH_SIZE, FCM_SEND_EACH_LIMIT))
+    chunks = [messages[i:i + batch_size] for i in range(0, len(messages), batch_size)]
+    if len(chunks) == 1:
+        results.update(_send_chunk(chunks[0], max_retries))
+    elif chunks:
+        # send_each 가 청크 안에서 이미 메시지마다 스레드를 쓰므로 청크 동시 실행 수는 작게 유지
+        with ThreadPoolExecutor(max_workers=min(FCM_CHUNK_CONCURRENCY, len(chunks))) as pool:
+            for chunk_results in pool.map(lambda chunk: _send_chunk(chunk, max_retries), chunks):
+                results.update(chunk_results)
+
+    ordered = [results[index] for index in range(len(recipients))]
+    invalid = [r["token"] for r in ordered if r.get("invalid_token")]
+    if invalid:
+        logger.info("fcm batch: %d invalid tokens pruned", len(invalid))
+    success_count = sum(1 for r in ordered if r["success"])
+    return {
+        "success_count": success_count,
+        "failure_count": len(ordered) - success_count,
+        "invalid_tokens": invalid,
+        "results": ordered,
+    }
+
+send_push_notifications_async = to_async(send_push_notifications)
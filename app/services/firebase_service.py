@@ -1,21 +1,20 @@
 # app/services/firebase_service.py
 
-import firebase_admin
-from firebase_admin import credentials
 import os
-from dotenv import load_dotenv
-
-# 🔐 환경변수 로드
-load_dotenv()
+from app.core.config import FIREBASE_CREDENTIALS_PATH, FIREBASE_DB_URL
 
 # ✅ Firebase 초기화 함수
+# (firebase_admin 은 import 가 무거워서 실제로 초기화할 때 불러옴)
 def init_firebase():
+    import firebase_admin
+    from firebase_admin import credentials
+
     if not firebase_admin._apps:
-        cred_path = os.getenv("FIREBASE_CREDENTIALS_PATH")
+        cred_path = FIREBASE_CREDENTIALS_PATH
         if not cred_path or not os.path.exists(cred_path):
             raise FileNotFoundError(f"Firebase 서비스 계정 키가 없거나 잘못된 경로입니다: {cred_path}")
 
         cred = credentials.Certificate(cred_path)
         firebase_admin.initialize_app(cred, {
-            "databaseURL": os.getenv("FIREBASE_DB_URL")
-        })
\ No newline at end of file
+            "databaseURL": FIREBASE_DB_URL
+        })
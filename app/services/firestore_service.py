@@ -1,8 +1,18 @@
-from firebase_admin import firestore
+from app.core.clients import get_firestore
+from app.core.config import PATIENT_CACHE_TTL
+from app.utils.cache import TTLCache
+from app.utils.metrics import track
+from app.services.executor import to_async
+
+# 환자 정보 캐시 (대기 목록이 같은 환자를 반복 조회하지 않도록 짧게 유지)
+PATIENT_BATCH_SIZE = 100
+_patient_cache = TTLCache(maxsize=5000, ttl=PATIENT_CACHE_TTL)
+_NOT_CACHED = object()
 
 def get_admin_by_id(hospital_id: int):
-    doc_ref = firestore.client().collection("admins").document(str(hospital_id))
-    doc = doc_ref.get()
+    doc_ref = get_firestore().collection("admins").document(str(hospital_id))
+    with track("firestore", "admins", "get", reads=1):
+        doc = doc_ref.get()
     if doc.exists:
         return doc.to_dict()
     return None
@@ -11,10 +21,102 @@ def get_admin_by_id(hospital_id: int):
 # app/services/firestore_service.py
 
 def get_doctor_by_id_and_department(hospital_id: int, department: str):
-    docs = firestore.client().collection("doctors") \
+    query = get_firestore().collection("doctors") \
         .where("hospital_id", "==", hospital_id) \
         .where("department", "==", department) \
-        .stream()
+        .limit(1)
+    with track("firestore", "doctors", "query") as call:
+        docs = list(query.stream())
+        call.reads = len(docs)
     for doc in docs:
-        return doc.to_dict()
-    return None
\ No newline at end of file
+        doctor = doc.to_dict()
+        doctor["license_number"] = doc.id
+        return doctor
+    return None
+
+# 👥 환자 여러 명을 한 번에 조회 (중복 제거 → 캐시 → get_all 배치 조회)
+# 반환값: {patient_id: 환자 dict}, 존재하지 않는 환자는 빠진다.
+def get_patients_by_ids(patient_ids):
+    ids = list(dict.fromkeys(str(pid) for pid in patient_ids if pid))
+    patients = {}
+    missing = []
+    for patient_id in ids:
+        cached = _patient_cache.get(patient_id, _NOT_CACHED)
+        if cached is _NOT_CACHED:
+            missing.append(patient_id)
+        elif cached is not None:
+            patients[patient_id] = cached
+
+    if missing:
+        db = get_firestore()
+        collection = db.collection("patients")
+        for start in range(0, len(missing), PATIENT_BATCH_SIZE):
+            refs = [collection.document(pid) for pid in missing[start:start + PATIENT_BATCH_SIZE]]
+            with track("firestore", "patients", "get_all", reads=len(refs)):
+                docs = list(db.get_all(refs))
+            for doc in docs:
+                data = doc.to_dict() if doc.exists else None
+                # 없는 환자도 캐시해서 같은 id 로 반복 조회하지 않음
+                _patient_cache.set(doc.id, data)
+                if data is not None:
+                    patients[doc.id] = data
+
+    return patients
+
+
+# 🩺 보건소별 의사 목록 (관리자 화면용)
+# 화면에 보이는 필드만 select 로 받아서 bio / availability / password 는 읽지 않고,
+# 문서 id 순서로 limit 개씩 끊어 읽는다 (next 는 마지막 문서 id → start_after).
+# 보건소 의사 수가 늘어도 한 페이지에 드는 읽기 수와 응답 크기는 limit 로 고정된다.
+DOCTOR_DIRECTORY_FIELDS = ["name", "department", "email", "contact", "gender"]
+
+# next 는 사용자가 바꿀 수 있으므로 Firestore 문서 id 규칙에 맞는지 먼저 확인
+# ("/" 나 빈 경로 조각이 있으면 document() 가 ValueError 를 내서 500 이 되던 것 → 라우트에서 400)
+def _page_document_id(token: str) -> str:
+    if (
+        "/" in token
+        or token in (".", "..")
+        or (token.startswith("__") and token.endswith("__"))
+        or len(token.encode()) > 1500
+    ):
+        raise ValueError("잘못된 페이지 토큰입니다.")
+    return token
+
+def list_doctors_page(hospital_id, limit: int = 50, next_token: str | None = None, department: str | None = None):
+    doctors_ref = get_firestore().collection("doctors")
+    query = doctors_ref.where("hospital_id", "==", int(hospital_id))
+    if department:
+        query = query.where("department", "==", department)
+    query = query.select(DOCTOR_DIRECTORY_FIELDS).order_by("__name__").limit(limit)
+    if next_token:
+        query = query.start_after({"__name__": doctors_ref.document(_page_document_id(next_token))})
+
+    doctors = []
+    last_id = None
+    with track("firestore", "doctors", "query") as call:
+        docs = list(query.stream())
+        call.reads = len(docs)
+    for doc in docs:
+        doctor = doc.to_dict()
+        doctor["license_number"] = last_id = doc.id
+        doctors.append(doctor)
+    return doctors, (last_id if len(doctors) == limit else None)
+
+
+# 🔑 로그인할 때 평문 / 예전 비용 비밀번호를 새 해시로 바꿔 저장
+def update_doctor_password(license_number: str, password_hash: str):
+    with track("firestore", "doctors", "update", writes=1):
+        get_firestore().collection("doctors").document(license_number).update({"password": password_hash})
+
+def update_admin_password(hospital_id, password_hash: str):
+    with track("firestore", "admins", "update", writes=1):
+        get_firestore().collection("admins").document(str(hospital_id)).update({"password": password_hash})
+
+
+# async 핸들러용 (블로킹 Firestore 호출은 executor 에서 실행)
+get_admin_by_id_async = to_async(get_admin_by_id)
+get_doctor_by_id_and_department_async = to_async(get_doctor_by_id_and_department)
+get_patients_by_ids_async = to_async(get_patients_by_ids)
+list_doctors_page_async = to_async(list_doctors_page)
+update_doctor_password_async = to_async(update_doctor_password)
+update_admin_password_async = to_async(update_admin_password)
@@ -0,0 +1,286 @@
+# app/services/notification_outbox.py
+# 📮 푸시 알림 아웃박스
+# 요청 경로에서는 SQLite 에 한 줄 적고 바로 응답하고, 백그라운드 워커가 모아서 FCM 으로 보낸다.
+#  - 같은 토큰 + 같은 내용이 아직 대기 중이거나 방금(COALESCE_WINDOW 초 이내) 보낸 경우 새로 쌓지 않음
+#  - 재시작해도 대기 중인 알림은 파일에 남아 있어 이어서 보냄
+#  - 보내는 중에 프로세스가 죽은 건(status=sending)은 임대 시간이 지나면 다시 가져감 (최소 한 번 전송)
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import deque
+
+from app.core.config import (
+    NOTIFICATION_COALESCE_WINDOW,
+    NOTIFICATION_MAX_ATTEMPTS,
+    NOTIFICATION_OUTBOX_PATH,
+    NOTIFICATION_WORKERS,
+)
+from app.services.executor import to_async
+from app.services.fcm_service import FCM_SEND_EACH_LIMIT, send_push_notifications
+
+logger = logging.getLogger(__name__)
+
+# 보내는 중(sending) 상태로 이 시간보다 오래 남은 건은 워커가 죽은 것으로 보고 다시 보냄
+CLAIM_LEASE = 120.0
+# 보냄/실패 기록 보관 기간(초)
+RETENTION = 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    token TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    data TEXT NOT NULL,
+    dedupe_key TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    claimed_at REAL,
+    sent_at REAL,
+    message_id TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON notification_outbox (status, available_at);
+CREATE INDEX IF NOT EXISTS idx_outbox_dedupe ON notification_outbox (dedupe_key);
+"""
+
+
+def _dedupe_key(token: str, title: str, body: str, data: str) -> str:
+    return hashlib.sha256("\x1f".join((token, title, body, data)).encode()).hexdigest()
+
+def _percentile(values, q: float):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class NotificationOutbox:
+    def __init__(self, path: str = NOTIFICATION_OUTBOX_PATH, workers: int = NOTIFICATION_WORKERS,
+                 coalesce_window: float = NOTIFICATION_COALESCE_WINDOW, max_attempts: int = NOTIFICATION_MAX_ATTEMPTS):
+        self._path = path
+        self._workers = workers
+        self._coalesce_window = coalesce_window
+        self._max_attempts = max_attempts
+        self._conn = None
+        self._db_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._counters = {"enqueued": 0, "coalesced": 0, "sent": 0, "failed": 0, "retried": 0}
+        self._delivery_ms = deque(maxlen=1000)   # 접수 → 전송 완료
+        self._send_ms = deque(maxlen=1000)       # FCM 호출 1회 (배치 단위)
+
+    # ---------- 저장소 ----------
+    def _db(self):
+        if self._conn is None:
+            with self._db_lock:
+                if self._conn is None:
+                    conn = sqlite3.connect(self._path, timeout=30, isolation_level=None, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn.executescript(_SCHEMA)
+                    self._conn = conn
+        return self._conn
+
+    def enqueue(self, token: str, title: str, body: str, data: dict | None = None):
+        data_json = json.dumps({k: str(v) for k, v in (data or {}).items()}, sort_keys=True, ensure_ascii=False)
+        key = _dedupe_key(token, title, body, data_json)
+        now = time.time()
+        conn = self._db()
+        with self._db_lock:
+            row = conn.execute(
+                "SELECT id FROM notification_outbox WHERE dedupe_key = ? "
+                "AND (status IN ('pending', 'sending') OR (status = 'sent' AND sent_at >= ?)) "
+                "ORDER BY id DESC LIMIT 1",
+                (key, now - self._coalesce_window),
+            ).fetchone()
+            if row is None:
+                notification_id = conn.execute(
+                    "INSERT INTO notification_outbox (token, title, body, data, dedupe_key, created_at, available_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (token, title, body, data_json, key, now, now),
+                ).lastrowid
+        with self._stats_lock:
+            self._counters["coalesced" if row else "enqueued"] += 1
+        if row is not None:
+            return row[0], True
+        self._wake.set()
+        return notification_id, False
+
+    def _claim(self, limit: int):
+        now = time.time()
+        conn = self._db()
+        with self._db_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, token, title, body, data, attempts, created_at FROM notification_outbox "
+                    "WHERE (status = 'pending' AND available_at <= ?) OR (status = 'sending' AND claimed_at < ?) "
+                    "ORDER BY available_at LIMIT ?",
+                    (now, now - CLAIM_LEASE, limit),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE notification_outbox SET status = 'sending', claimed_at = ? WHERE id = ?",
+                    [(now, row[0]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _finish(self, sent, retry, failed):
+        now = time.time()
+        conn = self._db()
+        with self._db_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "UPDATE notification_outbox SET status = 'sent', sent_at = ?, message_id = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    [(now, message_id, notification_id) for notification_id, message_id in sent],
+                )
+                conn.executemany(
+                    "UPDATE notification_outbox SET status = 'pending', available_at = ?, error = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    [(now + delay, error, notification_id) for notification_id, delay, error in retry],
+                )
+                conn.executemany(
+                    "UPDATE notification_outbox SET status = 'failed', error = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(error, notification_id) for notification_id, error in failed],
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _purge(self):
+        conn = self._db()
+        with self._db_lock:
+            conn.execute(
+                "DELETE FROM notification_outbox WHERE status IN ('sent', 'failed') AND created_at < ?",
+                (time.time() - RETENTION,),
+            )
+
+    # ---------- 워커 ----------
+    def _process(self, rows):
+        recipients = [
+            {"token": token, "title": title, "body": body, "data": json.loads(data)}
+            for _, token, title, body, data, _, _ in rows
+        ]
+        started = time.perf_counter()
+        try:
+            # 재시도는 여기서 기다리지 않고 available_at 을 미뤄서 다시 꺼내도록 함
+            results = send_push_notifications(recipients, max_retries=0)["results"]
+        except Exception as e:
+            logger.exception("notification batch send failed")
+            results = [{"success": False, "transient": True, "error": str(e)}] * len(rows)
+        send_ms = (time.perf_counter() - started) * 1000
+
+        now = time.time()
+        sent, retry, failed, delivery_ms = [], [], [], []
+        for (notification_id, _, _, _, _, attempts, created_at), result in zip(rows, results):
+            if result["success"]:
+                sent.append((notification_id, result.get("message_id")))
+                delivery_ms.append((now - created_at) * 1000)
+            elif result.get("transient") and attempts + 1 < self._max_attempts:
+                retry.append((notification_id, min(300.0, 2.0 * 2 ** attempts), result.get("error")))
+            else:
+                failed.append((notification_id, result.get("error")))
+        self._finish(sent, retry, failed)
+
+        with self._stats_lock:
+            self._send_ms.append(send_ms)
+            self._delivery_ms.extend(delivery_ms)
+            self._counters["sent"] += len(sent)
+            self._counters["retried"] += len(retry)
+            self._counters["failed"] += len(failed)
+
+    def _run(self):
+        last_purge = 0.0
+        while not self._stop.is_set():
+            try:
+                rows = self._claim(FCM_SEND_EACH_LIMIT)
+                if rows:
+                    self._process(rows)
+                    continue
+                if time.monotonic() - last_purge > 3600:
+                    self._purge()
+                    last_purge = time.monotonic()
+            except Exception:
+                logger.exception("notification outbox worker error")
+            # 새 알림이 들어오면 바로 깨고, 아니면 재시도 예정 건을 보러 주기적으로 확인
+            self._wake.wait(1.0)
+            self._wake.clear()
+
+    def start(self):
+        self._db()
+        self._stop.clear()
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for i in range(len(self._threads), self._workers):
+            thread = threading.Thread(target=self._run, name=f"notification-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    # ---------- 상태 ----------
+    def stats(self) -> dict:
+        conn = self._db()
+        with self._db_lock:
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM notification_outbox GROUP BY status"
+            ).fetchall())
+        with self._stats_lock:
+            delivery = list(self._delivery_ms)
+            send = list(self._send_ms)
+            counters = dict(self._counters)
+        return {
+            "queue_depth": counts.get("pending", 0),
+            "in_flight": counts.get("sending", 0),
+            "failed_stored": counts.get("failed", 0),
+            "workers": sum(t.is_alive() for t in self._threads),
+            **counters,
+            "delivery_ms": {
+                "avg": round(sum(delivery) / len(delivery), 1) if delivery else 0.0,
+                "p50": round(_percentile(delivery, 0.5), 1),
+                "p95": round(_percentile(delivery, 0.95), 1),
+            },
+            "send_call_ms": {
+                "avg": round(sum(send) / len(send), 1) if send else 0.0,
+                "p95": round(_percentile(send, 0.95), 1),
+            },
+        }
+
+
+notification_outbox = NotificationOutbox()
+
+
+def enqueue_notification(token: str, title: str, body: str, data: dict | None = None):
+    return notification_outbox.enqueue(token, title, body, data)
+
+enqueue_notification_async = to_async(enqueue_notification)
+
+def start_notification_outbox():
+    notification_outbox.start()
+
+def stop_notification_outbox():
+    notification_outbox.stop()
+
+def notification_outbox_stats():
+    return notification_outbox.stats()
+
+# 대기 건수를 SQLite 에서 세므로 (발송 스레드와 같은 락) async 핸들러에서는 이쪽을 씀
+notification_outbox_stats_async = to_async(notification_outbox_stats)
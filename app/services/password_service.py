@@ -0,0 +1,73 @@
+# app/services/password_service.py
+# 🔑 비밀번호 해시 (scrypt, 표준 라이브러리 hashlib)
+#   저장 형식: scrypt$N$r$p$salt(base64)$hash(base64)
+#   - 예전 평문 비밀번호도 그대로 확인하고, 로그인에 성공하면 needs_rehash=True 로 알려서 해시로 바꿔 저장
+#   - 비용(N / r / p)을 바꾸면 이전 비용으로 만든 해시도 다음 로그인 때 새 비용으로 다시 저장
+#   - scrypt 는 한 번에 수십 ms 가 걸리므로 async 핸들러에서는 *_async 로 전용 풀에서 실행
+#     (공용 blocking 풀과 나눠서 로그인이 몰려도 DynamoDB / Firestore 호출이 밀리지 않게)
+
+import base64
+import hashlib
+import hmac
+import secrets
+
+from app.core.config import PASSWORD_HASH_WORKERS, PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_P, PASSWORD_SCRYPT_R
+from app.services.executor import BlockingExecutor
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# 해시 전용 풀 (hashlib.scrypt 는 계산 중 GIL 을 놓으므로 스레드로 충분)
+password_executor = BlockingExecutor(max_workers=PASSWORD_HASH_WORKERS, name="password-hash")
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p + 1024 * 1024, dklen=KEY_BYTES,
+    )
+
+
+def hash_password(password: str, n: int = PASSWORD_SCRYPT_N, r: int = PASSWORD_SCRYPT_R, p: int = PASSWORD_SCRYPT_P) -> str:
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, n, r, p)
+    return "$".join((SCHEME, str(n), str(r), str(p), base64.b64encode(salt).decode(), base64.b64encode(digest).decode()))
+
+
+def is_hashed(stored: str | None) -> bool:
+    return bool(stored) and stored.startswith(SCHEME + "$")
+
+
+# 반환: (일치 여부, 다시 해시해서 저장해야 하는지)
+def verify_password(password: str, stored: str | None) -> tuple[bool, bool]:
+    if not stored:
+        return False, False
+    if not is_hashed(stored):
+        # 아직 평문으로 저장된 계정
+        matched = hmac.compare_digest(password.encode(), stored.encode())
+        return matched, matched
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), n, r, p)
+    except (ValueError, TypeError):
+        return False, False
+    matched = hmac.compare_digest(actual, expected)
+    outdated = (n, r, p) != (PASSWORD_SCRYPT_N, PASSWORD_SCRYPT_R, PASSWORD_SCRYPT_P)
+    return matched, matched and outdated
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_executor.run(hash_password, password)
+
+async def verify_password_async(password: str, stored: str | None) -> tuple[bool, bool]:
+    if not is_hashed(stored):
+        # 평문 비교는 바로 끝나므로 풀을 거치지 않음
+        return verify_password(password, stored)
+    return await password_executor.run(verify_password, password, stored)
+
+
+def password_hash_stats() -> dict:
+    return password_executor.stats()
@@ -0,0 +1,104 @@
+# app/services/prescription_service.py
+# 💊 진료 마무리 저장 (진단 기록 + 처방전 한 번에)
+# 진단 기록 1건과 처방전 1건(약품 줄 전체 포함)을 TransactWriteItems 한 번으로 쓴다.
+#  - 둘 다 next_id() 로 만든 새 키라서 "키가 없을 때만" 조건을 걸어 씀
+#    (worker 번호가 겹쳐 같은 ID 가 나와도 기존 기록을 덮어쓰지 않음, app/utils/id_generator.py)
+#  - BatchWriteItem 은 조건을 걸 수 없어서 트랜잭션을 씀 (둘 다 쓰이거나 둘 다 안 쓰임, 쓰기 용량은 2배)
+#  - 조건에 걸리면 새 ID 로 ID_CONFLICT_RETRIES 번까지 다시 보냄
+#  - 두 기록 모두 보건소(hospital_id)를 같이 저장 → 관리자 내보내기가 자기 보건소 기록만 고름 (app/test_api.py EXPORT_TABLES)
+#  - 진료 신청(request_id)을 주면 같은 트랜잭션에서 해결 처리 + 대기열 인덱스 키 삭제 (app/services/care_request_service.py)
+#    그 보건소의 신청이 아니면 아무것도 쓰지 않고 LookupError
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+from app.core.clients import get_dynamodb
+from app.services.care_request_service import solve_update
+from app.services.dynamodb_service import ID_CONFLICT_RETRIES, is_conditional_check_failed
+from app.utils.id_generator import next_id
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+
+TABLE_DIAGNOSIS = "diagnosis_records"
+TABLE_PRESCRIPTIONS = "prescription_records"
+
+
+def _put_new(table_name: str, key: str, item: dict) -> dict:
+    return {"Put": {"TableName": table_name, "Item": item, "ConditionExpression": f"attribute_not_exists({key})"}}
+
+
+# 트랜잭션의 첫 번째 쓰기가 조건에 걸렸는지 (진료 신청 해결 처리를 맨 앞에 넣음)
+def _first_write_rejected(error: ClientError) -> bool:
+    reasons = error.response.get("CancellationReasons") or []
+    return bool(reasons) and reasons[0].get("Code") == "ConditionalCheckFailed"
+
+
+def _records(doctor_id, hospital_id, patient_id, disease_code, items, diagnosis_text, memo, diagnosis_id, recorded_at, request_id):
+    writes = [] if request_id is None else [solve_update(request_id, hospital_id)]
+    if diagnosis_id is None:
+        diagnosis_id = next_id()
+        writes.append(_put_new(TABLE_DIAGNOSIS, "diagnosis_id", {
+            "diagnosis_id": diagnosis_id,
+            "doctor_id": doctor_id,
+            "hospital_id": hospital_id,
+            "patient_id": patient_id,
+            "disease_code": disease_code,
+            "diagnosis_text": diagnosis_text or memo,
+            "diagnosed_at": recorded_at,
+        }))
+
+    prescription_id = next_id()
+    medication_days = max((int(item.get("days") or 0) for item in items), default=0)
+    writes.append(_put_new(TABLE_PRESCRIPTIONS, "prescription_id", {
+        "prescription_id": prescription_id,
+        "diagnosis_id": diagnosis_id,
+        "doctor_id": doctor_id,
+        "hospital_id": hospital_id,
+        "patient_id": patient_id,
+        "medication_days": medication_days,
+        "medication_list": [item["medication_code"] for item in items],
+        "medications": [{k: v for k, v in item.items() if v not in (None, "")} for item in items],
+        "memo": memo,
+        "prescribed_at": recorded_at,
+    }))
+    return writes, diagnosis_id, prescription_id
+
+
+# items: [{"medication_code": ..., "medication_name": ..., "days": ..., ...}, ...]
+# diagnosis_id 를 주면 이미 저장된 진단 기록에 처방전만 붙임, request_id 를 주면 그 진료 신청을 해결 처리
+def submit_consultation(
+    doctor_id,
+    hospital_id: int,
+    patient_id: str,
+    disease_code: str,
+    items: list,
+    diagnosis_text: str = "",
+    memo: str = "",
+    diagnosis_id: int | None = None,
+    request_id: int | None = None,
+) -> dict:
+    recorded_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+    client = get_dynamodb().meta.client
+    for attempt in range(ID_CONFLICT_RETRIES + 1):
+        writes, new_diagnosis_id, prescription_id = _records(
+            doctor_id, hospital_id, patient_id, disease_code, items, diagnosis_text, memo, diagnosis_id, recorded_at, request_id,
+        )
+        try:
+            client.transact_write_items(TransactItems=writes)
+            break
+        except ClientError as e:
+            if request_id is not None and _first_write_rejected(e):
+                raise LookupError(f"care request {request_id} not found in hospital {hospital_id}") from e
+            if not is_conditional_check_failed(e) or attempt == ID_CONFLICT_RETRIES:
+                raise
+            logger.warning("id collision saving prescription %s, retrying with new ids", prescription_id)
+    return {
+        "prescription_id": prescription_id,
+        "diagnosis_id": new_diagnosis_id,
+        "medication_count": len(items),
+        "write_calls": attempt + 1,
+    }
@@ -0,0 +1,65 @@
+# app/services/session_service.py
+# 🔐 로그인 세션 토큰 (서버 저장소 없이 서명만으로 검증)
+#   토큰 = base64url(JSON 클레임) + "." + base64url(HMAC-SHA256(서명 키, 앞부분))
+#   클레임: hid(보건소 id) / role / did(의사 id) / dep(진료과) / iat / exp
+# 요청마다 DynamoDB 보건소 조회나 Firestore 의사/관리자 조회 없이 이 토큰만 확인한다.
+# (서명 키를 바꾸면 기존 토큰은 모두 무효가 됨, 개별 로그아웃은 쿠키 삭제로 처리)
+
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+
+import orjson
+
+from app.core.config import SESSION_SECRET, SESSION_TTL
+from app.utils.exceptions import AuthError
+
+logger = logging.getLogger(__name__)
+
+if not SESSION_SECRET:
+    logger.warning("SESSION_SECRET is not set, using a per-process key (sessions will not survive restarts)")
+_KEY = (SESSION_SECRET or secrets.token_urlsafe(32)).encode()
+
+
+def _b64encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+def _sign(payload: bytes) -> bytes:
+    return _b64encode(hmac.new(_KEY, payload, hashlib.sha256).digest())
+
+
+# did: 숫자 doctor_id (기록 저장 / doctor_id-index 조회용), lic: 면허번호 (Firestore 의사 문서 id)
+def issue_token(hospital_id, role: str, doctor_id: int | None = None, department: str | None = None,
+                license_number: str | None = None, ttl: int = SESSION_TTL) -> str:
+    now = int(time.time())
+    claims = {"hid": hospital_id, "role": role, "iat": now, "exp": now + ttl}
+    if doctor_id is not None:
+        claims["did"] = int(doctor_id)
+    if license_number:
+        claims["lic"] = license_number
+    if department:
+        claims["dep"] = department
+    payload = _b64encode(orjson.dumps(claims))
+    return (payload + b"." + _sign(payload)).decode()
+
+
+def verify_token(token: str) -> dict:
+    try:
+        payload, signature = token.encode().split(b".")
+    except (ValueError, UnicodeEncodeError):
+        raise AuthError("잘못된 세션 토큰입니다.")
+    if not hmac.compare_digest(_sign(payload), signature):
+        raise AuthError("잘못된 세션 토큰입니다.")
+    try:
+        claims = orjson.loads(_b64decode(payload))
+    except (ValueError, orjson.JSONDecodeError):
+        raise AuthError("잘못된 세션 토큰입니다.")
+    if claims.get("exp", 0) < time.time():
+        raise AuthError("세션이 만료되었습니다. 다시 로그인하세요.")
+    return claims
@@ -0,0 +1,133 @@
+# app/services/transcript_service.py
+# 📝 통화 중 발화 텍스트 스트리밍 저장
+# 발화마다 calls/{room_id} 문서 하나에 ArrayUnion 하면 문서 1MB 제한과 단일 문서 쓰기 경합에 걸린다.
+# WebSocket 으로 받은 발화를 방별로 모았다가 N개 또는 T ms 마다 한 번에
+# calls/{room_id}/transcript_chunks/{chunk_id} 문서 하나로 저장한다.
+# 읽을 때는 청크를 first_at 순으로 읽어 (at, seq) 순서로 펼친다.
+
+import time
+import uuid
+import asyncio
+import logging
+
+from app.core.clients import get_firestore
+from app.core.config import TRANSCRIPT_FLUSH_ITEMS, TRANSCRIPT_FLUSH_MS
+from app.services.executor import run_blocking
+from app.utils.metrics import track
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_ROLES = ("doctor", "patient")
+MAX_TEXT_LENGTH = 2000
+# 저장 실패 시 다시 시도하기까지 대기(초)
+RETRY_DELAY = 1.0
+
+# 프로세스 구분용 (여러 인스턴스가 같은 방 청크를 써도 문서 id 가 겹치지 않게)
+_WRITER_ID = uuid.uuid4().hex[:8]
+
+
+def _chunks(room_id: str):
+    return get_firestore().collection("calls").document(room_id).collection("transcript_chunks")
+
+
+def write_chunk(room_id: str, items: list) -> str:
+    first_at = items[0]["at"]
+    chunk_id = f"{first_at:013d}_{_WRITER_ID}_{items[0]['seq']:06d}"
+    with track("firestore", "transcript_chunks", "set", writes=1):
+        _chunks(room_id).document(chunk_id).set({
+            "first_at": first_at,
+            "last_at": items[-1]["at"],
+            "count": len(items),
+            "writer": _WRITER_ID,
+            "items": items,
+        })
+    return chunk_id
+
+
+class TranscriptBuffer:
+    def __init__(self, room_id: str, flush_items: int = TRANSCRIPT_FLUSH_ITEMS, flush_ms: int = TRANSCRIPT_FLUSH_MS):
+        self.room_id = room_id
+        self._flush_items = flush_items
+        self._flush_delay = flush_ms / 1000
+        self._items = []
+        self._seq = 0
+        self._timer = None
+        self._pending_writes = set()
+        self.connections = 0
+        self.flushed = 0
+
+    def add(self, role: str, text: str) -> int:
+        self._seq += 1
+        self._items.append({"seq": self._seq, "at": time.time_ns() // 1_000_000, "role": role, "text": text})
+        if len(self._items) >= self._flush_items:
+            self._spawn_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._flush_delay, self._spawn_flush)
+        return self._seq
+
+    def _spawn_flush(self):
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._items:
+            return
+        items, self._items = self._items, []
+        try:
+            await run_blocking(write_chunk, self.room_id, items)
+            self.flushed += len(items)
+        except Exception:
+            # 못 쓴 발화는 버리지 않고 앞에 되돌려 두었다가 다시 저장
+            logger.exception("transcript flush failed for %s (%d items)", self.room_id, len(items))
+            self._items = items + self._items
+            if self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(RETRY_DELAY, self._spawn_flush)
+
+    async def close(self):
+        await self.flush()
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+
+# 방별 버퍼 (의사/환자 연결이 같은 버퍼를 공유, 마지막 연결이 끊기면 남은 것 저장 후 제거)
+_buffers: dict[str, TranscriptBuffer] = {}
+
+
+def open_transcript(room_id: str) -> TranscriptBuffer:
+    buffer = _buffers.get(room_id)
+    if buffer is None:
+        buffer = _buffers[room_id] = TranscriptBuffer(room_id)
+    buffer.connections += 1
+    return buffer
+
+async def close_transcript(buffer: TranscriptBuffer):
+    buffer.connections -= 1
+    await buffer.close()
+    if buffer.connections <= 0 and _buffers.get(buffer.room_id) is buffer:
+        del _buffers[buffer.room_id]
+
+async def flush_all_transcripts():
+    for buffer in list(_buffers.values()):
+        await buffer.close()
+
+
+# 저장된 발화를 순서대로 읽기 (청크 단위 페이지, next 는 마지막 청크 id)
+# 청크 id 가 first_at(ms, 13자리) 로 시작하므로 문서 id 순서가 곧 시간 순서
+def read_transcript(room_id: str, limit: int = 50, next_token: str | None = None):
+    chunks_ref = _chunks(room_id)
+    query = chunks_ref.order_by("__name__").limit(limit)
+    if next_token:
+        query = query.start_after({"__name__": chunks_ref.document(next_token)})
+    with track("firestore", "transcript_chunks", "query") as call:
+        chunks = list(query.stream())
+        call.reads = len(chunks)
+    items = []
+    for chunk in chunks:
+        items.extend(chunk.to_dict().get("items", []))
+    items.sort(key=lambda item: (item["at"], item["seq"]))
+    next_chunk = chunks[-1].id if len(chunks) == limit else None
+    return items, next_chunk
@@ -0,0 +1,217 @@
+# app/services/waiting_queue.py
+# 📡 보건소 × 진료과별 실시간 대기열
+# 접속한 의사마다 따로 조회하지 않고, (보건소, 진료과)마다 감시 루프 하나가 주기적으로 대기 목록을 읽어
+# 이전 상태와 비교한 add / update / remove 이벤트만 구독자 큐로 나눠 준다.
+# 새 구독자는 현재 목록 전체(snapshot)를 먼저 받고, 구독자가 없어지면 감시 루프도 멈춘다.
+# 보건소 / 진료과는 로그인 세션 값만 씀 (다른 보건소의 환자 목록을 받을 수 없도록)
+
+import asyncio
+import logging
+
+from app.core.clients import get_table
+from app.core.config import WAITING_QUEUE_POLL_INTERVAL
+from app.services.care_request_service import waiting_key
+from app.services.dynamodb_schema import CARE_REQUESTS_WAITING
+from app.services.dynamodb_service import iter_query
+from app.services.executor import run_blocking
+from app.services.firestore_service import get_patients_by_ids
+
+logger = logging.getLogger(__name__)
+
+# 구독자 큐가 이만큼 밀리면 이벤트를 버리고 다음에 snapshot 을 다시 보냄
+SUBSCRIBER_QUEUE_SIZE = 256
+# 마지막 구독자가 나간 뒤 감시 루프를 유지하는 시간(초) (새로고침 시 다시 적재하지 않도록)
+IDLE_GRACE = 30.0
+
+
+def _joined(value) -> str:
+    return ", ".join(value) if isinstance(value, list) else (value or "")
+
+def _consultation(request: dict, patient: dict) -> dict:
+    return {
+        "consultation_id": str(request.get("request_id")),
+        "patient_id": str(request["patient_id"]) if request.get("patient_id") else None,
+        "name": patient.get("name"),
+        "birth": patient.get("birth_date"),
+        "symptoms": _joined(request.get("symptom_type") or request.get("symptom_part")),
+        "requested_at": " ".join(str(v) for v in (request.get("book_date"), request.get("book_hour")) if v),
+        "department": request.get("department"),
+        "doctor_id": request.get("doctor_id"),
+        "sign_language_needed": request.get("sign_language_needed", False),
+    }
+
+# 보건소 × 진료과의 대기 중인 진료 신청 + 환자 정보 → {consultation_id: 항목}
+# waiting-index 에는 대기 중인 신청만 "보건소#진료과" 키로 들어 있으므로 필터 없이 그 키만 읽음
+def load_waiting(hospital_id: int, department: str) -> dict:
+    from boto3.dynamodb.conditions import Key
+
+    care_requests = list(iter_query(
+        get_table("care_requests"),
+        CARE_REQUESTS_WAITING,
+        Key("waiting_key").eq(waiting_key(hospital_id, department)),
+    ))
+    patients = get_patients_by_ids(request.get("patient_id") for request in care_requests)
+    waiting = {}
+    for request in care_requests:
+        patient = patients.get(str(request.get("patient_id")))
+        if patient is None:
+            continue
+        item = _consultation(request, patient)
+        waiting[item["consultation_id"]] = item
+    return waiting
+
+
+# 진료 신청 한 건 + 환자 정보 (영상 진료 화면용), 없거나 id 형식이 아니면 None
+def load_consultation(consultation_id: str) -> dict | None:
+    try:
+        request_id = int(consultation_id)
+    except (TypeError, ValueError):
+        return None
+    request = get_table("care_requests").get_item(Key={"request_id": request_id}).get("Item")
+    if request is None:
+        return None
+    patient = get_patients_by_ids([request.get("patient_id")]).get(str(request.get("patient_id")), {})
+    return dict(
+        _consultation(request, patient),
+        hospital_id=request.get("hospital_id"),
+        gender=patient.get("gender"),
+        symptom_area=_joined(request.get("symptom_part")),
+        main_symptom=_joined(request.get("symptom_type")),
+    )
+
+
+def diff_waiting(previous: dict, current: dict) -> list:
+    events = []
+    for consultation_id, item in current.items():
+        before = previous.get(consultation_id)
+        if before is None:
+            events.append({"type": "add", "item": item})
+        elif before != item:
+            events.append({"type": "update", "item": item})
+    for consultation_id in previous.keys() - current.keys():
+        events.append({"type": "remove", "consultation_id": consultation_id})
+    return events
+
+
+class Subscriber:
+    def __init__(self):
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.lagging = False
+
+    def push(self, event: dict):
+        if self.lagging:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # 못 따라오는 구독자는 밀린 이벤트를 버리고 다음 변경 때 전체 목록을 다시 받음
+            self.lagging = True
+
+
+class DepartmentWatcher:
+    def __init__(self, hospital_id: int, department: str, interval: float = WAITING_QUEUE_POLL_INTERVAL, loader=load_waiting):
+        self.hospital_id = hospital_id
+        self.department = department
+        self._interval = interval
+        self._loader = loader
+        self._subscribers = set()
+        self._snapshot = None
+        self._version = 0
+        self._task = None
+        self._idle_since = None
+        self.polls = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def _snapshot_event(self) -> dict:
+        return {"type": "snapshot", "version": self._version, "items": list(self._snapshot.values())}
+
+    # 페이지 첫 화면용 현재 목록 (감시 중이면 마지막 snapshot, 아니면 한 번 읽음)
+    async def current(self) -> list:
+        if self._snapshot is not None:
+            return list(self._snapshot.values())
+        return list((await run_blocking(self._loader, self.hospital_id, self.department)).values())
+
+    # 이미 적재돼 있으면 snapshot 을 바로 넣어 주고, 아니면 첫 적재 때 받음
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        self._idle_since = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        if self._snapshot is not None:
+            subscriber.push(self._snapshot_event())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        if not self._subscribers:
+            self._idle_since = asyncio.get_running_loop().time()
+
+    def _publish(self, events: list):
+        for subscriber in list(self._subscribers):
+            if subscriber.lagging:
+                # 큐를 비우고 현재 전체 목록부터 다시 시작
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                subscriber.lagging = False
+                subscriber.push(self._snapshot_event())
+                continue
+            for event in events:
+                subscriber.push(event)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._idle_since is not None and loop.time() - self._idle_since >= IDLE_GRACE:
+                # 구독자가 없으면 멈추고, 다음 구독 때 새로 적재
+                self._snapshot = None
+                return
+            try:
+                current = await run_blocking(self._loader, self.hospital_id, self.department)
+                self.polls += 1
+                if self._snapshot is None:
+                    self._snapshot = current
+                    self._version += 1
+                    event = self._snapshot_event()
+                    for subscriber in list(self._subscribers):
+                        subscriber.push(event)
+                else:
+                    events = diff_waiting(self._snapshot, current)
+                    if events:
+                        self._snapshot = current
+                        self._version += 1
+                        for event in events:
+                            event["version"] = self._version
+                        self._publish(events)
+            except Exception:
+                logger.exception("waiting queue poll failed for %s/%s", self.hospital_id, self.department)
+            await asyncio.sleep(self._interval)
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+_watchers: dict[tuple, DepartmentWatcher] = {}
+
+
+def get_watcher(hospital_id: int, department: str) -> DepartmentWatcher:
+    key = (hospital_id, department)
+    watcher = _watchers.get(key)
+    if watcher is None:
+        watcher = _watchers[key] = DepartmentWatcher(hospital_id, department)
+    return watcher
+
+def stop_waiting_watchers():
+    for watcher in _watchers.values():
+        watcher.stop()
+    _watchers.clear()
+
+def waiting_queue_stats() -> dict:
+    return {
+        f"{hospital_id}/{department}": {"subscribers": watcher.subscribers, "polls": watcher.polls}
+        for (hospital_id, department), watcher in _watchers.items()
+    }
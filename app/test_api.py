@@ -1,69 +1,66 @@
-from fastapi import FastAPI, HTTPException, Path, Body
+from fastapi import FastAPI, HTTPException, Path, Body, Query, Depends, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from boto3.dynamodb.conditions import Attr
-import boto3
-import os
-from dotenv import load_dotenv
-import firebase_admin
-from firebase_admin import credentials, firestore, db as realtime_db
+from fastapi.responses import Response, StreamingResponse
+from boto3.dynamodb.conditions import Attr, Key
+import io
+import csv
+import json
 from pydantic import BaseModel
-from uuid import uuid4
-from datetime import datetime, timedelta, timezone
-import random
-from decimal import Decimal
-from fastapi import Path
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
-
-
-
-# 환경변수 로드
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
-
-# AWS 정보
-aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-aws_region = os.getenv("AWS_REGION", "ap-northeast-2")
-
-# Firebase 정보
-FIREBASE_CREDENTIALS_PATH = os.getenv("FIREBASE_CREDENTIALS_PATH")
-FIREBASE_DB_URL = os.getenv("FIREBASE_DB_URL")
-
-# DynamoDB 리소스
-dynamodb = boto3.resource(
-    "dynamodb",
-    region_name=aws_region,
-    aws_access_key_id=aws_access_key_id,
-    aws_secret_access_key=aws_secret_access_key
+from contextlib import asynccontextmanager
+from app.core.clients import get_firestore, get_table
+from app.core.startup import run_startup
+from app.services.call_state_service import append_call_text, create_call, end_call, start_call
+from app.utils.exceptions import AuthError, CallStateError
+from app.utils.metrics import track
+from app.api.deps import auth_error_handler, client_ip, require_admin
+from app.api.metrics import MetricsMiddleware, router as metrics_router
+from app.services.password_service import hash_password, verify_password
+from app.services.auth_service import check_login_limits, record_login_failure
+from app.services.transcript_service import (
+    MAX_TEXT_LENGTH,
+    TRANSCRIPT_ROLES,
+    close_transcript,
+    flush_all_transcripts,
+    open_transcript,
+    read_transcript,
 )
+from app.services.dynamodb_service import (
+    get_hospital_id_by_name,
+    iter_query,
+    iter_scan,
+    parallel_scan,
+    put_new_item,
+    query_page,
+    scan_page,
+    refresh_hospitals,
+    start_hospital_index,
+    stop_hospital_index,
+)
+from app.services.firestore_service import get_patients_by_ids
+from app.services.dynamodb_schema import CARE_REQUESTS_WAITING_BY_DOCTOR, DIAGNOSIS_BY_PATIENT
+from app.utils.serialization import FastJSONResponse, dumps_line, to_native
+from app.services.catalog_service import cache_headers, etag_matches, get_catalog, start_catalogs, stop_catalogs
+
 
-table_hospitals = dynamodb.Table("hospitals")
-table_diseases = dynamodb.Table("diseases")
+# DynamoDB / Firestore 클라이언트는 공용 레지스트리(app/core/clients.py)에서 받아 씀 (첫 사용 시 생성)
 
 # 한국시간
 KST = timezone(timedelta(hours=9))
-now = datetime.now(KST)
-
-timestamp = now.strftime("%Y%m%d_%H%M%S")
-random_suffix = f"{random.randint(0, 999):03d}"
-
-# Firebase 초기화
-def init_firebase():
-    if not firebase_admin._apps:
-        cred = credentials.Certificate(FIREBASE_CREDENTIALS_PATH)
-        firebase_admin.initialize_app(cred, {
-            'databaseURL': FIREBASE_DB_URL
-        })
-
-# Firebase 초기화 실행
-init_firebase()
 
-# Firestore 인스턴스
-db = firestore.client()
-collection_doctors = db.collection("doctors")
-collection_admins = db.collection("admins")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    run_startup([start_hospital_index, start_catalogs])
+    yield
+    await flush_all_transcripts()
+    stop_catalogs()
+    stop_hospital_index()
 
 # FastAPI 인스턴스 (스웨거 문서 설정 추가)
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="Silmedy 관리자 / 의사 서버 API ",
     version="1.0.0",
     docs_url="/docs",
@@ -77,29 +74,78 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 📈 라우트 / 백엔드 호출별 지연·오류 지표 (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+app.include_router(metrics_router)
+# 🔐 관리자 전용 API (진료 기록 내보내기) 는 세션 토큰 필요 (app/api/deps.py)
+app.add_exception_handler(AuthError, auth_error_handler)
 
 
 
 # 🔵 DynamoDB Decimal -> int/float 변환
-def decimal_to_native(obj):
-    if isinstance(obj, list):
-        return [decimal_to_native(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: decimal_to_native(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        if obj % 1 == 0:
-            return int(obj)
-        else:
-            return float(obj)
-    else:
-        return obj
-    
+# (리소스에서 이미 int/float 로 읽으므로 남아 있는 Decimal 만 변환)
+decimal_to_native = to_native
+
+
+# 🔵 목록 조회 공통 파라미터 (limit/next 커서 페이지, stream=true 이면 NDJSON)
+class ListParams:
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (지정 시 next 토큰과 함께 반환)"),
+        next_token: Optional[str] = Query(None, alias="next", description="이전 응답의 next 토큰"),
+        stream: bool = Query(False, description="true 이면 NDJSON 으로 스트리밍"),
+    ):
+        self.limit = limit
+        self.next_token = next_token
+        self.stream = stream
+
+def ndjson_lines(items):
+    for item in items:
+        yield dumps_line(item)
+
+def list_table_items(table, key: str, params: ListParams):
+    if params.stream:
+        return StreamingResponse(ndjson_lines(iter_scan(table)), media_type="application/x-ndjson")
+    if params.limit:
+        try:
+            items, next_token = scan_page(table, params.limit, params.next_token)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return FastJSONResponse({key: items, "next": next_token})
+    return FastJSONResponse({key: list(iter_scan(table))})
+
+# 🔵 참조 카탈로그 (병원/질병/의약품): 페이지·스트리밍 요청이 아니면 미리 직렬화한 스냅샷 + ETag
+def catalog_response(request: Request, name: str):
+    snapshot = get_catalog(name).snapshot()
+    headers = cache_headers(snapshot)
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
 
 # API 시작
 @app.get("/test/hospitals", summary="병원 목록 조회", description="DynamoDB에서 모든 병원 정보를 가져옵니다.")
-def get_hospitals():
-    response = table_hospitals.scan()
-    return {"hospitals": response.get("Items", [])}
+def get_hospitals(request: Request, params: ListParams = Depends()):
+    if not (params.limit or params.stream):
+        return catalog_response(request, "hospitals")
+    return list_table_items(get_table("hospitals"), "hospitals", params)
+
+@app.post("/test/hospitals/refresh", summary="병원 인덱스 갱신", description="로그인용 보건소 인덱스를 DynamoDB에서 다시 읽어옵니다.")
+def refresh_hospital_index():
+    count = refresh_hospitals()
+    get_catalog("hospitals").refresh()
+    return {"message": "병원 인덱스 갱신 완료", "count": count}
+
+@app.post("/test/catalogs/{name}/refresh", summary="카탈로그 갱신", description="hospitals / diseases / drugs 카탈로그 스냅샷을 즉시 다시 만듭니다.")
+def refresh_catalog(name: str = Path(..., description="hospitals, diseases, drugs 중 하나")):
+    catalog = get_catalog(name)
+    if catalog is None:
+        raise HTTPException(status_code=404, detail="없는 카탈로그입니다.")
+    if name == "hospitals":
+        refresh_hospitals()
+    changed = catalog.refresh()
+    snapshot = catalog.snapshot()
+    return {"message": "카탈로그 갱신 완료", "changed": changed, "version": snapshot.version, "count": snapshot.count}
 
 
 # 🔵 의사 로그인 요청 모델
@@ -113,27 +159,43 @@ class AdminLoginRequest(BaseModel):
     public_health_center: str
     password: str
 
+# 🪣 로그인 시도 제한 (app/services/auth_service.py 와 같은 버킷 사용)
+def check_test_login_limits(request: Request, public_health_center: str):
+    limited = check_login_limits(client_ip(request), public_health_center)
+    if limited:
+        raise HTTPException(
+            status_code=429,
+            detail=limited["error"],
+            headers={"Retry-After": str(limited["retry_after"])},
+        )
+
 # 🔵 의사 로그인 API
 @app.post("/test/login/doctor", summary="의사 로그인", description="보건소명, 진료과, 비밀번호를 입력하여 의사 계정으로 로그인합니다.")
-def login_doctor(payload: DoctorLoginRequest):
+def login_doctor(payload: DoctorLoginRequest, request: Request):
     public_health_center = payload.public_health_center
     department = payload.department
     password = payload.password
+    check_test_login_limits(request, public_health_center)
 
-    response = table_hospitals.scan(
-        FilterExpression=Attr("name").eq(public_health_center)
-    )
-    items = response.get("Items", [])
-    if not items:
+    hospital_id = get_hospital_id_by_name(public_health_center)
+    if hospital_id is None:
+        record_login_failure(client_ip(request), public_health_center)
         raise HTTPException(status_code=404, detail="해당 보건소를 찾을 수 없습니다.")
 
-    hospital_id = int(items[0].get("hospital_id"))
+    hospital_id = int(hospital_id)
 
-    doctors = collection_doctors.where("hospital_id", "==", hospital_id).where("department", "==", department).stream()
+    with track("firestore", "doctors", "query") as call:
+        doctors = list(get_firestore().collection("doctors").where("hospital_id", "==", hospital_id).where("department", "==", department).stream())
+        call.reads = len(doctors)
 
     for doc in doctors:
         doctor = doc.to_dict()
-        if doctor["password"] == password:
+        matched, needs_rehash = verify_password(password, doctor.get("password"))
+        if matched:
+            if needs_rehash:
+                # 평문 / 예전 비용 비밀번호 → 새 해시로 교체
+                with track("firestore", "doctors", "update", writes=1):
+                    doc.reference.update({"password": hash_password(password)})
             return {
                 "message": "로그인 성공",
                 "doctor_name": doctor["name"],
@@ -141,30 +203,37 @@ def login_doctor(payload: DoctorLoginRequest):
                 "hospital_id": doctor["hospital_id"]
             }
 
+    record_login_failure(client_ip(request), public_health_center)
     raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않거나 등록되지 않은 의사입니다.")
 
 # 🔵 관리자 로그인 API
 @app.post("/test/login/admin", summary="관리자 로그인", description="보건소명을 통해 관리자 계정으로 로그인합니다.")
-def login_admin(payload: AdminLoginRequest):
+def login_admin(payload: AdminLoginRequest, request: Request):
     public_health_center = payload.public_health_center
     password = payload.password
+    check_test_login_limits(request, public_health_center)
 
-    response = table_hospitals.scan(
-        FilterExpression=Attr("name").eq(public_health_center)
-    )
-    items = response.get("Items", [])
-    if not items:
+    hospital_id = get_hospital_id_by_name(public_health_center)
+    if hospital_id is None:
+        record_login_failure(client_ip(request), public_health_center)
         return {"error": "보건소 정보를 찾을 수 없습니다."}
 
-    hospital_id = str(items[0].get("hospital_id"))
-    doc_ref = collection_admins.document(hospital_id).get()
+    hospital_id = str(hospital_id)
+    with track("firestore", "admins", "get", reads=1):
+        doc_ref = get_firestore().collection("admins").document(hospital_id).get()
 
     if not doc_ref.exists:
+        record_login_failure(client_ip(request), public_health_center)
         return {"error": "관리자 계정이 없습니다."}
 
     user = doc_ref.to_dict()
-    if user["password"] != password:
+    matched, needs_rehash = verify_password(password, user.get("password"))
+    if not matched:
+        record_login_failure(client_ip(request), public_health_center)
         return {"error": "비밀번호가 일치하지 않습니다."}
+    if needs_rehash:
+        with track("firestore", "admins", "update", writes=1):
+            doc_ref.reference.update({"password": hash_password(password)})
 
     return {
         "message": "로그인 성공",
@@ -187,31 +256,30 @@ class DoctorRegisterRequest(BaseModel):
 def register_doctor(payload: DoctorRegisterRequest):
     try:
         hospital_name = payload.hospital_name
-        response = table_hospitals.scan(
-            FilterExpression=Attr("name").eq(hospital_name)
-        )
-        items = response.get("Items", [])
-        if not items:
+        hospital_id = get_hospital_id_by_name(hospital_name)
+        if hospital_id is None:
             return {"error": "보건소 정보가 없습니다."}
 
-        hospital_id = int(items[0].get("hospital_id"))
+        hospital_id = int(hospital_id)
 
         license_number = payload.license_number  # 🔵 요청받은 값 사용 (랜덤 생성X)
         default_profile_url = "https://cdn-icons-png.flaticon.com/512/3870/3870822.png"
 
-        collection_doctors.document(license_number).set({
-            "hospital_id": hospital_id,
-            "name": payload.name,
-            "email": payload.email,
-            "password": payload.password,
-            "department": payload.department,
-            "contact": payload.contact,
-            "gender": payload.gender,
-            "profile_url": default_profile_url,
-            "bio": [],
-            "availability": {},
-            "created_at": datetime.utcnow().isoformat()
-        })
+        password_hash = hash_password(payload.password)
+        with track("firestore", "doctors", "set", writes=1):
+            get_firestore().collection("doctors").document(license_number).set({
+                "hospital_id": hospital_id,
+                "name": payload.name,
+                "email": payload.email,
+                "password": password_hash,
+                "department": payload.department,
+                "contact": payload.contact,
+                "gender": payload.gender,
+                "profile_url": default_profile_url,
+                "bio": [],
+                "availability": {},
+                "created_at": datetime.utcnow().isoformat()
+            })
 
         return {
             "message": "의사 등록 완료",
@@ -224,11 +292,14 @@ def register_doctor(payload: DoctorRegisterRequest):
 @app.get("/test/doctors", summary="의사 목록 조회", description="등록된 모든 의사 정보를 가져옵니다.")
 def list_doctors():
     try:
-        doctors = collection_doctors.stream()
+        with track("firestore", "doctors", "stream") as call:
+            doctors = list(get_firestore().collection("doctors").stream())
+            call.reads = len(doctors)
         result = []
         for doc in doctors:
             data = doc.to_dict()
             data["license_number"] = doc.id
+            data.pop("password", None)
             result.append(data)
         return {"doctors": result}
     except Exception as e:
@@ -237,10 +308,13 @@ def list_doctors():
 @app.delete("/test/delete/doctor/{license_number}", summary="의사 삭제", description="면허번호(문서ID)를 이용하여 의사를 삭제합니다.")
 def delete_doctor(license_number: str = Path(..., description="의사 면허번호(문서 ID)")):
     try:
-        doc_ref = collection_doctors.document(license_number)
-        if not doc_ref.get().exists:
+        doc_ref = get_firestore().collection("doctors").document(license_number)
+        with track("firestore", "doctors", "get", reads=1):
+            exists = doc_ref.get().exists
+        if not exists:
             raise HTTPException(status_code=404, detail="해당 의사를 찾을 수 없습니다.")
-        doc_ref.delete()
+        with track("firestore", "doctors", "delete", writes=1):
+            doc_ref.delete()
         return {"message": "의사 삭제 완료", "license_number": license_number}
     except Exception as e:
         return {"error": str(e)}
@@ -266,8 +340,10 @@ def update_doctor(
     payload: DoctorUpdateRequest = Body(...)
 ):
     try:
-        doc_ref = collection_doctors.document(license_number)
-        if not doc_ref.get().exists:
+        doc_ref = get_firestore().collection("doctors").document(license_number)
+        with track("firestore", "doctors", "get", reads=1):
+            exists = doc_ref.get().exists
+        if not exists:
             raise HTTPException(status_code=404, detail="의사를 찾을 수 없습니다.")
 
         update_fields = payload.dict(exclude_unset=True)  # ❗ 실제 수정된 값만 추출
@@ -275,17 +351,21 @@ def update_doctor(
         if not update_fields:
             raise HTTPException(status_code=400, detail="수정할 필드가 없습니다.")
 
-        doc_ref.update(update_fields)
+        with track("firestore", "doctors", "update", writes=1):
+            doc_ref.update(update_fields)
 
         return {"message": "의사 정보 수정 완료", "updated_fields": update_fields}
     except Exception as e:
         return {"error": str(e)}
 
 @app.get("/test/diseases", summary="질병 코드 목록 조회", description="DynamoDB에서 모든 질병 코드를 조회합니다.")
-def get_disease_codes():
+def get_disease_codes(request: Request, params: ListParams = Depends()):
     try:
-        response = table_diseases.scan()
-        return {"diseases": response.get("Items", [])}
+        if not (params.limit or params.stream):
+            return catalog_response(request, "diseases")
+        return list_table_items(get_table("diseases"), "diseases", params)
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
@@ -297,6 +377,12 @@ class VideoCallCreateRequest(BaseModel):
     doctor_id: str
     patient_id: str
 
+# 🔵 통화 상태 변경 실패 → 404 (없는 방) / 500 (errors 에 실패한 저장소 표시)
+def call_state_http_error(error: CallStateError) -> HTTPException:
+    if error.not_found and set(error.errors) == {"firestore"}:
+        return HTTPException(status_code=404, detail="해당 통화 문서를 찾을 수 없습니다.")
+    return HTTPException(status_code=500, detail=error.to_dict())
+
 @app.post("/test/video-call/create", summary="영상 통화방 생성", description="doctor_id와 patient_id를 입력받아 새로운 영상통화방을 생성합니다.")
 def create_video_call(payload: VideoCallCreateRequest):
     doctor_id = payload.doctor_id
@@ -305,28 +391,12 @@ def create_video_call(payload: VideoCallCreateRequest):
     if not doctor_id or not patient_id:
         raise HTTPException(status_code=400, detail="doctor_id와 patient_id는 필수입니다.")
 
-    safe_patient_id = patient_id.split("@")[0]
-    room_id = f"doctor_{doctor_id}_patient_{safe_patient_id}_{timestamp}"
-
-    realtime_db.reference(f"calls/{room_id}").set({
-        "doctor_id": doctor_id,
-        "patient_id": patient_id,
-        "is_accepted": False,
-        "status": "waiting",
-        "created_at": timestamp
-    })
-
-    firestore.client().collection("calls").document(room_id).set({
-        "doctor_id": doctor_id,
-        "patient_id": patient_id,
-        "is_accepted": False,
-        "started_at": None,
-        "ended_at": None,
-        "doctor_text": [],
-        "patient_text": []
-    })
-
-    return {"message": "영상 통화방 생성 완료", "room_id": room_id}
+    try:
+        call = create_call(doctor_id, patient_id)
+    except CallStateError as e:
+        raise call_state_http_error(e)
+
+    return {"message": "영상 통화방 생성 완료", "room_id": call["room_id"]}
 
 # 🔵 통화 시작 요청 모델
 class VideoCallStartRequest(BaseModel):
@@ -340,16 +410,13 @@ def start_video_call(payload: VideoCallStartRequest):
         if not room_id:
             raise HTTPException(status_code=400, detail="room_id는 필수입니다.")
 
-        firestore.client().collection("calls").document(room_id).update({
-            "started_at": now,
-            "is_accepted": True
-        })
-
-        realtime_db.reference(f"calls/{room_id}").update({
-            "status": "accepted"
-        })
+        started_at = start_call(room_id)
 
-        return {"message": "통화 시작 처리 완료", "started_at": now}
+        return {"message": "통화 시작 처리 완료", "started_at": started_at}
+    except CallStateError as e:
+        raise call_state_http_error(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -365,15 +432,13 @@ def end_video_call(payload: VideoCallEndRequest):
         if not room_id:
             raise HTTPException(status_code=400, detail="room_id는 필수입니다.")
 
-        firestore.client().collection("calls").document(room_id).update({
-            "ended_at": now
-        })
-
-        realtime_db.reference(f"calls/{room_id}").update({
-            "status": "ended"
-        })
+        ended_at = end_call(room_id)
 
-        return {"message": "통화 종료 처리 완료", "ended_at": now}
+        return {"message": "통화 종료 처리 완료", "ended_at": ended_at}
+    except CallStateError as e:
+        raise call_state_http_error(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -393,23 +458,67 @@ def save_video_text(payload: VideoCallTextRequest):
         if not room_id or role not in ("doctor") or not text:
             raise HTTPException(status_code=400, detail="room_id, role, text는 필수입니다.")
 
-        doc_ref = firestore.client().collection("calls").document(room_id)
-        if not doc_ref.get().exists:
-            raise HTTPException(status_code=404, detail="해당 통화 문서를 찾을 수 없습니다.")
-
-        doc_ref.update({
-            f"{role}_text": firestore.ArrayUnion([text])
-        })
+        # 존재 여부를 먼저 읽지 않고 바로 update (없는 문서면 NotFound → 404)
+        append_call_text(room_id, role, text)
 
         return {"message": f"{role}의 텍스트가 저장되었습니다."}
+    except CallStateError as e:
+        raise call_state_http_error(e)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# 🔵 통화 중 발화 스트리밍 (WebSocket)
+# 보내는 메시지: {"role": "doctor", "text": "..."}  (role 을 쿼리로 주면 text 만 보내도 됨)
+# 받는 메시지:   {"seq": n}  → 서버 버퍼에 들어간 순번 (저장은 N개 / T ms 단위로 묶어서)
+#               {"error": "..."} → 그 메시지만 버리고 연결은 유지
+@app.websocket("/test/video-call/{room_id}/transcript/ws")
+async def stream_video_text(websocket: WebSocket, room_id: str, role: Optional[str] = None):
+    await websocket.accept()
+    buffer = open_transcript(room_id)
+    try:
+        while True:
+            # 잘못된 메시지 하나로 연결(과 아직 저장 안 된 발화)을 잃지 않도록 직접 파싱해서 오류만 돌려줌
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            try:
+                message = json.loads(frame.get("text") or frame.get("bytes") or "")
+            except ValueError:
+                message = None
+            if not isinstance(message, dict):
+                await websocket.send_json({"error": "메시지는 JSON 객체여야 합니다."})
+                continue
+            message_role = message.get("role", role)
+            text = message.get("text")
+            text = text.strip() if isinstance(text, str) else ""
+            if message_role not in TRANSCRIPT_ROLES or not text:
+                await websocket.send_json({"error": "role(doctor/patient), text는 필수입니다."})
+                continue
+            seq = buffer.add(message_role, text[:MAX_TEXT_LENGTH])
+            await websocket.send_json({"seq": seq})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await close_transcript(buffer)
+
+@app.get("/test/video-call/{room_id}/transcript", summary="통화 발화 기록 조회", description="스트리밍으로 저장된 발화를 시간 순서대로 돌려줍니다. next 로 다음 페이지를 조회합니다.")
+def get_video_transcript(
+    room_id: str,
+    limit: int = Query(50, ge=1, le=500, description="한 번에 읽을 청크 수"),
+    next_token: Optional[str] = Query(None, alias="next")
+):
+    items, next_chunk = read_transcript(room_id, limit, next_token)
+    return FastJSONResponse({"room_id": room_id, "items": items, "next": next_chunk})
+
 # 환자리스트 호출 
 @app.get("/test/patients", summary="환자 목록 조회", description="Firestore에서 등록된 모든 환자 목록을 가져옵니다.")
 def list_patients():
     try:
-        patients = firestore.client().collection("patients").stream()
+        with track("firestore", "patients", "stream") as call:
+            patients = list(get_firestore().collection("patients").stream())
+            call.reads = len(patients)
         result = []
         for doc in patients:
             data = doc.to_dict()
@@ -421,25 +530,39 @@ def list_patients():
     
 # 진료 신청 전체 목록 조회
 @app.get("/test/care-requests", summary="진료 신청 전체 조회", description="DynamoDB에서 전체 진료 신청 목록을 가져옵니다.")
-def get_all_care_requests():
+def get_all_care_requests(params: ListParams = Depends()):
     try:
-        table_care_requests = dynamodb.Table("care_requests")
-        response = table_care_requests.scan()
-        return {"care_requests": response.get("Items", [])}
+        table_care_requests = get_table("care_requests")
+        return list_table_items(table_care_requests, "care_requests", params)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 # 진료 대기(진료신청) 인원만 보이도록
 @app.get("/test/care-requests/waiting", summary="진료 대기 목록 조회", description="대기 중인 진료 요청만 조회하여 환자 정보와 함께 반환합니다.")
-def get_waiting_care_requests_test(doctor_id: int):
+def get_waiting_care_requests_test(
+    doctor_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (지정 시 next 토큰과 함께 반환)"),
+    next_token: Optional[str] = Query(None, alias="next", description="이전 응답의 next 토큰"),
+):
     try:
-        db = firestore.client()  # ✅ firestore client 초기화
+        # 🔵 대기 중인 신청만 담긴 희소 GSI 로 해당 의사의 대기 신청만 읽음 (해결된 신청은 훑지도 않음)
+        table_care_requests = get_table("care_requests")
+        key_condition = Key("waiting_doctor_id").eq(doctor_id)
+        page_token = None
+        if limit:
+            try:
+                care_requests, page_token = query_page(
+                    table_care_requests, CARE_REQUESTS_WAITING_BY_DOCTOR, key_condition, limit, next_token,
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            care_requests = list(iter_query(table_care_requests, CARE_REQUESTS_WAITING_BY_DOCTOR, key_condition))
 
-        table_care_requests = dynamodb.Table("care_requests")
-        response = table_care_requests.scan(
-            FilterExpression=Attr("is_solved").eq(False) & Attr("doctor_id").eq(doctor_id)
-        )
-        care_requests = response.get("Items", [])
+        # 🔵 환자 정보는 요청마다 개별 조회하지 않고 한 번에 배치 조회
+        patients = get_patients_by_ids(request.get("patient_id") for request in care_requests)
 
         result = []
         for request in care_requests:
@@ -447,12 +570,10 @@ def get_waiting_care_requests_test(doctor_id: int):
             if not patient_id:
                 continue
 
-            patient_doc = db.collection("patients").document(str(patient_id)).get()
-            if not patient_doc.exists:
+            patient_data = patients.get(str(patient_id))
+            if patient_data is None:
                 continue
 
-            patient_data = patient_doc.to_dict()
-
             combined = {
                 "request_id": request.get("request_id"),
                 "name": patient_data.get("name"),
@@ -466,63 +587,78 @@ def get_waiting_care_requests_test(doctor_id: int):
             }
             result.append(combined)
 
-        return {"waiting_list": decimal_to_native(result)}
+        response = {"waiting_list": result}
+        if limit:
+            response["next"] = page_token
+        return FastJSONResponse(response)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 
 # 의약품 리스트 호출
 @app.get("/test/drugs", summary="의약품 목록 조회", description="DynamoDB에서 전체 의약품 데이터를 조회합니다.")
-def get_all_drugs():
+def get_all_drugs(request: Request, params: ListParams = Depends()):
     try:
-        table_drugs = dynamodb.Table("drugs")
-        response = table_drugs.scan()
-        return {"drugs": response.get("Items", [])}
+        if not (params.limit or params.stream):
+            return catalog_response(request, "drugs")
+        table_drugs = get_table("drugs")
+        return list_table_items(table_drugs, "drugs", params)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # 처방전리스트 호출
 @app.get("/test/prescription_records", summary="처방전 목록 조회", description="DynamoDB에서 모든 처방전 기록을 조회합니다.")
-def get_all_prescriptions():
+def get_all_prescriptions(params: ListParams = Depends()):
     try:
-        table = dynamodb.Table("prescription_records")
-        response = table.scan()
-        return {"prescription_records": response.get("Items", [])}
+        table = get_table("prescription_records")
+        return list_table_items(table, "prescription_records", params)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _hospital_scope(hospital_id):
+    return {} if hospital_id is None else {"hospital_id": hospital_id}
+
 # 🔵 처방전 요청 모델
 class PrescriptionCreateRequest(BaseModel):
     diagnosis_id: int
     doctor_id: int
+    # 관리자 내보내기 범위 (없으면 어느 보건소 내보내기에도 포함되지 않음)
+    hospital_id: Optional[int] = None
     medication_days: int
     medication_list: list[str]
 
 @app.post("/test/prescriptions/create", summary="처방전 등록", description="진단 ID와 약 리스트를 받아 새로운 처방전을 등록합니다.")
 def create_prescription(payload: PrescriptionCreateRequest):
     try:
-        prescription_id = int(f"{timestamp}{random_suffix}")
-        prescription_table = dynamodb.Table("prescription_records")
-        item = {
+        prescribed_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+        # 🔵 같은 ID 가 이미 있으면 덮어쓰지 않고 새 ID 로 다시 저장
+        item = put_new_item(get_table("prescription_records"), "prescription_id", lambda prescription_id: {
             "prescription_id": prescription_id,
             "diagnosis_id": payload.diagnosis_id,
             "doctor_id": payload.doctor_id,
             "medication_days": payload.medication_days,
             "medication_list": payload.medication_list,
-            "prescribed_at": now.strftime("%Y-%m-%d %H:%M:%S"),
-        }
-        prescription_table.put_item(Item=item)
-        return {"message": "처방전 저장 완료", "prescription_id": prescription_id}
+            "prescribed_at": prescribed_at,
+            **_hospital_scope(payload.hospital_id),
+        })
+        return {"message": "처방전 저장 완료", "prescription_id": item["prescription_id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 #진단기록 리스트 
 @app.get("/test/diagnosis-records", summary="진단 기록 전체 조회", description="DynamoDB에서 전체 진단 기록을 조회합니다.")
-def get_all_diagnosis_records():
+def get_all_diagnosis_records(params: ListParams = Depends()):
     try:
-        table = dynamodb.Table("diagnosis_records")
-        response = table.scan()
-        return {"diagnosis_records": response.get("Items", [])}
+        table = get_table("diagnosis_records")
+        return list_table_items(table, "diagnosis_records", params)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -530,6 +666,8 @@ def get_all_diagnosis_records():
 # 🔵 진단 요청 모델
 class DiagnosisCreateRequest(BaseModel):
     doctor_id: int
+    # 관리자 내보내기 범위 (없으면 어느 보건소 내보내기에도 포함되지 않음)
+    hospital_id: Optional[int] = None
     patient_id: str
     disease_code: str
     diagnosis_text: str = ""
@@ -537,29 +675,114 @@ class DiagnosisCreateRequest(BaseModel):
 @app.post("/test/diagnosis/create", summary="진단 기록 등록", description="새로운 진단 기록을 등록합니다.")
 def create_diagnosis_record(payload: DiagnosisCreateRequest):
     try:
-        diagnosis_id = int(f"{timestamp}{random_suffix}")
-        diagnosed_at = now.strftime("%Y-%m-%d %H:%M:%S")
-        diagnosis_table = dynamodb.Table("diagnosis_records")
-        item = {
+        diagnosed_at = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
+        item = put_new_item(get_table("diagnosis_records"), "diagnosis_id", lambda diagnosis_id: {
             "diagnosis_id": diagnosis_id,
             "doctor_id": payload.doctor_id,
             "patient_id": payload.patient_id,
             "disease_code": payload.disease_code,
             "diagnosis_text": payload.diagnosis_text,
-            "diagnosed_at": diagnosed_at
-        }
-        diagnosis_table.put_item(Item=item)
-        return {"message": "진단 기록 저장 완료", "diagnosis_id": diagnosis_id}
+            "diagnosed_at": diagnosed_at,
+            **_hospital_scope(payload.hospital_id),
+        })
+        return {"message": "진단 기록 저장 완료", "diagnosis_id": item["diagnosis_id"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
 #  환자 진단 이력 조회 API (patient_id는 이메일)
 
 @app.get("/test/diagnosis/patient/{patient_id}", summary="환자 진단 이력 조회", description="특정 환자(patient_id 기준)의 진단 이력을 조회합니다.")
-def get_diagnosis_by_patient(patient_id: str = Path(..., description="환자의 이메일")):
+def get_diagnosis_by_patient(
+    patient_id: str = Path(..., description="환자의 이메일"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (지정 시 next 토큰과 함께 반환)"),
+    next_token: Optional[str] = Query(None, alias="next", description="이전 응답의 next 토큰"),
+):
     try:
-        table = dynamodb.Table("diagnosis_records")
-        response = table.scan(FilterExpression=Attr("patient_id").eq(patient_id))
-        return {"diagnosis_records": response.get("Items", [])}
+        # 🔵 patient_id GSI 로 조회 (진단일 순)
+        table = get_table("diagnosis_records")
+        key_condition = Key("patient_id").eq(patient_id)
+        if limit:
+            try:
+                items, page_token = query_page(table, DIAGNOSIS_BY_PATIENT, key_condition, limit, next_token)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            return FastJSONResponse({"diagnosis_records": items, "next": page_token})
+        return FastJSONResponse({"diagnosis_records": list(iter_query(table, DIAGNOSIS_BY_PATIENT, key_condition))})
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# 🔵 관리자 보고용 전체 내보내기 (세그먼트 병렬 scan → CSV/NDJSON 스트리밍)
+# 관리자 세션만, 아래 테이블만 (환자 정보가 들어 있으므로), 모든 테이블을 hospital_field 로 관리자 보건소 것만
+# (hospital_id 없이 저장된 예전 진단 / 처방 기록은 어느 보건소에도 나가지 않음 → scripts/backfill_hospital_id.py)
+EXPORT_TABLES = {
+    "diagnosis_records": {
+        "date_field": "diagnosed_at",
+        "hospital_field": "hospital_id",
+        "columns": ["diagnosis_id", "doctor_id", "patient_id", "disease_code", "diagnosis_text", "diagnosed_at"],
+    },
+    "prescription_records": {
+        "date_field": "prescribed_at",
+        "hospital_field": "hospital_id",
+        "columns": ["prescription_id", "diagnosis_id", "doctor_id", "medication_days", "medication_list", "prescribed_at"],
+    },
+    "care_requests": {
+        "date_field": "book_date",
+        "hospital_field": "hospital_id",
+        "columns": [
+            "request_id", "patient_id", "doctor_id", "department", "book_date", "book_hour",
+            "symptom_part", "symptom_type", "sign_language_needed", "is_solved",
+        ],
+    },
+}
+
+def csv_lines(items, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return line
+
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    writer.writerow(columns)
+    yield "\ufeff" + flush()
+    for item in items:
+        row = []
+        for column in columns:
+            value = decimal_to_native(item.get(column))
+            if isinstance(value, (list, dict)):
+                value = json.dumps(value, ensure_ascii=False)
+            row.append("" if value is None else value)
+        writer.writerow(row)
+        yield flush()
+
+@app.get("/test/export/{table_name}", summary="진료 기록 내보내기", description="diagnosis_records / prescription_records / care_requests 전체를 병렬 scan 하여 CSV 또는 NDJSON 으로 내려받습니다.")
+def export_records(
+    table_name: str = Path(..., description="diagnosis_records, prescription_records, care_requests 중 하나"),
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="csv 또는 ndjson"),
+    date_from: Optional[date] = Query(None, description="시작일 (YYYY-MM-DD, 포함)"),
+    date_to: Optional[date] = Query(None, description="종료일 (YYYY-MM-DD, 포함)"),
+    segments: int = Query(4, ge=1, le=32, description="병렬 scan 세그먼트 수"),
+    session: dict = Depends(require_admin),
+):
+    spec = EXPORT_TABLES.get(table_name)
+    if spec is None:
+        raise HTTPException(status_code=404, detail="내보낼 수 없는 테이블입니다.")
+
+    condition = Attr(spec["hospital_field"]).eq(session["hospital_id"])
+    if date_from:
+        condition &= Attr(spec["date_field"]).gte(date_from.isoformat())
+    if date_to:
+        condition &= Attr(spec["date_field"]).lt((date_to + timedelta(days=1)).isoformat())
+
+    items = parallel_scan(get_table(table_name), total_segments=segments, FilterExpression=condition)
+
+    filename = f"{table_name}_{datetime.now(KST).strftime('%Y%m%d_%H%M%S')}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if format == "ndjson":
+        return StreamingResponse(ndjson_lines(items), media_type="application/x-ndjson", headers=headers)
+    return StreamingResponse(csv_lines(items, spec["columns"]), media_type="text/csv; charset=utf-8", headers=headers)
@@ -0,0 +1,41 @@
+# app/utils/dynamodb_types.py
+# 🔢 DynamoDB 아이템 ↔ 파이썬 기본 타입 변환기
+# boto3 기본 역직렬화는 숫자를 전부 Decimal 로 돌려줘서, 응답마다 다시 재귀로 풀어야 했다.
+# 리소스에 install_native_types() 를 걸어 두면 읽는 시점에 바로 int/float 로 만들어진다.
+# boto3 를 import 하므로 클라이언트를 만드는 app/core/clients.py 에서만 (필요할 때) 불러 쓴다.
+
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+
+class NativeTypeDeserializer(TypeDeserializer):
+    # "N" 타입: 정수 문자열은 int (자릿수 손실 없음), 그 외는 float
+    def _deserialize_n(self, value):
+        try:
+            return int(value)
+        except ValueError:
+            number = float(value)
+            return int(number) if number.is_integer() else number
+
+    def _deserialize_ns(self, value):
+        return set(map(self._deserialize_n, value))
+
+
+class NativeTypeSerializer(TypeSerializer):
+    # 읽어온 float 를 그대로 다시 저장할 수 있도록 Decimal 로 바꿔서 직렬화
+    # (리스트/맵 내부 값도 serialize 를 다시 거치므로 여기서만 바꾸면 됨)
+    def serialize(self, value):
+        if isinstance(value, float):
+            value = Decimal(repr(value))
+        elif isinstance(value, (set, frozenset)) and any(isinstance(v, float) for v in value):
+            value = {Decimal(repr(v)) if isinstance(v, float) else v for v in value}
+        return super().serialize(value)
+
+
+# boto3 DynamoDB 리소스의 입출력 변환기를 교체 (리소스 생성 직후 한 번 호출)
+def install_native_types(resource):
+    injector = resource._injector
+    injector._deserializer = NativeTypeDeserializer()
+    injector._serializer = NativeTypeSerializer()
+    return resource
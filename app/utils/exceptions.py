@@ -0,0 +1,37 @@
+# app/utils/exceptions.py
+
+
+# 🔐 세션 토큰이 없거나 잘못됐거나 권한이 맞지 않는 경우
+# 브라우저 화면 요청이면 /login 으로 보내고, API 요청이면 401 / 403 JSON 으로 응답 (app/api/deps.py)
+class AuthError(Exception):
+    def __init__(self, message: str, status_code: int = 401):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
+
+
+# 📞 통화 상태를 RTDB / Firestore 에 쓰다가 한쪽 또는 양쪽이 실패한 경우
+# errors: {"rtdb": "...", "firestore": "..."} 실패한 저장소만 들어 있음
+# attempted: 이번 전환에서 쓰기를 보낸 저장소 (텍스트 저장은 Firestore 만)
+class CallStateError(Exception):
+    def __init__(self, room_id: str, transition: str, errors: dict, attempted=("rtdb", "firestore"), not_found: bool = False):
+        self.room_id = room_id
+        self.transition = transition
+        self.errors = errors
+        self.attempted = frozenset(attempted)
+        self.not_found = not_found
+        super().__init__(f"call {transition} failed for {room_id}: {errors}")
+
+    @property
+    def partial(self) -> bool:
+        # 보낸 저장소 중 일부만 실패 → 상태가 어긋났을 수 있음
+        return bool(self.attempted - self.errors.keys())
+
+    def to_dict(self) -> dict:
+        return {
+            "message": "통화 상태 일부만 반영됨" if self.partial else "통화 상태 변경 실패",
+            "room_id": self.room_id,
+            "transition": self.transition,
+            "failed": sorted(self.errors),
+            "errors": self.errors,
+        }
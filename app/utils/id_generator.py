@@ -0,0 +1,149 @@
+# app/utils/id_generator.py
+# 🆔 처방전 / 진단 기록용 64비트 정수 ID (Snowflake 방식, DB 조회 없음)
+#   [ 41비트: EPOCH 이후 ms ][ 10비트: worker ][ 12비트: 같은 ms 안의 순번 ]
+#   - 한 프로세스 안에서는 lock 으로 순번을 올리므로 스레드끼리 겹치지 않음 (ms 당 4096개, 넘치면 다음 ms 까지 대기)
+#   - 프로세스끼리는 worker 비트로 구분: 프로세스마다 잠금 파일로 worker 번호를 임대해서 같은 호스트에서는 겹치지 않음
+#     인스턴스(레플리카)끼리는 ID_WORKER_ID 로 번호 범위를 직접 나눠 줘야 함 (app/core/config.py)
+#   - 그래도 겹칠 때를 대비해 새 ID 로 쓰는 쪽은 키가 없을 때만 저장 (dynamodb_service.put_new_item)
+#   - 시계가 뒤로 가면 마지막으로 쓴 ms 를 계속 써서 ID 가 줄어들지 않게 함
+#   - 부호 없는 63비트 안에 들어가므로 DynamoDB N / 다른 언어의 int64 로 그대로 다룰 수 있음
+
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+
+from app.core.config import ID_WORKER_ID, ID_WORKER_LOCK_DIR, ID_WORKER_SLOTS
+
+try:
+    import fcntl
+except ImportError:  # Windows (로컬 개발)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 2025-01-01 00:00:00 UTC (ms)
+EPOCH_MS = 1735689600000
+
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+WORKER_SHIFT = SEQUENCE_BITS
+TIMESTAMP_SHIFT = SEQUENCE_BITS + WORKER_BITS
+
+
+# 🔒 worker 번호 임대: {lock_dir}/worker-{번호}.lock 에 flock 을 잡고 프로세스가 끝날 때까지 유지
+# 프로세스가 죽으면 OS 가 잠금을 풀어서 다음 프로세스가 같은 번호를 다시 씀
+class WorkerLease:
+    def __init__(self, worker_id: int, handle=None):
+        self.worker_id = worker_id
+        self._handle = handle
+
+    def release(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def lease_worker_id(base: int | None = ID_WORKER_ID, slots: int = ID_WORKER_SLOTS, lock_dir: str = ID_WORKER_LOCK_DIR) -> WorkerLease:
+    if base is None:
+        # 배정 없음 → 호스트명으로 시작 위치만 흩어 두고 전체 범위에서 빈 번호를 찾음 (호스트 안에서만 보장)
+        start, candidates = zlib.crc32(socket.gethostname().encode()) & MAX_WORKER_ID, MAX_WORKER_ID + 1
+    else:
+        if not 0 <= base <= MAX_WORKER_ID or not 1 <= slots <= MAX_WORKER_ID + 1 - base:
+            raise ValueError(f"ID_WORKER_ID / ID_WORKER_SLOTS 는 0 ~ {MAX_WORKER_ID} 안이어야 합니다: {base}, {slots}")
+        start, candidates = base, slots
+    if fcntl is None:
+        return WorkerLease(start)
+
+    os.makedirs(lock_dir, exist_ok=True)
+    for offset in range(candidates):
+        worker_id = (start + offset) & MAX_WORKER_ID if base is None else start + offset
+        handle = open(os.path.join(lock_dir, f"worker-{worker_id}.lock"), "a")
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            continue
+        if base is None:
+            logger.warning("ID_WORKER_ID not set, leased worker %d (unique on this host only)", worker_id)
+        return WorkerLease(worker_id, handle)
+    raise RuntimeError(
+        f"ID worker 번호 {start} ~ {start + candidates - 1} 를 모두 다른 프로세스가 쓰고 있습니다 "
+        "(ID_WORKER_SLOTS 를 프로세스 수 이상으로 설정)"
+    )
+
+
+class SnowflakeGenerator:
+    def __init__(self, worker_id: int):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id 는 0 ~ {MAX_WORKER_ID} 사이여야 합니다: {worker_id}")
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000 - EPOCH_MS
+            if now_ms < self._last_ms:
+                now_ms = self._last_ms
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # 이번 ms 순번을 다 씀 → 다음 ms 까지 대기
+                    while now_ms <= self._last_ms:
+                        time.sleep(0.0001)
+                        now_ms = time.time_ns() // 1_000_000 - EPOCH_MS
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            return (now_ms << TIMESTAMP_SHIFT) | (self.worker_id << WORKER_SHIFT) | self._sequence
+
+
+def parse_id(value: int) -> dict:
+    return {
+        "created_ms": (value >> TIMESTAMP_SHIFT) + EPOCH_MS,
+        "worker_id": (value >> WORKER_SHIFT) & MAX_WORKER_ID,
+        "sequence": value & MAX_SEQUENCE,
+    }
+
+
+# 처음 ID 를 만들 때 임대 (import 만 하는 프로세스는 번호를 차지하지 않음)
+_lease = None
+_generator = None
+_init_lock = threading.Lock()
+
+
+def _get_generator() -> SnowflakeGenerator:
+    global _lease, _generator
+    if _generator is None:
+        with _init_lock:
+            if _generator is None:
+                _lease = lease_worker_id()
+                _generator = SnowflakeGenerator(_lease.worker_id)
+    return _generator
+
+
+def _reset_after_fork():
+    # fork 된 자식은 부모의 잠금 파일을 같이 들고 있으므로 닫고, 처음 쓸 때 새 번호를 임대
+    global _lease, _generator, _init_lock
+    if _lease is not None:
+        _lease.release()
+    _lease = None
+    _generator = None
+    _init_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def worker_id() -> int:
+    return _get_generator().worker_id
+
+
+def next_id() -> int:
+    return _get_generator().next_id()
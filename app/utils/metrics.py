@@ -0,0 +1,291 @@
+# app/utils/metrics.py
+# 📈 Prometheus 텍스트 형식 지표 (프로세스 로컬, 외부 패키지 없이)
+#   - HTTP: 라우트별 응답 시간 히스토그램 / 처리 중 요청 수 / 5xx·예외 수 (app/api/metrics.py 미들웨어)
+#   - 백엔드: 저장소(dynamodb / firestore / rtdb / fcm) × 테이블·컬렉션 × 동작별 같은 세 가지
+#       DynamoDB 는 botocore 이벤트 훅으로 모든 호출을 자동 기록 (install_botocore_metrics)
+#       Firestore / RTDB / FCM 은 SDK 에 훅이 없어서 호출부를 with track(...) 으로 감쌈
+# 기록은 라벨 조합별 자식 객체에 락 한 번 잡고 숫자만 더하는 정도라 요청당 수 µs 안쪽.
+# 라벨 값은 라우트 템플릿 / 테이블 이름처럼 개수가 정해진 것만 쓸 것 (요청 경로나 id 를 넣으면 시계열이 끝없이 늘어남)
+
+import threading
+import time
+from bisect import bisect_left
+
+from app.utils.request_profile import DYNAMODB_CAPACITY_OPERATIONS, current_profile
+
+# 초 단위 (DynamoDB 한 자리 ms 호출부터 느린 내보내기 요청까지)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_lock", "_bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self._lock = threading.Lock()
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self):
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def _samples(self):
+        for values, child in list(self._children.items()):
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------- HTTP ----------
+http_request_duration = Histogram(
+    "silmedy_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "silmedy_http_requests_in_flight", "HTTP requests currently being handled", ("method",),
+)
+http_request_errors = Counter(
+    "silmedy_http_request_errors_total", "HTTP requests that ended in 5xx or an unhandled exception",
+    ("method", "route", "status"),
+)
+
+
+# ---------- 백엔드 (DynamoDB / Firestore / RTDB / FCM) ----------
+backend_call_duration = Histogram(
+    "silmedy_backend_call_duration_seconds", "Backend call latency by table/collection and operation",
+    ("backend", "resource", "operation"),
+)
+backend_calls_in_flight = Gauge(
+    "silmedy_backend_calls_in_flight", "Backend calls currently waiting for a response",
+    ("backend", "resource", "operation"),
+)
+backend_errors = Counter(
+    "silmedy_backend_errors_total", "Backend calls that raised or returned an error",
+    ("backend", "resource", "operation", "error"),
+)
+
+
+# (저장소, 리소스, 동작) → (지연 히스토그램, 처리 중 게이지) 자식을 한 번만 찾아 둠
+_backend_children = {}
+
+def _children(key: tuple):
+    children = _backend_children.get(key)
+    if children is None:
+        children = _backend_children.setdefault(
+            key, (backend_call_duration.labels(*key), backend_calls_in_flight.labels(*key))
+        )
+    return children
+
+def backend_started(backend: str, resource: str, operation: str):
+    _children((backend, resource, operation))[1].inc()
+    return time.perf_counter()
+
+def backend_finished(backend: str, resource: str, operation: str, started: float, error: str | None = None):
+    elapsed = time.perf_counter() - started
+    key = (backend, resource, operation)
+    duration, in_flight = _children(key)
+    duration.observe(elapsed)
+    in_flight.dec()
+    if error:
+        backend_errors.labels(*key, error).inc()
+    profile = current_profile()
+    if profile is not None:
+        profile.add_call(backend, elapsed)
+
+
+# with track("firestore", "doctors", "query") as call:
+#     docs = list(query.stream())
+#     call.reads = len(docs)
+# 스트림 조회는 실제 요청이 순회할 때 나가므로 순회까지 블록 안에 넣을 것
+# reads / writes 는 문서 수 (요청 단위 집계용, app/utils/request_profile.py)
+class track:
+    __slots__ = ("_key", "_started", "reads", "writes")
+
+    def __init__(self, backend: str, resource: str, operation: str, reads: int = 0, writes: int = 0):
+        self._key = (backend, resource, operation)
+        self.reads = reads
+        self.writes = writes
+
+    def __enter__(self):
+        self._started = backend_started(*self._key)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        backend_finished(*self._key, self._started, exc_type.__name__ if exc_type else None)
+        if self.reads or self.writes:
+            profile = current_profile()
+            if profile is not None:
+                profile.add_documents(self.reads, self.writes)
+        return False
+
+
+# ---------- botocore (DynamoDB) ----------
+# 요청 하나당 before-parameter-build → before-call → (재시도 포함 전송) → after-call / after-call-error 순서
+# 테이블 이름은 아직 dict 인 before-parameter-build 에서, 시작 시각은 before-call 에서 요청별 context 에 넣어 둠
+# 요청 단위 집계 중이면 ReturnConsumedCapacity=TOTAL 을 붙여서 소비한 용량 단위를 응답으로 받음
+_RESOURCE_KEY = "silmedy_metrics_resource"
+_STARTED_KEY = "silmedy_metrics_started"
+
+def _boto_resource(params: dict) -> str:
+    table = params.get("TableName")
+    if table:
+        return table
+    items = params.get("RequestItems")
+    if items:
+        return next(iter(items)) if len(items) == 1 else "(batch)"
+    if params.get("TransactItems"):
+        return "(transaction)"
+    return "-"
+
+def install_botocore_metrics(client, backend: str):
+    service_id = client.meta.service_model.service_id.hyphenize()
+
+    def before_parameter_build(params, model, context, **_):
+        context[_RESOURCE_KEY] = _boto_resource(params)
+        if model.name in DYNAMODB_CAPACITY_OPERATIONS and "ReturnConsumedCapacity" not in params \
+                and current_profile() is not None:
+            params["ReturnConsumedCapacity"] = "TOTAL"
+
+    def before_call(model, context, **_):
+        key = (backend, context.get(_RESOURCE_KEY, "-"), model.name)
+        context[_STARTED_KEY] = (key, backend_started(*key))
+
+    def after_call(http_response, parsed, model, context, **_):
+        entry = context.pop(_STARTED_KEY, None)
+        if entry is not None:
+            error = None
+            if http_response.status_code >= 300:
+                error = (parsed or {}).get("Error", {}).get("Code") or f"HTTP{http_response.status_code}"
+            backend_finished(*entry[0], entry[1], error)
+        profile = current_profile()
+        if profile is not None and parsed:
+            profile.add_dynamodb(model.name, parsed)
+
+    def after_call_error(exception, context, **_):
+        entry = context.pop(_STARTED_KEY, None)
+        if entry is not None:
+            backend_finished(*entry[0], entry[1], type(exception).__name__)
+
+    events = client.meta.events
+    events.register(f"before-parameter-build.{service_id}", before_parameter_build, unique_id="silmedy-metrics-params")
+    events.register(f"before-call.{service_id}", before_call, unique_id="silmedy-metrics-before")
+    events.register(f"after-call.{service_id}", after_call, unique_id="silmedy-metrics-after")
+    events.register(f"after-call-error.{service_id}", after_call_error, unique_id="silmedy-metrics-error")
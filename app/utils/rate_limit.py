@@ -0,0 +1,61 @@
+# app/utils/rate_limit.py
+
+import threading
+import time
+from collections import OrderedDict
+
+
+# 🪣 프로세스 로컬 토큰 버킷 (키별로 초당 rate 개씩 채워지고 최대 burst 개까지 쌓임)
+# 키 수는 maxsize 로 제한하고, 넘치면 가장 오래 안 쓴 키부터 버림 (버려진 키는 가득 찬 버킷으로 다시 시작)
+class RateLimiter:
+    def __init__(self, rate: float, burst: int, maxsize: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def _tokens(self, key, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - updated_at) * self.rate)
+
+    # 꺼내지 않고 남은 토큰만 확인 (실패한 시도에만 acquire 로 차감할 때)
+    def check(self, key, cost: float = 1.0) -> tuple[bool, float]:
+        with self._lock:
+            tokens = self._tokens(key, time.monotonic())
+            if tokens < cost:
+                self.rejected += 1
+        if tokens >= cost:
+            return True, 0.0
+        return False, (cost - tokens) / self.rate
+
+    # 반환: (허용 여부, 다시 시도할 수 있을 때까지 남은 초)
+    def acquire(self, key, cost: float = 1.0) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens = self._tokens(key, now)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                self._buckets.move_to_end(key)
+                self.allowed += 1
+                allowed, retry_after = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+                self.rejected += 1
+                allowed, retry_after = False, (cost - tokens) / self.rate
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "keys": len(self._buckets),
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,173 @@
+# app/utils/request_profile.py
+# 🔬 요청 단위 백엔드 사용량 집계 (읽기 증폭 찾기용)
+#   - 요청마다 RequestProfile 하나를 contextvar 에 걸어 두고, 그 요청 안에서 나간 백엔드 호출이 여기에 더해짐
+#       DynamoDB : 호출 수 / 소비한 RCU·WCU (ReturnConsumedCapacity=TOTAL) / Query·Scan 이 훑은 아이템 수 vs 돌려준 수
+#       Firestore: 호출 수 / 읽은·쓴 문서 수 (track(...) 블록에서 넘겨준 값)
+#       공통     : 저장소별 호출 시간 합계 (동시에 보낸 호출은 각각 더해지므로 벽시계 시간보다 클 수 있음)
+#   - 스레드 풀(run_blocking / to_async)은 컨텍스트를 복사해서 넘기므로 워커 스레드의 호출도 같은 요청에 잡힘
+#   - 요청이 끝나면 route_profiles 에 라우트 템플릿별로 누적, PROFILE_LOG_INTERVAL 마다 요청당 읽기가 많은 라우트를 로그로 남김
+# 기록 지점: app/utils/metrics.py (backend_finished / track / botocore 훅), 요청 시작·끝: app/api/metrics.py
+
+import contextvars
+import logging
+import threading
+import time
+
+from app.core.config import PROFILE_LOG_INTERVAL, PROFILE_LOG_TOP
+
+logger = logging.getLogger(__name__)
+
+# ReturnConsumedCapacity 를 받을 수 있는 DynamoDB 동작 (읽기 / 쓰기 단위 구분용)
+DYNAMODB_READ_OPERATIONS = frozenset(("GetItem", "Query", "Scan", "BatchGetItem", "TransactGetItems"))
+DYNAMODB_WRITE_OPERATIONS = frozenset(("PutItem", "UpdateItem", "DeleteItem", "BatchWriteItem", "TransactWriteItems"))
+DYNAMODB_CAPACITY_OPERATIONS = DYNAMODB_READ_OPERATIONS | DYNAMODB_WRITE_OPERATIONS
+
+PROFILE_FIELDS = (
+    "calls", "backend_ms", "dynamodb_rcu", "dynamodb_wcu",
+    "dynamodb_scanned", "dynamodb_returned", "firestore_reads", "firestore_writes",
+)
+
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    __slots__ = (
+        "_lock", "calls", "backend_seconds", "backends",
+        "dynamodb_rcu", "dynamodb_wcu", "dynamodb_scanned", "dynamodb_returned",
+        "firestore_reads", "firestore_writes",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.backend_seconds = 0.0
+        self.backends = {}  # 저장소 → [호출 수, 시간 합계]
+        self.dynamodb_rcu = 0.0
+        self.dynamodb_wcu = 0.0
+        self.dynamodb_scanned = 0
+        self.dynamodb_returned = 0
+        self.firestore_reads = 0
+        self.firestore_writes = 0
+
+    def add_call(self, backend: str, seconds: float):
+        with self._lock:
+            self.calls += 1
+            self.backend_seconds += seconds
+            entry = self.backends.get(backend)
+            if entry is None:
+                entry = self.backends[backend] = [0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+
+    def add_documents(self, reads: int = 0, writes: int = 0):
+        with self._lock:
+            self.firestore_reads += reads
+            self.firestore_writes += writes
+
+    # botocore 에서 파싱된 응답 그대로 (ConsumedCapacity 는 dict, Batch / Transact 는 테이블별 list)
+    def add_dynamodb(self, operation: str, parsed: dict):
+        consumed = parsed.get("ConsumedCapacity")
+        if isinstance(consumed, dict):
+            consumed = (consumed,)
+        units = sum(entry.get("CapacityUnits", 0) for entry in consumed or ())
+        with self._lock:
+            if operation in DYNAMODB_READ_OPERATIONS:
+                self.dynamodb_rcu += units
+            else:
+                self.dynamodb_wcu += units
+            if "ScannedCount" in parsed:
+                self.dynamodb_scanned += parsed["ScannedCount"]
+                self.dynamodb_returned += parsed.get("Count", 0)
+
+    # PROFILE_FIELDS 순서 (backend_ms 는 ms)
+    def values(self) -> tuple:
+        with self._lock:
+            return (
+                self.calls, self.backend_seconds * 1000, self.dynamodb_rcu, self.dynamodb_wcu,
+                self.dynamodb_scanned, self.dynamodb_returned, self.firestore_reads, self.firestore_writes,
+            )
+
+    def to_dict(self) -> dict:
+        return {field: round(value, 3) for field, value in zip(PROFILE_FIELDS, self.values())}
+
+    # 디버그 응답 헤더용
+    def header_value(self) -> str:
+        return "; ".join(f"{key}={value}" for key, value in self.to_dict().items())
+
+    def server_timing(self) -> str:
+        with self._lock:
+            return ", ".join(
+                f'{backend};dur={seconds * 1000:.1f};desc="{calls} calls"'
+                for backend, (calls, seconds) in self.backends.items()
+            )
+
+
+def current_profile() -> RequestProfile | None:
+    return _current.get()
+
+def start_profile():
+    profile = RequestProfile()
+    return profile, _current.set(profile)
+
+def end_profile(token):
+    _current.reset(token)
+
+
+# ---------- 라우트별 누적 ----------
+class RouteProfiles:
+    def __init__(self, log_interval: float = PROFILE_LOG_INTERVAL, log_top: int = PROFILE_LOG_TOP):
+        self.log_interval = log_interval
+        self.log_top = log_top
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._logged_at = time.monotonic()
+
+    # 라우트별 [요청 수, 요청당 최대 읽기, PROFILE_FIELDS 합계 …]
+    def record(self, route: str, profile: RequestProfile):
+        values = profile.values()
+        reads = values[2] + values[6]
+        with self._lock:
+            totals = self._routes.get(route)
+            if totals is None:
+                totals = self._routes[route] = [0, 0] + [0] * len(values)
+            totals[0] += 1
+            if reads > totals[1]:
+                totals[1] = reads
+            for index, value in enumerate(values, 2):
+                totals[index] += value
+            due = self.log_interval > 0 and time.monotonic() - self._logged_at >= self.log_interval
+            if due:
+                self._logged_at = time.monotonic()
+        if due:
+            self.log_top_routes()
+
+    # 요청당 읽기(RCU + Firestore 문서 읽기)가 많은 순
+    def top(self, limit: int = 10) -> list:
+        with self._lock:
+            routes = [(route, list(totals)) for route, totals in self._routes.items()]
+        rows = []
+        for route, (requests, max_reads, *sums) in routes:
+            row = {"route": route, "requests": requests, "max_reads": round(max_reads, 2)}
+            for field, value in zip(PROFILE_FIELDS, sums):
+                row[f"avg_{field}"] = round(value / requests, 2)
+            row["avg_reads"] = round(row["avg_dynamodb_rcu"] + row["avg_firestore_reads"], 2)
+            rows.append(row)
+        rows.sort(key=lambda row: (row["avg_reads"], row["avg_backend_ms"]), reverse=True)
+        return rows[:limit]
+
+    def log_top_routes(self):
+        rows = [row for row in self.top(self.log_top) if row["avg_calls"]]
+        if not rows:
+            return
+        lines = [
+            f"  {row['route']}: {row['requests']} req, {row['avg_calls']} calls, "
+            f"{row['avg_dynamodb_rcu']} RCU / {row['avg_dynamodb_wcu']} WCU, "
+            f"scanned {row['avg_dynamodb_scanned']} → returned {row['avg_dynamodb_returned']}, "
+            f"firestore {row['avg_firestore_reads']} reads / {row['avg_firestore_writes']} writes, "
+            f"{row['avg_backend_ms']} ms backend"
+            for row in rows
+        ]
+        logger.info("top routes by backend reads per request:\n%s", "\n".join(lines))
+
+
+route_profiles = RouteProfiles()
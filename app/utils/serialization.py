@@ -0,0 +1,47 @@
+# app/utils/serialization.py
+# ⚡ orjson 기반 JSON 응답과 남아 있는 Decimal/set 변환
+# (DynamoDB 숫자를 int/float 로 읽는 변환기는 app/utils/dynamodb_types.py)
+
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+# 이미 기본 타입인 값은 그대로 두고 Decimal/set 이 남아 있는 경우에만 변환
+def to_native(obj):
+    if isinstance(obj, dict):
+        return {k: to_native(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [to_native(v) for v in obj]
+    if isinstance(obj, Decimal):
+        return _default(obj)
+    if isinstance(obj, (set, frozenset)):
+        return [to_native(v) for v in obj]
+    return obj
+
+
+def dumps(obj, sort_keys: bool = False) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return orjson.dumps(obj, default=_default, option=option)
+
+def dumps_line(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+
+
+# 앱 전체 기본 응답 클래스
+# dict 를 반환하면 FastAPI 가 jsonable_encoder 를 먼저 거치므로, 큰 목록을 돌려주는 핸들러는
+# FastJSONResponse(...) 를 직접 반환해서 그 단계까지 건너뛴다.
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
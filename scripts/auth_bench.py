@@ -0,0 +1,94 @@
+# scripts/auth_bench.py
+# ⏱ 요청당 인증 비용 측정 (app/services/session_service.py, app/api/deps.py)
+#   1) issue_token / verify_token 한 번에 걸리는 시간
+#   2) 같은 핸들러를 세션 의존성 없이 / 쿠키로 / Bearer 로 호출했을 때 요청 지연 차이
+#   3) 비교용: 요청마다 보건소 + 의사 조회를 다시 하는 방식 (--lookup-ms 로 왕복 지연을 흉내 냄)
+#
+#   python scripts/auth_bench.py
+#   python scripts/auth_bench.py --requests 5000 --lookup-ms 25
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.deps import auth_error_handler, require_doctor  # noqa: E402
+from app.core.config import SESSION_COOKIE_NAME  # noqa: E402
+from app.services.session_service import issue_token, verify_token  # noqa: E402
+from app.utils.exceptions import AuthError  # noqa: E402
+
+
+def _per_call_us(func, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - started) / runs * 1_000_000
+
+
+def _app(lookup_ms: float) -> FastAPI:
+    app = FastAPI()
+    app.add_exception_handler(AuthError, auth_error_handler)
+
+    @app.get("/open")
+    def open_route():
+        return {"ok": True}
+
+    @app.get("/session")
+    def session_route(session: dict = Depends(require_doctor)):
+        return {"ok": True, "doctor_id": session["doctor_id"]}
+
+    # 예전처럼 매 요청 DB 에서 다시 확인한다면 (보건소 조회 + 의사 조회 = 왕복 두 번)
+    @app.get("/lookup")
+    def lookup_route():
+        time.sleep(lookup_ms / 1000 * 2)
+        return {"ok": True}
+
+    return app
+
+
+def _latencies(client: TestClient, path: str, runs: int, **kwargs) -> list:
+    values = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.get(path, **kwargs)
+        values.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, response.text
+    return sorted(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="요청당 인증 비용 측정")
+    parser.add_argument("--tokens", type=int, default=100000, help="issue / verify 반복 횟수")
+    parser.add_argument("--requests", type=int, default=2000, help="경로별 요청 수")
+    parser.add_argument("--lookup-ms", type=float, default=20.0, help="비교용 DB 조회 한 번의 왕복 지연")
+    args = parser.parse_args()
+
+    token = issue_token(1, "doctor", doctor_id=1234567, department="내과")
+    print(f"token length      {len(token)} bytes")
+    print(f"issue_token       {_per_call_us(lambda: issue_token(1, 'doctor', doctor_id=1234567, department='내과'), args.tokens):.2f} µs")
+    print(f"verify_token      {_per_call_us(lambda: verify_token(token), args.tokens):.2f} µs")
+
+    client = TestClient(_app(args.lookup_ms))
+    lookup_runs = max(1, min(args.requests, 200))
+    rows = [
+        ("no auth", _latencies(client, "/open", args.requests)),
+        ("cookie session", _latencies(client, "/session", args.requests, cookies={SESSION_COOKIE_NAME: token})),
+        ("bearer session", _latencies(client, "/session", args.requests, headers={"Authorization": f"Bearer {token}"})),
+        (f"db lookup ({args.lookup_ms:g}ms x2)", _latencies(client, "/lookup", lookup_runs)),
+    ]
+    baseline = statistics.median(rows[0][1])
+    print(f"\n{'route':<24} {'p50':>9} {'p95':>9} {'p50 overhead':>13}")
+    for label, values in rows:
+        p50 = statistics.median(values)
+        p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{label:<24} {p50:>7.3f}ms {p95:>7.3f}ms {p50 - baseline:>+11.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# scripts/backfill_hospital_id.py
+# 🏥 hospital_id 없이 저장된 진단 / 처방 기록에 보건소 채우기
+# 관리자 내보내기는 hospital_id 로 자기 보건소 기록만 고르므로 (app/test_api.py EXPORT_TABLES),
+# 이 값이 생기기 전에 저장된 기록은 어느 보건소 내보내기에도 나가지 않는다.
+# Firestore doctors 의 의사 번호(auth_service._doctor_number) → hospital_id 로 기록의 doctor_id 를 찾아서 채운다.
+#   - 이미 hospital_id 가 있는 기록은 건드리지 않음 (조건부 update)
+#   - 의사를 찾을 수 없는 기록은 그대로 두고 개수만 보고
+#
+#   python scripts/backfill_hospital_id.py --dry-run
+#   python scripts/backfill_hospital_id.py
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.conditions import Attr  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+from app.core.clients import get_firestore, get_table  # noqa: E402
+from app.services.auth_service import _doctor_number  # noqa: E402
+from app.services.dynamodb_service import is_conditional_check_failed, iter_scan  # noqa: E402
+
+TABLES = {
+    "diagnosis_records": "diagnosis_id",
+    "prescription_records": "prescription_id",
+}
+
+
+def _doctor_hospitals() -> dict:
+    hospitals = {}
+    for doc in get_firestore().collection("doctors").select(["doctor_id", "hospital_id"]).stream():
+        doctor = doc.to_dict()
+        number = _doctor_number({"doctor_id": doctor.get("doctor_id"), "license_number": doc.id})
+        if number is not None and doctor.get("hospital_id") is not None:
+            hospitals[number] = int(doctor["hospital_id"])
+    return hospitals
+
+
+def backfill(table_name: str, key: str, hospitals: dict, dry_run: bool) -> Counter:
+    table = get_table(table_name)
+    counts = Counter()
+    for item in iter_scan(table, FilterExpression=Attr("hospital_id").not_exists(), ProjectionExpression=f"{key}, doctor_id"):
+        hospital_id = hospitals.get(item.get("doctor_id"))
+        if hospital_id is None:
+            counts["unknown_doctor"] += 1
+            continue
+        counts["updated"] += 1
+        if dry_run:
+            continue
+        try:
+            table.update_item(
+                Key={key: item[key]},
+                UpdateExpression="SET hospital_id = :hospital_id",
+                ConditionExpression="attribute_not_exists(hospital_id)",
+                ExpressionAttributeValues={":hospital_id": hospital_id},
+            )
+        except ClientError as e:
+            if not is_conditional_check_failed(e):
+                raise
+            counts["updated"] -= 1
+            counts["already_set"] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진단 / 처방 기록에 hospital_id 채우기 (관리자 내보내기 범위)")
+    parser.add_argument("--dry-run", action="store_true", help="바꿀 개수만 세고 쓰지 않음")
+    args = parser.parse_args()
+
+    hospitals = _doctor_hospitals()
+    print(f"doctors with hospital: {len(hospitals)}{' (dry run)' if args.dry_run else ''}")
+    for table_name, key in TABLES.items():
+        counts = backfill(table_name, key, hospitals, args.dry_run)
+        print(f"{table_name:<22} updated={counts['updated']} unknown_doctor={counts['unknown_doctor']} "
+              f"already_set={counts['already_set']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# scripts/backfill_waiting_index.py
+# 🩺 진료 신청의 대기열 인덱스 키 속성 맞추기 (app/services/care_request_service.py waiting_fields)
+# 대기열 GSI 는 희소 인덱스라서 키 속성이 없는 신청은 대기 목록에 나오지 않는다.
+#   - 대기 중인데 키가 없거나 다른 신청 → 채움 (속성이 생기기 전에 저장된 신청)
+#   - 해결됐는데 키가 남은 신청 → 지움
+#
+#   python -m app.services.dynamodb_schema   (waiting-index 먼저 생성)
+#   python scripts/backfill_waiting_index.py --dry-run
+#   python scripts/backfill_waiting_index.py
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.clients import get_table  # noqa: E402
+from app.services.care_request_service import TABLE_CARE_REQUESTS, waiting_fields  # noqa: E402
+from app.services.dynamodb_schema import CARE_REQUEST_WAITING_FIELDS  # noqa: E402
+from app.services.dynamodb_service import iter_scan  # noqa: E402
+
+PROJECTION = ("request_id", "hospital_id", "department", "doctor_id", "is_solved") + CARE_REQUEST_WAITING_FIELDS
+
+
+def backfill(dry_run: bool) -> Counter:
+    table = get_table(TABLE_CARE_REQUESTS)
+    counts = Counter()
+    names = {f"#{name}": name for name in PROJECTION}
+    for item in iter_scan(table, ProjectionExpression=", ".join(names), ExpressionAttributeNames=names):
+        expected = waiting_fields(item)
+        current = {name: item[name] for name in CARE_REQUEST_WAITING_FIELDS if name in item}
+        if current == expected:
+            counts["unchanged"] += 1
+            continue
+        counts["set" if expected else "removed"] += 1
+        if dry_run:
+            continue
+        stale = [name for name in CARE_REQUEST_WAITING_FIELDS if name not in expected]
+        expression = []
+        if expected:
+            expression.append("SET " + ", ".join(f"{name} = :{name}" for name in expected))
+        if stale:
+            expression.append("REMOVE " + ", ".join(stale))
+        params = {"Key": {"request_id": item["request_id"]}, "UpdateExpression": " ".join(expression)}
+        if expected:
+            params["ExpressionAttributeValues"] = {f":{name}": value for name, value in expected.items()}
+        table.update_item(**params)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="진료 신청 대기열 인덱스 키 속성 채우기 / 지우기")
+    parser.add_argument("--dry-run", action="store_true", help="바꿀 개수만 세고 쓰지 않음")
+    args = parser.parse_args()
+
+    counts = backfill(args.dry_run)
+    print(f"{TABLE_CARE_REQUESTS} set={counts['set']} removed={counts['removed']} unchanged={counts['unchanged']}"
+          f"{' (dry run)' if args.dry_run else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# scripts/call_state_bench.py
+# ⏱ 통화 상태 전환(생성 / 시작 / 종료 / 텍스트) 지연 비교
+#   before : 예전 test_api 방식 (RTDB → Firestore 순서대로, 텍스트는 get() 후 update)
+#   after  : app/services/call_state_service (RTDB multi-path update 와 Firestore 쓰기를 동시에, 사전 조회 없음)
+#
+#   python scripts/call_state_bench.py                       # 가짜 클라이언트, 왕복 지연을 흉내 냄
+#   python scripts/call_state_bench.py --rtdb-ms 60 --firestore-ms 90 --runs 50
+#   python scripts/call_state_bench.py --live --runs 10     # .env 의 실제 Firebase 에 bench_ 방을 만들어 측정
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import call_state_service  # noqa: E402
+
+
+# ---------- 가짜 클라이언트 (호출마다 지정한 만큼 sleep) ----------
+class _FakeRef:
+    def __init__(self, delay):
+        self._delay = delay
+
+    def set(self, *_):
+        time.sleep(self._delay)
+
+    def update(self, *_):
+        time.sleep(self._delay)
+
+
+class _FakeSnapshot:
+    exists = True
+
+
+class _FakeDoc(_FakeRef):
+    def get(self):
+        time.sleep(self._delay)
+        return _FakeSnapshot()
+
+
+class _FakeFirestore:
+    def __init__(self, delay):
+        self._delay = delay
+
+    def collection(self, _):
+        return self
+
+    def document(self, _):
+        return _FakeDoc(self._delay)
+
+
+def _fake_clients(rtdb_ms, firestore_ms):
+    rtdb = _FakeRef(rtdb_ms / 1000)
+    firestore_client = _FakeFirestore(firestore_ms / 1000)
+    return [
+        mock.patch("firebase_admin.db.reference", lambda *_: rtdb),
+        mock.patch.object(call_state_service, "get_firestore", lambda: firestore_client),
+        mock.patch.object(call_state_service, "ensure_firebase", lambda: None),
+    ]
+
+
+# ---------- 예전 방식 (순차) ----------
+def _before(room_id):
+    from firebase_admin import db as realtime_db, firestore
+
+    doc = call_state_service.get_firestore().collection("calls").document(room_id)
+    return {
+        "create": lambda: (
+            realtime_db.reference(f"calls/{room_id}").set({"status": "waiting", "is_accepted": False}),
+            doc.set({"is_accepted": False, "started_at": None, "ended_at": None, "doctor_text": [], "patient_text": []}),
+        ),
+        "start": lambda: (
+            doc.update({"started_at": time.time(), "is_accepted": True}),
+            realtime_db.reference(f"calls/{room_id}").update({"status": "accepted"}),
+        ),
+        "text": lambda: (
+            doc.get().exists and doc.update({"doctor_text": firestore.ArrayUnion(["bench"])}),
+        ),
+        "end": lambda: (
+            doc.update({"ended_at": time.time()}),
+            realtime_db.reference(f"calls/{room_id}").update({"status": "ended"}),
+        ),
+    }
+
+
+def _after(room_id, created):
+    return {
+        "create": lambda: created.update(call_state_service.create_call("bench", f"bench_{time.time_ns()}")),
+        "start": lambda: call_state_service.start_call(created.get("room_id", room_id)),
+        "text": lambda: call_state_service.append_call_text(created.get("room_id", room_id), "doctor", "bench"),
+        "end": lambda: call_state_service.end_call(created.get("room_id", room_id)),
+    }
+
+
+def _timed(func):
+    started = time.perf_counter()
+    func()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="통화 상태 전환 지연 비교")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--rtdb-ms", type=float, default=40.0, help="가짜 RTDB 왕복 지연")
+    parser.add_argument("--firestore-ms", type=float, default=60.0, help="가짜 Firestore 왕복 지연")
+    parser.add_argument("--live", action="store_true", help="실제 Firebase 에 쓰면서 측정")
+    args = parser.parse_args()
+
+    patches = [] if args.live else _fake_clients(args.rtdb_ms, args.firestore_ms)
+    for patch in patches:
+        patch.start()
+    if args.live:
+        call_state_service.ensure_firebase()
+
+    transitions = ("create", "start", "text", "end")
+    before = {t: [] for t in transitions}
+    after = {t: [] for t in transitions}
+    for run in range(args.runs):
+        room_id = f"bench_{os.getpid()}_{run}"
+        steps = _before(room_id)
+        for transition in transitions:
+            before[transition].append(_timed(steps[transition]))
+        created = {}
+        steps = _after(room_id, created)
+        for transition in transitions:
+            after[transition].append(_timed(steps[transition]))
+
+    print(f"{'transition':<10} {'before p50':>11} {'after p50':>10} {'before p95':>11} {'after p95':>10}")
+    for transition in transitions:
+        b, a = sorted(before[transition]), sorted(after[transition])
+        p95 = lambda values: values[min(len(values) - 1, int(len(values) * 0.95))]
+        print(f"{transition:<10} {statistics.median(b):>9.1f}ms {statistics.median(a):>8.1f}ms "
+              f"{p95(b):>9.1f}ms {p95(a):>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
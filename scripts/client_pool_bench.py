@@ -0,0 +1,144 @@
+# scripts/client_pool_bench.py
+# ⏱ 동시 부하에서 DynamoDB 호출 지연 p99 (app/core/clients.py)
+#   per-call : 호출마다 boto3.resource 를 새로 만듦 (예전 firestore.client() 처럼 매번 만들던 방식, 커넥션 재사용 없음)
+#   default  : 모듈마다 import 시점에 만든 기본 설정 리소스 (max_pool_connections=10, 재시도 legacy)
+#   registry : 공용 레지스트리 설정 (_dynamodb_config(): DYNAMODB_MAX_POOL_CONNECTIONS, keep-alive, adaptive 재시도, 타임아웃)
+#              + warm_up() 처럼 미리 커넥션을 열어 둔 상태
+# 로컬에 DynamoDB GetItem 만 흉내 내는 HTTP 서버를 띄워서 실제 urllib3 커넥션 풀을 그대로 쓴다.
+# 응답마다 --rtt, 새 커넥션마다 --handshake (TLS 핸드셰이크 흉내) 만큼 늦게 응답하고,
+# 스레드 풀(BLOCKING_POOL_SIZE 개)에서 동시에 호출해 호출 지연 p50/p99/max 와 서버가 받은 새 커넥션 수를 잰다.
+#
+#   python scripts/client_pool_bench.py
+#   python scripts/client_pool_bench.py --threads 64 --calls 50 --rtt 5 --handshake 30
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+import boto3  # noqa: E402
+from botocore.config import Config  # noqa: E402
+
+from app.core.clients import _dynamodb_config  # noqa: E402
+from app.core.config import AWS_REGION, BLOCKING_POOL_SIZE  # noqa: E402
+from app.utils.dynamodb_types import install_native_types  # noqa: E402
+
+ITEM = {"Item": {"hospital_id": {"N": "1"}, "name": {"S": "테스트1보건소"}}}
+
+
+class _FakeDynamoDB(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    rtt = 0.0
+    handshake = 0.0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _FakeDynamoDB.lock:
+            _FakeDynamoDB.connections += 1
+        time.sleep(self.handshake)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.rtt)
+        body = json.dumps(ITEM).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-amz-json-1.0")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("x-amzn-RequestId", "bench")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _resource(endpoint: str, config):
+    resource = boto3.resource("dynamodb", endpoint_url=endpoint, config=config)
+    install_native_types(resource)
+    return resource
+
+
+def _run(mode: str, endpoint: str, threads: int, calls: int) -> dict:
+    if mode == "default":
+        shared = _resource(endpoint, Config(region_name=AWS_REGION)).Table("hospitals")
+    elif mode == "registry":
+        shared = _resource(endpoint, _dynamodb_config()).Table("hospitals")
+        # warm_up(): 풀 크기만큼 동시에 호출해서 커넥션을 미리 열어 둠
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda _: shared.get_item(Key={"hospital_id": 1}), range(threads)))
+    else:
+        shared = None
+
+    connections_before = _FakeDynamoDB.connections
+    latencies = []
+
+    def worker(_):
+        local = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            table = shared or _resource(endpoint, Config(region_name=AWS_REGION)).Table("hospitals")
+            table.get_item(Key={"hospital_id": 1})
+            local.append((time.perf_counter() - started) * 1000)
+        return local
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for local in pool.map(worker, range(threads)):
+            latencies.extend(local)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(n - 1, int(n * 0.99))],
+        "max": latencies[-1],
+        "calls_per_s": n / elapsed,
+        "connections": _FakeDynamoDB.connections - connections_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 부하에서 DynamoDB 호출 p99: 호출마다 생성 vs 기본 설정 공유 vs 공용 레지스트리")
+    parser.add_argument("--threads", type=int, default=BLOCKING_POOL_SIZE, help="동시에 호출하는 스레드 수 (run_blocking 풀 크기)")
+    parser.add_argument("--calls", type=int, default=30, help="스레드당 호출 수")
+    parser.add_argument("--rtt", type=float, default=5.0, help="응답마다 더할 지연 (ms)")
+    parser.add_argument("--handshake", type=float, default=20.0, help="새 커넥션마다 더할 지연 (ms)")
+    parser.add_argument("--modes", nargs="+", default=["per-call", "default", "registry"])
+    args = parser.parse_args()
+
+    # default 모드는 풀이 넘쳐서 "Connection pool is full" 경고가 호출마다 찍히므로 숨김 (new conns 로 대신 확인)
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+    _FakeDynamoDB.rtt = args.rtt / 1000
+    _FakeDynamoDB.handshake = args.handshake / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeDynamoDB)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"threads={args.threads}, calls/thread={args.calls}, rtt={args.rtt}ms, handshake={args.handshake}ms, "
+          f"registry pool={_dynamodb_config().max_pool_connections}")
+    print(f"\n{'mode':<9} {'p50':>9} {'p99':>9} {'max':>9} {'calls/s':>9} {'new conns':>10}")
+    try:
+        for mode in args.modes:
+            r = _run(mode, endpoint, args.threads, args.calls)
+            print(f"{mode:<9} {r['p50']:>7.1f}ms {r['p99']:>7.1f}ms {r['max']:>7.1f}ms "
+                  f"{r['calls_per_s']:>9.1f} {r['connections']:>10}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
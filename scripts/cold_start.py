@@ -0,0 +1,154 @@
+# scripts/cold_start.py
+# ⏱ 콜드 스타트 측정 (STARTUP_MODE 별)
+#   1) import app.main 에 걸리는 시간 (새 인터프리터)
+#   2) uvicorn 프로세스 시작 → GET /login 첫 바이트까지
+#   3) uvicorn 프로세스 시작 → 첫 로그인 성공까지 (--health-center / --password 를 준 경우)
+#
+#   python scripts/cold_start.py --runs 5
+#   python scripts/cold_start.py --modes eager,background --health-center 서울보건소 --password ****
+#   python scripts/cold_start.py --importtime 20     # import 가 오래 걸리는 모듈 상위 20개
+#
+# .env 의 AWS / Firebase 설정을 그대로 쓰므로 실제 환경(또는 같은 리전)에서 돌려야 의미가 있다.
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env(mode):
+    return dict(os.environ, STARTUP_MODE=mode)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(mode):
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    out = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, env=_env(mode))
+    return float(out.decode().strip().splitlines()[-1]) * 1000
+
+
+def _request(port, method, path, body=None, headers=None, timeout=30.0):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+# 접속이 될 때까지 계속 시도하고 첫 응답을 받은 시각을 돌려줌
+def _wait_first_response(port, started, deadline, method, path, body=None, headers=None, ok=None):
+    while time.perf_counter() < deadline:
+        try:
+            status, payload = _request(port, method, path, body, headers)
+        except (ConnectionError, OSError):
+            time.sleep(0.01)
+            continue
+        if ok is None or ok(status, payload):
+            return (time.perf_counter() - started) * 1000
+        time.sleep(0.05)
+    return None
+
+
+def _login_ok(status, payload):
+    try:
+        return status == 200 and json.loads(payload).get("status_code") == 200
+    except ValueError:
+        return False
+
+
+def measure_server(mode, args):
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=_env(mode),
+    )
+    try:
+        deadline = started + args.timeout
+        ttfb = _wait_first_response(port, started, deadline, "GET", "/login")
+        login = None
+        if args.health_center and args.password:
+            role = "doctor" if args.department else "admin"
+            payload = {"public_health_center": args.health_center, "password": args.password}
+            if args.department:
+                payload["department"] = args.department
+            login = _wait_first_response(
+                port, started, deadline, "POST", f"/api/login/{role}",
+                body=json.dumps(payload), headers={"Content-Type": "application/json"}, ok=_login_ok,
+            )
+        return ttfb, login
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def print_importtime(limit):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=_env("lazy"), capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, self_us, cumulative_us, name = (part.strip() for part in line.replace("import time:", "|").split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:limit]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name.strip()}")
+
+
+def _summary(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return "-"
+    return f"median {statistics.median(values):7.0f} ms  (min {min(values):.0f}, max {max(values):.0f}, n={len(values)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STARTUP_MODE 별 콜드 스타트 측정")
+    parser.add_argument("--modes", default="eager,background,lazy")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60.0, help="실행당 최대 대기(초)")
+    parser.add_argument("--health-center", help="로그인 측정용 보건소 이름")
+    parser.add_argument("--department", help="지정하면 의사 로그인, 없으면 관리자 로그인")
+    parser.add_argument("--password")
+    parser.add_argument("--importtime", type=int, metavar="N", help="import 시간 상위 N개 모듈만 출력")
+    args = parser.parse_args()
+
+    if args.importtime:
+        print_importtime(args.importtime)
+        return
+
+    for mode in args.modes.split(","):
+        imports, ttfbs, logins = [], [], []
+        for _ in range(args.runs):
+            imports.append(measure_import(mode))
+            ttfb, login = measure_server(mode, args)
+            ttfbs.append(ttfb)
+            logins.append(login)
+        print(f"[{mode}]")
+        print(f"  import app.main      {_summary(imports)}")
+        print(f"  first byte /login    {_summary(ttfbs)}")
+        print(f"  first login success  {_summary(logins)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# scripts/executor_bench.py
+# ⏱ 동시에 처리 중인 요청 수에 따른 처리량 (app/services/executor.py)
+#   inline : async 핸들러 안에서 boto3 호출을 바로 부름 (호출이 끝날 때까지 이벤트 루프가 멈춰서 요청이 한 줄로 처리됨)
+#   pool   : run_blocking(...) → 공용 스레드 풀 (BLOCKING_POOL_SIZE)
+# moto 로 띄운 가짜 DynamoDB 에 GetItem 을 보내고, 네트워크 왕복은 --rtt 만큼 호출마다 더한다.
+# 동시 요청 수를 늘려 가며 초당 처리 수를 잰다. inline 은 1000 / rtt 근처에서 멈추고, pool 은 풀 크기까지 늘어나야 정상
+# (moto 가 같은 프로세스에서 요청을 처리하느라 GIL 을 쓰므로 실제 네트워크보다는 덜 늘어남).
+#
+#   python scripts/executor_bench.py
+#   python scripts/executor_bench.py --rtt 20 --requests 400 --workers 16 --concurrency 1 4 16 64
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("STARTUP_MODE", "lazy")
+
+from moto import mock_aws  # noqa: E402
+
+from app.core.clients import registry  # noqa: E402
+from app.services import executor  # noqa: E402
+from app.services.dynamodb_schema import TABLES, create_tables  # noqa: E402
+from app.services.executor import BlockingExecutor, run_blocking  # noqa: E402
+
+TABLE = "hospitals"
+
+
+async def _run(mode: str, table, requests: int, concurrency: int):
+    async def inline_handler(hospital_id):
+        return table.get_item(Key={"hospital_id": hospital_id})
+
+    async def pool_handler(hospital_id):
+        return await run_blocking(table.get_item, Key={"hospital_id": hospital_id})
+
+    handler = inline_handler if mode == "inline" else pool_handler
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(i):
+        async with semaphore:
+            response = await handler(i % 10 + 1)
+            assert "Item" in response
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request(i) for i in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 요청 수별 처리량: inline 블로킹 호출 vs run_blocking")
+    parser.add_argument("--requests", type=int, default=200, help="측정마다 보내는 요청 수")
+    parser.add_argument("--rtt", type=float, default=10.0, help="DynamoDB 호출마다 더할 네트워크 왕복 (ms)")
+    parser.add_argument("--workers", type=int, default=executor.BLOCKING_POOL_SIZE, help="run_blocking 스레드 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64], help="동시 요청 수")
+    args = parser.parse_args()
+
+    executor.blocking_executor = BlockingExecutor(max_workers=args.workers)
+    with mock_aws():
+        registry._dynamodb = None
+        registry._tables = {}
+        dynamodb = registry.dynamodb()
+        create_tables(dynamodb, tables={TABLE: TABLES[TABLE]}, wait=False)
+        dynamodb.meta.client.meta.events.register(
+            "before-call.dynamodb", lambda **_: time.sleep(args.rtt / 1000), unique_id="bench-rtt",
+        )
+        table = registry.table(TABLE)
+        for hospital_id in range(1, 11):
+            table.put_item(Item={"hospital_id": hospital_id, "name": f"테스트{hospital_id}보건소"})
+
+        ceiling = f", serialized ceiling={1000 / args.rtt:.0f} req/s" if args.rtt else ""
+        print(f"rtt={args.rtt}ms, requests={args.requests}, workers={args.workers}{ceiling}")
+        print(f"\n{'in-flight':>9} {'inline req/s':>13} {'pool req/s':>11} {'speedup':>8}")
+        for concurrency in args.concurrency:
+            inline = asyncio.run(_run("inline", table, args.requests, concurrency))
+            pool = asyncio.run(_run("pool", table, args.requests, concurrency))
+            print(f"{concurrency:>9} {inline:>13.1f} {pool:>11.1f} {pool / inline:>7.1f}x")
+
+    stats = executor.blocking_executor.stats()
+    print(f"\npool: max_running={stats['max_running']}, avg_queue_wait={stats['avg_queue_wait_ms']}ms, "
+          f"avg_run={stats['avg_run_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
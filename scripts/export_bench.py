@@ -0,0 +1,119 @@
+# scripts/export_bench.py
+# ⏱ 내보내기 병렬 scan 의 세그먼트 수별 처리량 (app/services/dynamodb_service.py parallel_scan, /test/export)
+# 진단 기록 N 건을 세그먼트 수를 바꿔 가며 전부 읽는 시간과 초당 아이템 수를 잰다.
+#   - 실제 Scan 은 페이지(1MB)마다 왕복이 있으므로 --page 로 페이지 크기를, --rtt 로 호출마다 걸리는 왕복을 흉내 냄
+#   - 세그먼트 하나는 페이지를 차례로 읽으므로 (페이지 수 × rtt) 가 하한, 세그먼트를 늘리면 그만큼 나눠짐
+#   - 스레드 수는 EXPORT_MAX_WORKERS 로 막혀 있으므로 그보다 큰 세그먼트 수는 --workers 로 같이 올려서 비교
+# 기본은 메모리 테이블 (Segment / Limit / ExclusiveStartKey 만 흉내, 왕복 동안 GIL 을 놓음).
+# --moto 는 moto 로 띄운 가짜 DynamoDB 를 쓰지만, moto 는 페이지마다 테이블 전체를 훑느라 GIL 을 잡아서 세그먼트 효과가 잘 안 보임.
+#
+#   python scripts/export_bench.py
+#   python scripts/export_bench.py --items 20000 --page 500 --rtt 20 --segments 1 2 4 8 16 32 --workers 32
+#   python scripts/export_bench.py --moto --items 2000
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("STARTUP_MODE", "lazy")
+
+from app.core.config import EXPORT_MAX_WORKERS  # noqa: E402
+from app.services.dynamodb_service import parallel_scan  # noqa: E402
+
+TABLE = "diagnosis_records"
+
+
+def _items(count: int) -> list:
+    return [
+        {
+            "diagnosis_id": diagnosis_id,
+            "hospital_id": 1,
+            "doctor_id": 1000 + diagnosis_id % 50,
+            "patient_id": f"patient-{diagnosis_id % 5000}",
+            "disease_code": "J00",
+            "diagnosis_text": "급성 비인두염, 3일 후 재진",
+            "diagnosed_at": f"2025-05-{diagnosis_id % 28 + 1:02d} 10:00:00",
+        }
+        for diagnosis_id in range(1, count + 1)
+    ]
+
+
+# Scan 에서 parallel_scan / iter_scan 이 쓰는 부분만 (세그먼트는 키 해시 대신 나머지로 나눔)
+class PagedTable:
+    name = TABLE
+
+    def __init__(self, items: list, rtt: float):
+        self._items = items
+        self._rtt = rtt
+
+    def scan(self, Segment=0, TotalSegments=1, Limit=None, ExclusiveStartKey=None, **_):
+        time.sleep(self._rtt)
+        rows = self._items[Segment::TotalSegments]
+        start = ExclusiveStartKey["offset"] if ExclusiveStartKey else 0
+        end = len(rows) if Limit is None else min(len(rows), start + Limit)
+        response = {"Items": rows[start:end], "ScannedCount": end - start}
+        if end < len(rows):
+            response["LastEvaluatedKey"] = {"offset": end}
+        return response
+
+
+def _run(table, args):
+    print(f"items={args.items}, page={args.page}, rtt={args.rtt}ms, workers={args.workers or EXPORT_MAX_WORKERS}, "
+          f"table={'moto' if args.moto else 'memory'}")
+    print(f"\n{'segments':>8} {'rows':>7} {'time':>9} {'items/s':>10} {'speedup':>8}")
+    baseline = None
+    for segments in args.segments:
+        started = time.perf_counter()
+        rows = sum(1 for _ in parallel_scan(table, total_segments=segments, max_workers=args.workers, Limit=args.page))
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{segments:>8} {rows:>7} {elapsed:>8.2f}s {rows / elapsed:>10.0f} {baseline / elapsed:>7.1f}x")
+
+
+def _run_moto(items: list, args):
+    from moto import mock_aws
+
+    from app.core.clients import registry
+    from app.services.dynamodb_schema import TABLES, create_tables
+
+    with mock_aws():
+        registry._dynamodb = None
+        registry._tables = {}
+        dynamodb = registry.dynamodb()
+        create_tables(dynamodb, tables={TABLE: TABLES[TABLE]}, wait=False)
+        table = registry.table(TABLE)
+        with table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+        if args.rtt:
+            dynamodb.meta.client.meta.events.register(
+                "before-call.dynamodb.Scan", lambda **_: time.sleep(args.rtt / 1000), unique_id="bench-rtt",
+            )
+        _run(table, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="내보내기 병렬 scan: 세그먼트 수별 처리량")
+    parser.add_argument("--items", type=int, default=10000, help="테이블 아이템 수")
+    parser.add_argument("--page", type=int, default=250, help="Scan 한 번에 읽을 아이템 수 (Limit)")
+    parser.add_argument("--rtt", type=float, default=20.0, help="Scan 호출마다 걸리는 왕복 (ms)")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="세그먼트 수")
+    parser.add_argument("--workers", type=int, default=None, help=f"스레드 수 상한 (기본 EXPORT_MAX_WORKERS={EXPORT_MAX_WORKERS})")
+    parser.add_argument("--moto", action="store_true", help="메모리 테이블 대신 moto 사용")
+    args = parser.parse_args()
+
+    items = _items(args.items)
+    if args.moto:
+        _run_moto(items, args)
+    else:
+        _run(PagedTable(items, args.rtt / 1000), args)
+
+
+if __name__ == "__main__":
+    main()
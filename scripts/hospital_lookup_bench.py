@@ -0,0 +1,168 @@
+# scripts/hospital_lookup_bench.py
+# ⏱ 로그인 때 보건소 이름 → hospital_id 조회 비용 (app/services/dynamodb_service.py HospitalIndex)
+#   scan  : 예전 방식 — 로그인마다 hospitals 테이블 전체를 FilterExpression 으로 scan
+#   index : HospitalIndex — 메모리 dict 적중은 I/O 없음, 없는 이름은 GSI 한 번 조회 후 음수 캐시
+# moto 로 띄운 가짜 DynamoDB 에 보건소 N 개를 넣고 로그인 M 번의 조회 지연(p50/p99)과
+# 요청 단위 집계(app/utils/request_profile.py)의 호출 수 / 훑은 아이템 수 / RCU 를 로그인당으로 비교한다.
+#   - moto 는 ConsumedCapacity 를 호출당 1.0 으로만 돌려주므로, 훑은 아이템 크기로 다시 계산한 추정 RCU 도 같이 보여 줌
+#     (최종 일관 읽기: 4KB 당 0.5, 실제 테이블에서는 profile 의 RCU 가 그대로 실제 소비량)
+#   - 네트워크 왕복은 --rtt 만큼 DynamoDB 호출마다 더함 (moto 는 프로세스 안에서 처리)
+#
+#   python scripts/hospital_lookup_bench.py
+#   python scripts/hospital_lookup_bench.py --hospitals 1000 --logins 2000 --unknown 0.1 --rtt 5
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+os.environ.setdefault("STARTUP_MODE", "lazy")
+
+from boto3.dynamodb.conditions import Attr  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+from app.core.clients import registry  # noqa: E402
+from app.services.dynamodb_schema import TABLES, create_tables  # noqa: E402
+from app.services.dynamodb_service import TABLE_HOSPITALS, HospitalIndex  # noqa: E402
+from app.utils.request_profile import end_profile, start_profile  # noqa: E402
+
+
+# 예전 get_hospital_id_by_name 그대로 (첫 페이지만 보고, 필터는 읽은 뒤에 적용되므로 테이블 전체 RCU 를 씀)
+def scan_lookup(table, name: str):
+    response = table.scan(FilterExpression=Attr("name").eq(name))
+    items = response.get("Items", [])
+    return items[0].get("hospital_id") if items else None
+
+
+# DynamoDB 아이템 크기 근사 (속성 이름 + 값, 숫자는 유효 숫자 2자리당 1바이트 + 1)
+def _item_size(item: dict) -> int:
+    size = 0
+    for key, value in item.items():
+        size += len(key.encode())
+        if isinstance(value, str):
+            size += len(value.encode())
+        else:
+            size += len(str(value)) // 2 + 2
+    return size
+
+
+def _estimated_rcu(calls: int, scanned: int, avg_item_size: float) -> float:
+    if not calls:
+        return 0.0
+    # 호출마다 최소 0.5 (GetItem / Query 한 건), scan 은 훑은 바이트 기준
+    return max(calls * 0.5, math.ceil(scanned * avg_item_size / 4096) * 0.5)
+
+
+def _seed(table, hospitals: int) -> float:
+    sizes = []
+    with table.batch_writer() as batch:
+        for i in range(1, hospitals + 1):
+            item = {
+                "hospital_id": i,
+                "name": f"테스트{i}보건소",
+                "address": f"서울특별시 테스트구 보건로 {i}길 {i % 97 + 1}",
+                "phone": f"02-{1000 + i % 9000}-{i % 10000:04d}",
+                "departments": "내과,외과,소아과,이비인후과",
+            }
+            sizes.append(_item_size(item))
+            batch.put_item(Item=item)
+    return statistics.mean(sizes)
+
+
+def _names(hospitals: int, logins: int, unknown: float, seed: int) -> list:
+    rng = random.Random(seed)
+    names = []
+    for _ in range(logins):
+        if rng.random() < unknown:
+            # 오타 / 없는 보건소: 같은 이름이 반복해서 들어오는 경우도 섞이도록 범위를 좁게
+            names.append(f"없는{rng.randint(1, 20)}보건소")
+        else:
+            names.append(f"테스트{rng.randint(1, hospitals)}보건소")
+    return names
+
+
+def _run(lookup, names: list, avg_item_size: float) -> dict:
+    latencies, calls, scanned, rcu, estimated = [], 0, 0, 0.0, 0.0
+    for name in names:
+        profile, token = start_profile()
+        started = time.perf_counter()
+        try:
+            lookup(name)
+        finally:
+            latencies.append((time.perf_counter() - started) * 1000)
+            end_profile(token)
+        calls += profile.calls
+        scanned += profile.dynamodb_scanned
+        rcu += profile.dynamodb_rcu
+        estimated += _estimated_rcu(profile.calls, profile.dynamodb_scanned, avg_item_size)
+    latencies.sort()
+    n = len(names)
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(n - 1, int(n * 0.99))],
+        "calls": calls / n,
+        "scanned": scanned / n,
+        "rcu": rcu / n,
+        "estimated": estimated / n,
+        "total_estimated": estimated,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 보건소 조회: 전체 scan vs HospitalIndex")
+    parser.add_argument("--hospitals", type=int, default=260, help="hospitals 테이블 아이템 수")
+    parser.add_argument("--logins", type=int, default=1000, help="로그인(조회) 횟수")
+    parser.add_argument("--unknown", type=float, default=0.05, help="없는 보건소 이름 비율")
+    parser.add_argument("--rtt", type=float, default=0.0, help="DynamoDB 호출마다 더할 네트워크 왕복 (ms)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with mock_aws():
+        registry._dynamodb = None
+        registry._tables = {}
+        dynamodb = registry.dynamodb()
+        create_tables(dynamodb, tables={TABLE_HOSPITALS: TABLES[TABLE_HOSPITALS]}, wait=False)
+        if args.rtt:
+            dynamodb.meta.client.meta.events.register(
+                "before-call.dynamodb", lambda **_: time.sleep(args.rtt / 1000), unique_id="bench-rtt",
+            )
+        table = registry.table(TABLE_HOSPITALS)
+        avg_item_size = _seed(table, args.hospitals)
+        names = _names(args.hospitals, args.logins, args.unknown, args.seed)
+
+        index = HospitalIndex(TABLE_HOSPITALS, ttl=3600)
+        profile, token = start_profile()
+        started = time.perf_counter()
+        index._ensure_loaded()
+        warmup_ms = (time.perf_counter() - started) * 1000
+        end_profile(token)
+        warmup_estimated = _estimated_rcu(profile.calls, profile.dynamodb_scanned, avg_item_size)
+
+        results = {
+            "scan": _run(lambda name: scan_lookup(table, name), names, avg_item_size),
+            "index": _run(index.get_id, names, avg_item_size),
+        }
+        index.stop()
+
+    print(f"hospitals={args.hospitals} (avg item {avg_item_size:.0f} B), logins={args.logins}, "
+          f"unknown={args.unknown:.0%}, rtt={args.rtt}ms")
+    print(f"index 첫 적재: {warmup_ms:.1f} ms, 호출 {profile.calls}, 훑은 아이템 {profile.dynamodb_scanned}, "
+          f"추정 RCU {warmup_estimated:.1f} (HOSPITAL_INDEX_TTL 마다 한 번)")
+
+    print(f"\n{'mode':<6} {'p50':>9} {'p99':>9} {'calls/login':>12} {'scanned/login':>14} "
+          f"{'RCU/login(moto)':>16} {'est. RCU/login':>15} {'est. RCU total':>15}")
+    for mode, r in results.items():
+        print(f"{mode:<6} {r['p50']:>7.3f}ms {r['p99']:>7.3f}ms {r['calls']:>12.3f} {r['scanned']:>14.1f} "
+              f"{r['rcu']:>16.3f} {r['estimated']:>15.3f} {r['total_estimated']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# scripts/id_stress.py
+# 🆔 ID 생성기 충돌 / 처리량 확인 (app/utils/id_generator.py)
+#   1) 한 프로세스 안에서 여러 스레드가 동시에 next_id()
+#   2) 여러 프로세스(fork / spawn)가 동시에 next_id() → 모두 모아서 중복 검사
+#   3) 한 스레드 안에서는 값이 항상 증가하는지
+#   4) 프로세스마다 임대한 worker 번호가 겹치지 않는지 (ID_WORKER_ID + ID_WORKER_SLOTS, 잠금 파일)
+#   5) worker 번호가 일부러 겹친 두 생성기로 put_new_item → 같은 ID 가 나와도 덮어쓰지 않는지 (moto, requirements-dev.txt)
+#
+#   python scripts/id_stress.py
+#   python scripts/id_stress.py --threads 16 --processes 8 --count 50000
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils import id_generator  # noqa: E402
+
+
+def _generate(count: int) -> list:
+    ids = [id_generator.next_id() for _ in range(count)]
+    if any(b <= a for a, b in zip(ids, ids[1:])):
+        raise AssertionError("한 스레드 안에서 ID 가 증가하지 않음")
+    return ids
+
+
+def _threaded(threads: int, count: int) -> list:
+    results = [None] * threads
+
+    def worker(index):
+        results[index] = _generate(count)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return [value for ids in results for value in ids]
+
+
+def _process_worker(args):
+    threads, count = args
+    ids = _threaded(threads, count)
+    return os.getpid(), id_generator.worker_id(), ids
+
+
+def _report(label: str, ids: list, elapsed: float):
+    duplicates = len(ids) - len(set(ids))
+    print(f"{label:<28} {len(ids):>9,} ids  {len(ids) / elapsed:>12,.0f} ids/s  duplicates={duplicates}")
+    return duplicates
+
+
+# 같은 worker 번호를 쓰는 두 생성기를 번갈아 써서 일부러 ID 를 겹치게 만든 뒤 put_new_item 으로 저장
+# 반환: 덮어써서 사라진 기록 수 (0 이어야 함)
+def _collision(writes: int) -> int:
+    try:
+        from moto import mock_aws
+    except ImportError:
+        print("collision check skipped (pip install -r requirements-dev.txt)")
+        return 0
+    from unittest import mock
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+    from app.core.clients import registry
+    from app.services import dynamodb_service
+    from app.services.dynamodb_schema import TABLES, create_tables
+
+    generators = itertools.cycle([id_generator.SnowflakeGenerator(7), id_generator.SnowflakeGenerator(7)])
+    raw = [next(generators).next_id() for _ in range(writes)]
+    generated_duplicates = len(raw) - len(set(raw))
+
+    # 미리 만든 (겹치는) ID 를 순서대로 쓰고, 다 쓰면 같은 두 생성기로 계속
+    pending = iter(raw)
+
+    def colliding_id():
+        value = next(pending, None)
+        return value if value is not None else next(generators).next_id()
+
+    with mock_aws(), mock.patch.object(dynamodb_service, "next_id", colliding_id):
+        registry._dynamodb, registry._tables = None, {}
+        create_tables(registry.dynamodb(), {"prescription_records": TABLES["prescription_records"]}, wait=False)
+        table = registry.table("prescription_records")
+        started = time.perf_counter()
+        with mock.patch.object(dynamodb_service.logger, "warning") as warned:
+            for n in range(writes):
+                dynamodb_service.put_new_item(table, "prescription_id", lambda pid, n=n: {"prescription_id": pid, "n": n})
+        elapsed = time.perf_counter() - started
+        stored = table.scan(Select="COUNT")["Count"]
+        registry._dynamodb, registry._tables = None, {}
+
+    lost = writes - stored
+    print(f"{'collision (same worker x2)':<28} {writes:>9,} puts  {writes / elapsed:>12,.0f} puts/s  "
+          f"duplicate ids generated={generated_duplicates} retried={warned.call_count} overwritten={lost}")
+    return lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ID 생성기 충돌 / 처리량 확인")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--count", type=int, default=20000, help="스레드당 생성 개수")
+    parser.add_argument("--collision-writes", type=int, default=500, help="겹치는 worker 로 저장해 볼 기록 수")
+    args = parser.parse_args()
+
+    duplicates = 0
+
+    started = time.perf_counter()
+    ids = _threaded(args.threads, args.count)
+    duplicates += _report(f"{args.threads} threads", ids, time.perf_counter() - started)
+
+    for method in ("fork", "spawn"):
+        if method not in multiprocessing.get_all_start_methods():
+            continue
+        context = multiprocessing.get_context(method)
+        started = time.perf_counter()
+        with context.Pool(args.processes) as pool:
+            results = pool.map(_process_worker, [(args.threads, args.count)] * args.processes)
+        elapsed = time.perf_counter() - started
+        workers = {worker_id for _, worker_id, _ in results}
+        ids = [value for _, _, chunk in results for value in chunk]
+        duplicates += _report(f"{args.processes} x {args.threads} threads ({method})", ids, elapsed)
+        if len(workers) != len(results):
+            print(f"  worker 번호가 겹침: {sorted(workers)}")
+            duplicates += 1
+        else:
+            print(f"  leased workers: {sorted(workers)}")
+
+    duplicates += _collision(args.collision_writes)
+
+    sample = id_generator.next_id()
+    print(f"sample {sample} → {id_generator.parse_id(sample)}")
+    sys.exit(1 if duplicates else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# scripts/login_abuse.py
+# ⏱ 비정상 로그인 트래픽에서 백엔드 조회 수가 묶여 있는지 확인
+#   (app/services/auth_service.py 시도 제한 + app/services/dynamodb_service.py 없는 이름 캐시)
+# DynamoDB / Firestore 대신 호출 수만 세는 가짜 조회를 붙이고 process_login 을 직접 호출한다.
+#   spray       : IP 하나가 매번 다른 (없는) 보건소 이름으로 시도
+#   unknown     : IP 여러 개가 같은 없는 보건소 이름으로 반복 시도
+#   stuffing    : IP 여러 개가 실제 보건소 하나에 틀린 비밀번호로 시도
+#   rotating    : 시도마다 새 IP (X-Forwarded-For 위조 등) 로 실제 보건소 하나에 틀린 비밀번호로 시도
+#   legit       : 공격 중에 다른 IP 의 정상 사용자가 로그인
+#
+#   python scripts/login_abuse.py
+#   python scripts/login_abuse.py --attempts 20000 --ips 500 --seconds 10
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import auth_service, dynamodb_service  # noqa: E402
+
+CENTER = "서울보건소"
+PASSWORD = "doctor123"
+
+
+class _Backend:
+    def __init__(self):
+        self.dynamodb = 0
+        self.firestore = 0
+
+    def iter_query(self, *_args, **_kwargs):
+        self.dynamodb += 1
+        return iter(())
+
+    async def get_doctor(self, hospital_id, department):
+        self.firestore += 1
+        return {"password": PASSWORD, "license_number": "L1", "department": department}
+
+    async def update_password(self, *_):
+        self.firestore += 1
+
+
+async def _attack(name: str, attempts: int, make_args, seconds: float):
+    # attempts 번을 seconds 초 동안 고르게 나눠 보냄
+    outcomes = {"ok": 0, "failed": 0, "limited": 0}
+    delay = seconds / attempts
+    for i in range(attempts):
+        center, password, ip = make_args(i)
+        result = await auth_service.process_login(center, "doctor", "내과", password, client_ip=ip)
+        if result.get("message"):
+            outcomes["ok"] += 1
+        elif result.get("rate_limited"):
+            outcomes["limited"] += 1
+        else:
+            outcomes["failed"] += 1
+        if delay:
+            await asyncio.sleep(delay)
+    return name, outcomes
+
+
+async def main_async(args):
+    backend = _Backend()
+    index = dynamodb_service.hospital_index
+    index._by_name = {CENTER: 1}
+    index._loaded_at = time.monotonic()
+
+    patches = [
+        mock.patch.object(dynamodb_service, "iter_query", backend.iter_query),
+        mock.patch.object(auth_service, "get_doctor_by_id_and_department_async", backend.get_doctor),
+        mock.patch.object(auth_service, "update_doctor_password_async", backend.update_password),
+    ]
+    for patch in patches:
+        patch.start()
+
+    scenarios = [
+        ("spray", lambda i: (f"없는보건소{i}", PASSWORD, "10.0.0.1")),
+        ("unknown", lambda i: ("없는보건소", PASSWORD, f"10.1.{i % args.ips // 250}.{i % 250}")),
+        ("stuffing", lambda i: (CENTER, f"guess{i}", f"10.2.{i % args.ips // 250}.{i % 250}")),
+        ("rotating", lambda i: (CENTER, f"rotate{i}", f"10.3.{i // 250 % 250}.{i % 250}")),
+    ]
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_attack(name, args.attempts, make_args, args.seconds) for name, make_args in scenarios),
+        _attack("legit", 5, lambda i: (CENTER, PASSWORD, f"192.168.0.{i}"), args.seconds),
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(scenarios)} attack scenarios x {args.attempts} attempts from up to {args.ips} IPs over {elapsed:.1f}s")
+    for name, outcomes in results:
+        print(f"  {name:<10} ok={outcomes['ok']:<5} failed={outcomes['failed']:<6} limited={outcomes['limited']}")
+    total = args.attempts * len(scenarios)
+    print(f"backend calls: DynamoDB {backend.dynamodb}, Firestore {backend.firestore} "
+          f"(for {total + 5} login attempts)")
+    print(f"limits: {auth_service.login_limit_stats()}")
+    print(f"hospital index: {index.stats()}")
+
+    for patch in patches:
+        patch.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비정상 로그인 트래픽에서 백엔드 조회 수 확인")
+    parser.add_argument("--attempts", type=int, default=5000, help="시나리오별 시도 수")
+    parser.add_argument("--ips", type=int, default=200, help="분산 공격에 쓰는 IP 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="시나리오별 시도를 나눠 보내는 시간")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
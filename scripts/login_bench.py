@@ -0,0 +1,78 @@
+# scripts/login_bench.py
+# ⏱ 로그인 폭주 시 비밀번호 확인 처리량과 이벤트 루프 응답성 (app/services/password_service.py)
+#   inline : async 핸들러 안에서 verify_password() 를 바로 호출 (이벤트 루프가 해시 계산 동안 멈춤)
+#   pool   : verify_password_async() → 해시 전용 풀 (PASSWORD_HASH_WORKERS)
+# 로그인과 함께 10ms 마다 깨어나는 작업을 돌려서, 예정보다 얼마나 늦게 깨어나는지(루프 지연)를 잰다.
+#
+#   python scripts/login_bench.py
+#   python scripts/login_bench.py --logins 200 --workers 8 --n 32768
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import password_service  # noqa: E402
+from app.services.executor import BlockingExecutor  # noqa: E402
+
+TICK = 0.01
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK
+        await asyncio.sleep(TICK)
+        lags.append((loop.time() - expected) * 1000)
+
+
+async def _run(mode: str, logins: int, stored: str):
+    async def inline_login():
+        return password_service.verify_password("doctor123", stored)
+
+    async def pool_login():
+        return await password_service.verify_password_async("doctor123", stored)
+
+    login = inline_login if mode == "inline" else pool_login
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(TICK * 3)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    assert all(matched for matched, _ in results)
+    return elapsed, sorted(lags) or [0.0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그인 폭주 시 처리량 / 이벤트 루프 지연")
+    parser.add_argument("--logins", type=int, default=100, help="동시에 들어오는 로그인 수")
+    parser.add_argument("--workers", type=int, default=password_service.PASSWORD_HASH_WORKERS, help="해시 전용 스레드 수")
+    parser.add_argument("--n", type=int, default=password_service.PASSWORD_SCRYPT_N, help="scrypt N")
+    args = parser.parse_args()
+
+    password_service.password_executor = BlockingExecutor(max_workers=args.workers, name="password-hash")
+    stored = password_service.hash_password("doctor123", n=args.n)
+    started = time.perf_counter()
+    password_service.verify_password("doctor123", stored)
+    print(f"scrypt N={args.n} r={password_service.PASSWORD_SCRYPT_R} p={password_service.PASSWORD_SCRYPT_P}: "
+          f"{(time.perf_counter() - started) * 1000:.1f} ms / verify, workers={args.workers}, cpus={os.cpu_count()}")
+
+    print(f"\n{'mode':<8} {'logins/s':>9} {'total':>9} {'loop lag p50':>13} {'p99':>9} {'max':>9}")
+    for mode in ("inline", "pool"):
+        elapsed, lags = asyncio.run(_run(mode, args.logins, stored))
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        print(f"{mode:<8} {args.logins / elapsed:>9.1f} {elapsed:>8.2f}s {statistics.median(lags):>11.1f}ms "
+              f"{p99:>7.1f}ms {lags[-1]:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# scripts/metrics_overhead.py
+# ⏱ 지표 기록이 요청 / 백엔드 호출마다 더하는 시간 (app/utils/metrics.py, app/api/metrics.py)
+#   track     : with track(...) 블록 하나 (Firestore / RTDB / FCM 호출부)
+#   botocore  : DynamoDB GetItem 한 번 (Stubber 로 네트워크 없이) — 훅 없음 vs 훅 설치
+#   asgi      : 빈 FastAPI 라우트 요청 한 번 — MetricsMiddleware 없음 vs 있음 (요청 단위 집계 끔)
+#   profile   : 빈 FastAPI 라우트 요청 한 번 — MetricsMiddleware 없음 vs 있음 (요청 단위 집계 켬, app/utils/request_profile.py)
+#
+#   python scripts/metrics_overhead.py
+#   python scripts/metrics_overhead.py --n 50000
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.api.metrics import MetricsMiddleware  # noqa: E402
+from app.utils.metrics import install_botocore_metrics, render_metrics, track  # noqa: E402
+
+
+def _per_call(func, n: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(n):
+        func()
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def _dynamodb_get(with_hooks: bool, n: int) -> float:
+    import boto3
+    from botocore.stub import Stubber
+
+    client = boto3.client("dynamodb", region_name="ap-northeast-2", aws_access_key_id="x", aws_secret_access_key="x")
+    if with_hooks:
+        install_botocore_metrics(client, "dynamodb-bench")
+    stubber = Stubber(client)
+    for _ in range(n + 1):
+        stubber.add_response("get_item", {"Item": {"hospital_id": {"N": "1"}}}, {"TableName": "hospitals", "Key": {"hospital_id": {"N": "1"}}})
+    stubber.activate()
+    return _per_call(lambda: client.get_item(TableName="hospitals", Key={"hospital_id": {"N": "1"}}), n)
+
+
+def _asgi(with_middleware: bool, n: int, profiling: bool = False) -> float:
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/api/ping/{item_id}")
+    async def ping(item_id: str):
+        return {"ok": True}
+
+    asgi = MetricsMiddleware(app, profiling=profiling) if with_middleware else app
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "path": "/api/ping/1",
+        "raw_path": b"/api/ping/1", "query_string": b"", "root_path": "", "headers": [], "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        pass
+
+    async def run():
+        await asgi(dict(scope, app=app), receive, send)
+        started = time.perf_counter()
+        for _ in range(n):
+            await asgi(dict(scope), receive, send)
+        return (time.perf_counter() - started) / n * 1e6
+
+    return asyncio.run(run())
+
+
+def _asgi_profiled(with_middleware: bool, n: int) -> float:
+    return _asgi(with_middleware, n, profiling=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 기록 오버헤드")
+    parser.add_argument("--n", type=int, default=20000, help="반복 횟수")
+    args = parser.parse_args()
+
+    def tracked():
+        with track("firestore", "bench", "get"):
+            pass
+
+    print(f"{'':<10} {'without':>10} {'with':>10} {'overhead':>10}")
+    print(f"{'track':<10} {0:>8.2f}us {_per_call(tracked, args.n):>8.2f}us")
+    for name, measure in (("botocore", _dynamodb_get), ("asgi", _asgi), ("profile", _asgi_profiled)):
+        without, with_ = measure(False, args.n), measure(True, args.n)
+        print(f"{name:<10} {without:>8.2f}us {with_:>8.2f}us {with_ - without:>8.2f}us")
+
+    started = time.perf_counter()
+    body = render_metrics()
+    print(f"\n/metrics render: {(time.perf_counter() - started) * 1000:.2f} ms, {len(body.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
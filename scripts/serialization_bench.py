@@ -0,0 +1,172 @@
+# scripts/serialization_bench.py
+# ⏱ DynamoDB 아이템을 읽어서 JSON 응답으로 만드는 비용 (app/utils/dynamodb_types.py, app/utils/serialization.py)
+#   before : boto3 기본 TypeDeserializer (숫자 → Decimal) → 예전 decimal_to_native 재귀 → jsonable_encoder → json.dumps
+#            (FastAPI 기본 JSONResponse 경로)
+#   after  : NativeTypeDeserializer (숫자 → int/float) → FastJSONResponse (orjson)
+# 진료 신청 / 처방전 모양의 아이템을 DynamoDB 응답 형식({"N": "..."} …)으로 만들어 두고,
+# 아이템 → 파이썬 변환(deserialize)과 응답 바이트 만들기(encode)를 나눠서 시간과 단계별 할당 최대치(tracemalloc peak)를 잰다.
+#
+#   python scripts/serialization_bench.py
+#   python scripts/serialization_bench.py --items 5000 --repeat 10
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.utils.dynamodb_types import NativeTypeDeserializer  # noqa: E402
+from app.utils.serialization import FastJSONResponse  # noqa: E402
+
+DEPARTMENTS = ("내과", "외과", "소아과", "이비인후과", "피부과")
+SYMPTOMS = ("머리", "목", "가슴", "배", "허리", "다리")
+MEDICATIONS = ("타이레놀정500mg", "아모잘탄정", "무코스타정", "알마겔정", "코대원포르테시럽")
+
+
+# 예전 test_api.decimal_to_native 그대로
+def decimal_to_native(obj):
+    if isinstance(obj, list):
+        return [decimal_to_native(item) for item in obj]
+    elif isinstance(obj, dict):
+        return {k: decimal_to_native(v) for k, v in obj.items()}
+    elif isinstance(obj, Decimal):
+        if obj % 1 == 0:
+            return int(obj)
+        else:
+            return float(obj)
+    else:
+        return obj
+
+
+def _care_request(rng: random.Random, i: int) -> dict:
+    return {
+        "request_id": i,
+        "patient_id": f"patient-{rng.randint(1, 5000)}",
+        "doctor_id": rng.randint(1000, 1100),
+        "hospital_id": rng.randint(1, 260),
+        "department": rng.choice(DEPARTMENTS),
+        "symptom_part": rng.sample(SYMPTOMS, 2),
+        "symptom_type": ["통증", "열"],
+        "book_date": f"2025-0{rng.randint(1, 9)}-{rng.randint(10, 28)}",
+        "book_hour": f"{rng.randint(9, 17)}:00",
+        "is_solved": rng.random() < 0.5,
+        "sign_language_needed": rng.random() < 0.1,
+        "requested_at": "2025-06-01 10:15:00",
+    }
+
+
+def _prescription(rng: random.Random, i: int) -> dict:
+    medications = [
+        {
+            "medication_code": f"M{rng.randint(100000, 999999)}",
+            "medication_name": rng.choice(MEDICATIONS),
+            "days": rng.randint(1, 14),
+            "dosage": Decimal(rng.choice(("0.5", "1", "1.5", "2"))),
+            "frequency": rng.randint(1, 3),
+        }
+        for _ in range(rng.randint(1, 5))
+    ]
+    return {
+        # Snowflake ID 크기 (app/utils/id_generator.py)
+        "prescription_id": (1 << 55) + i,
+        "diagnosis_id": (1 << 55) + i + 1,
+        "doctor_id": rng.randint(1000, 1100),
+        "patient_id": f"patient-{rng.randint(1, 5000)}",
+        "medication_days": max(m["days"] for m in medications),
+        "medication_list": [m["medication_code"] for m in medications],
+        "medications": medications,
+        "memo": "식후 30분 복용",
+        "prescribed_at": "2025-06-01 10:30:00",
+    }
+
+
+# DynamoDB 응답 형식으로 (Query / Scan 의 Items 와 같은 모양)
+def _wire_items(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    serializer = TypeSerializer()
+    items = []
+    for i in range(count):
+        item = _care_request(rng, i) if i % 2 == 0 else _prescription(rng, i)
+        items.append({key: serializer.serialize(value) for key, value in item.items()})
+    return items
+
+
+def _deserialize(deserializer, items: list) -> list:
+    return [{key: deserializer.deserialize(value) for key, value in item.items()} for item in items]
+
+
+def _before_deserialize(items):
+    return decimal_to_native(_deserialize(TypeDeserializer(), items))
+
+
+def _before_encode(rows):
+    return JSONResponse(jsonable_encoder({"items": rows})).body
+
+
+def _after_deserialize(items):
+    return _deserialize(NativeTypeDeserializer(), items)
+
+
+def _after_encode(rows):
+    return FastJSONResponse({"items": rows}).body
+
+
+def _timed(func, arg, repeat: int) -> tuple:
+    result = func(arg)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return result, (time.perf_counter() - started) / repeat * 1000
+
+
+def _peak_mib(func, arg) -> float:
+    tracemalloc.start()
+    try:
+        func(arg)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DynamoDB 아이템 → JSON 응답 변환 비용: Decimal + json vs 기본 타입 + orjson")
+    parser.add_argument("--items", type=int, default=3000, help="아이템 수 (진료 신청 / 처방전 반씩)")
+    parser.add_argument("--repeat", type=int, default=5, help="시간 측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    items = _wire_items(args.items, args.seed)
+    modes = {
+        "before": (_before_deserialize, _before_encode),
+        "after": (_after_deserialize, _after_encode),
+    }
+
+    print(f"items={args.items} (care_requests / prescription_records 반씩), repeat={args.repeat}")
+    print(f"\n{'mode':<7} {'deserialize':>12} {'encode':>9} {'total':>9} {'peak deser.':>12} {'peak encode':>12} {'bytes':>10}")
+    bodies = {}
+    for mode, (deserialize, encode) in modes.items():
+        rows, deserialize_ms = _timed(deserialize, items, args.repeat)
+        body, encode_ms = _timed(encode, rows, args.repeat)
+        # 메모리는 시간과 따로 (tracemalloc 이 켜져 있으면 느려짐)
+        deserialize_peak = _peak_mib(deserialize, items)
+        encode_peak = _peak_mib(encode, rows)
+        bodies[mode] = body
+        print(f"{mode:<7} {deserialize_ms:>10.1f}ms {encode_ms:>7.1f}ms {deserialize_ms + encode_ms:>7.1f}ms "
+              f"{deserialize_peak:>9.2f}MiB {encode_peak:>9.2f}MiB {len(body):>10}")
+
+    # 두 경로가 같은 JSON 을 만드는지 (공백 / 한글 이스케이프 차이는 무시)
+    assert json.loads(bodies["before"]) == json.loads(bodies["after"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# tests/conftest.py
+# 🧪 공용 fixture
+#   aws       : moto 로 띄운 가짜 DynamoDB (app/services/dynamodb_schema.py 의 테이블 / GSI 그대로 생성)
+#   firestore : 공용 레지스트리의 Firestore 클라이언트를 MagicMock 으로 교체
+#   dynamodb_calls : 테스트 중 나간 DynamoDB 호출 (동작 이름 목록)
+#   doctor_token / admin_token : 세션 토큰 (Authorization: Bearer …)
+#
+#   pip install -r requirements-dev.txt
+#   python -m pytest -q
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app 모듈이 import 시점에 설정을 읽으므로 그 전에 지정
+os.environ.update(
+    AWS_REGION="ap-northeast-2",
+    AWS_DEFAULT_REGION="ap-northeast-2",
+    AWS_ACCESS_KEY_ID="testing",
+    AWS_SECRET_ACCESS_KEY="testing",
+    SESSION_SECRET="test-session-secret",
+    STARTUP_MODE="lazy",
+    NOTIFICATION_OUTBOX_PATH=os.path.join(tempfile.mkdtemp(prefix="silmedy-test-"), "outbox.sqlite3"),
+    REQUEST_PROFILING="true",
+    PROFILE_LOG_INTERVAL="0",
+)
+
+import pytest  # noqa: E402
+from moto import mock_aws  # noqa: E402
+
+from app.core.clients import registry  # noqa: E402
+from app.services.dynamodb_schema import create_tables  # noqa: E402
+from app.services.session_service import issue_token  # noqa: E402
+
+HOSPITAL_ID = 1
+DOCTOR_ID = 1001
+
+
+@pytest.fixture
+def aws():
+    with mock_aws():
+        registry._dynamodb = None
+        registry._tables = {}
+        dynamodb = registry.dynamodb()
+        create_tables(dynamodb, wait=False)
+        yield dynamodb
+        registry._dynamodb = None
+        registry._tables = {}
+
+
+@pytest.fixture
+def dynamodb_calls(aws):
+    calls = []
+
+    def record(model, **_):
+        calls.append(model.name)
+
+    aws.meta.client.meta.events.register("before-call.dynamodb", record, unique_id="tests-dynamodb-calls")
+    yield calls
+    aws.meta.client.meta.events.unregister("before-call.dynamodb", unique_id="tests-dynamodb-calls")
+
+
+@pytest.fixture
+def firestore():
+    client = mock.MagicMock()
+    with mock.patch.object(registry, "_firestore", client), mock.patch.object(registry, "_firebase_ready", True):
+        yield client
+
+
+@pytest.fixture
+def doctor_token():
+    return issue_token(HOSPITAL_ID, "doctor", doctor_id=DOCTOR_ID, department="내과", license_number="LIC-1001")
+
+
+@pytest.fixture
+def admin_token():
+    return issue_token(HOSPITAL_ID, "admin")
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
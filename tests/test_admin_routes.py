@@ -0,0 +1,138 @@
+# tests/test_admin_routes.py
+# 🏥 관리자 의사 목록: 세션 보건소만 / select 로 화면 필드만 / 문서 id 순 start_after 페이지 / 잘못된 next 는 400
+# Firestore 쿼리(where / select / order_by / limit / start_after)를 메모리에서 흉내 내는 가짜 컬렉션으로 돌린다.
+
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.firestore_service import DOCTOR_DIRECTORY_FIELDS, list_doctors_page
+from app.services.session_service import issue_token
+from tests.conftest import HOSPITAL_ID, bearer
+
+client = TestClient(app)
+
+
+class FakeQuery:
+    def __init__(self, docs, filters=(), fields=None, limit=None, after=None):
+        self._docs = docs
+        self._filters = filters
+        self._fields = fields
+        self._limit = limit
+        self._after = after
+
+    def _with(self, **changes):
+        state = dict(filters=self._filters, fields=self._fields, limit=self._limit, after=self._after)
+        state.update(changes)
+        return FakeQuery(self._docs, **state)
+
+    def where(self, field, op, value):
+        assert op == "=="
+        return self._with(filters=self._filters + ((field, value),))
+
+    def select(self, fields):
+        return self._with(fields=list(fields))
+
+    def order_by(self, field):
+        assert field == "__name__"
+        return self
+
+    def limit(self, count):
+        return self._with(limit=count)
+
+    def start_after(self, cursor):
+        return self._with(after=cursor["__name__"].id)
+
+    def stream(self):
+        rows = sorted(
+            (doc_id, data) for doc_id, data in self._docs.items()
+            if all(data.get(field) == value for field, value in self._filters)
+        )
+        if self._after is not None:
+            rows = [row for row in rows if row[0] > self._after]
+        for doc_id, data in rows[:self._limit]:
+            doc = mock.Mock(id=doc_id)
+            doc.to_dict.return_value = {k: v for k, v in data.items() if self._fields is None or k in self._fields}
+            yield doc
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id):
+        if not doc_id or "/" in doc_id:
+            raise ValueError("A document must have an even number of path elements")
+        return mock.Mock(id=doc_id)
+
+
+def _doctor(name, hospital_id=HOSPITAL_ID, department="내과"):
+    return {
+        "name": name, "hospital_id": hospital_id, "department": department,
+        "email": f"{name}@phc.kr", "contact": "010", "gender": "여",
+        "password": "$2b$12$secret", "bio": "소개", "availability": {"mon": "09-18"},
+    }
+
+
+@pytest.fixture
+def doctors(firestore):
+    docs = {f"LIC-{i:03d}": _doctor(f"의사{i}", department="내과" if i % 2 else "외과") for i in range(5)}
+    docs.update({f"LIC-9{i:02d}": _doctor(f"타보건소{i}", hospital_id=HOSPITAL_ID + 1) for i in range(3)})
+    firestore.collection.return_value = FakeCollection(docs)
+    return docs
+
+
+def test_page_is_scoped_projected_and_paged(doctors):
+    first, token = list_doctors_page(HOSPITAL_ID, limit=3)
+    assert [d["license_number"] for d in first] == ["LIC-000", "LIC-001", "LIC-002"]
+    assert token == "LIC-002"
+    assert all(set(d) == set(DOCTOR_DIRECTORY_FIELDS) | {"license_number"} for d in first)
+
+    second, token = list_doctors_page(HOSPITAL_ID, limit=3, next_token=token)
+    assert [d["license_number"] for d in second] == ["LIC-003", "LIC-004"]
+    assert token is None
+
+    assert [d["license_number"] for d in list_doctors_page(HOSPITAL_ID, department="외과")[0]] == [
+        "LIC-000", "LIC-002", "LIC-004",
+    ]
+
+
+@pytest.mark.parametrize("token", ["a/b", "/", "LIC-001/", "a//b", "..", "__name__"])
+def test_malformed_next_token_is_rejected(doctors, token):
+    with pytest.raises(ValueError):
+        list_doctors_page(HOSPITAL_ID, next_token=token)
+
+
+def test_api_uses_session_hospital_and_pages(doctors, admin_token):
+    other_admin = issue_token(HOSPITAL_ID + 1, "admin")
+
+    response = client.get("/api/admin/employees?limit=3&hospital_id=2", headers=bearer(admin_token))
+    body = response.json()
+    assert [d["license_number"] for d in body["data"]] == ["LIC-000", "LIC-001", "LIC-002"]
+    assert not {"password", "bio", "availability", "hospital_id"} & set().union(*body["data"])
+
+    response = client.get("/api/admin/employees", params={"limit": 3, "next": body["next"]}, headers=bearer(admin_token))
+    assert [d["license_number"] for d in response.json()["data"]] == ["LIC-003", "LIC-004"]
+    assert response.json()["next"] is None
+
+    response = client.get("/api/admin/employees", headers=bearer(other_admin))
+    assert [d["name"] for d in response.json()["data"]] == ["타보건소0", "타보건소1", "타보건소2"]
+
+
+def test_html_page_uses_session_hospital_and_links_next_page(doctors, admin_token, monkeypatch):
+    monkeypatch.setattr("app.api.admin_routes.DIRECTORY_PAGE_SIZE", 3)
+
+    page = client.get("/admin/employees", headers=bearer(admin_token))
+    assert page.status_code == 200
+    assert "의사2" in page.text and "의사3" not in page.text and "타보건소" not in page.text
+    assert "$2b$12$secret" not in page.text and "소개" not in page.text
+    assert "/admin/employees?next=LIC-002" in page.text
+
+    page = client.get("/admin/employees?next=LIC-002", headers=bearer(admin_token))
+    assert "의사3" in page.text and "의사4" in page.text and "의사2" not in page.text
+    assert "다음 페이지" not in page.text
+
+
+@pytest.mark.parametrize("path", ["/api/admin/employees", "/admin/employees"])
+def test_malformed_next_is_400_not_500(doctors, admin_token, path):
+    response = client.get(path, params={"next": "LIC-001/doctors"}, headers=bearer(admin_token))
+    assert response.status_code == 400
@@ -0,0 +1,66 @@
+# tests/test_auth.py
+# 🔐 로그인 세션 / 처방 저장 시 의사 식별
+
+from fastapi.testclient import TestClient
+
+from app.api.auth_routes import _safe_next
+from app.main import app
+from app.services.auth_service import _doctor_number
+from app.services.session_service import issue_token, verify_token
+from tests.conftest import DOCTOR_ID, HOSPITAL_ID, bearer
+
+client = TestClient(app)
+
+BATCH_BODY = {
+    "patient_id": "p-1",
+    "disease_code": "J00",
+    "items": [{"medication_code": "M1", "days": 3}],
+}
+
+
+def test_doctor_number_prefers_numeric_doctor_id():
+    assert _doctor_number({"doctor_id": 42, "license_number": "LIC-7"}) == 42
+    assert _doctor_number({"doctor_id": "42"}) == 42
+    assert _doctor_number({"license_number": "1234567"}) == 1234567
+    assert _doctor_number({"license_number": "LIC-7"}) is None
+    assert _doctor_number({"doctor_id": True}) is None
+
+
+def test_session_claim_keeps_numeric_doctor_id_and_license():
+    claims = verify_token(issue_token(HOSPITAL_ID, "doctor", doctor_id="1001", license_number="LIC-1001"))
+    assert claims["did"] == 1001
+    assert claims["lic"] == "LIC-1001"
+
+
+def test_batch_writes_session_doctor_id_not_body(aws, doctor_token):
+    body = dict(BATCH_BODY, doctor_id=999)
+    response = client.post("/api/prescription/batch", json=body, headers=bearer(doctor_token))
+    assert response.status_code == 200
+    prescription_id = response.json()["data"]["prescription_id"]
+
+    item = aws.Table("prescription_records").get_item(Key={"prescription_id": prescription_id})["Item"]
+    assert item["doctor_id"] == DOCTOR_ID
+    diagnosis = aws.Table("diagnosis_records").get_item(Key={"diagnosis_id": item["diagnosis_id"]})["Item"]
+    assert diagnosis["doctor_id"] == DOCTOR_ID
+
+
+def test_batch_rejects_doctor_without_number(aws):
+    token = issue_token(HOSPITAL_ID, "doctor", license_number="LIC-7")
+    response = client.post("/api/prescription/batch", json=BATCH_BODY, headers=bearer(token))
+    assert response.status_code == 403
+    assert aws.Table("prescription_records").scan()["Count"] == 0
+
+
+def test_safe_next_allows_only_same_site_paths():
+    assert _safe_next("/doctor/consultation?tab=1") == "/doctor/consultation?tab=1"
+    for unsafe in (
+        None, "", "doctor", "//evil.com", "/\\evil.com", "/\\/evil.com", "\\\\evil.com",
+        "/\t/evil.com", "/\n/evil.com", "/\x00", "https://evil.com",
+    ):
+        assert _safe_next(unsafe) is None, unsafe
+
+
+def test_login_page_drops_backslash_next():
+    response = client.get("/login", params={"next": "/\\evil.com"})
+    assert response.status_code == 200
+    assert "evil.com" not in response.text
@@ -0,0 +1,89 @@
+# tests/test_call_state.py
+# 📞 통화 상태 변경 실패 시 부분 반영 여부 (CallStateError.partial)
+
+import pytest
+
+from app.services import call_state_service
+from app.utils.exceptions import CallStateError
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    failures = {}
+
+    def rtdb_update(paths):
+        if "rtdb" in failures:
+            raise failures["rtdb"]
+
+    monkeypatch.setattr(call_state_service, "ensure_firebase", lambda: None)
+    monkeypatch.setattr(call_state_service, "_rtdb_update", rtdb_update)
+    monkeypatch.setattr(call_state_service, "_is_not_found", lambda error: False)
+    return failures
+
+
+def _firestore_write(failures):
+    def write():
+        if "firestore" in failures:
+            raise failures["firestore"]
+    return write
+
+
+def _error(failures, rtdb_paths) -> CallStateError:
+    with pytest.raises(CallStateError) as info:
+        call_state_service._apply("room-1", "start" if rtdb_paths else "text", rtdb_paths, _firestore_write(failures))
+    return info.value
+
+
+def test_firestore_only_transition_is_not_partial(stores):
+    stores["firestore"] = RuntimeError("unavailable")
+    error = _error(stores, None)
+    assert error.attempted == {"firestore"}
+    assert not error.partial
+    assert error.to_dict()["message"] == "통화 상태 변경 실패"
+
+
+def test_two_store_transition_with_one_failure_is_partial(stores):
+    stores["rtdb"] = RuntimeError("rtdb down")
+    error = _error(stores, {"calls/room-1/status": "accepted"})
+    assert error.attempted == {"rtdb", "firestore"}
+    assert error.partial
+    assert error.to_dict()["failed"] == ["rtdb"]
+
+
+def test_two_store_transition_with_both_failures_is_not_partial(stores):
+    stores["rtdb"] = RuntimeError("rtdb down")
+    stores["firestore"] = RuntimeError("firestore down")
+    error = _error(stores, {"calls/room-1/status": "accepted"})
+    assert not error.partial
+
+
+@pytest.fixture
+def rtdb(monkeypatch):
+    writes = {"update": [], "delete": []}
+    monkeypatch.setattr(call_state_service, "ensure_firebase", lambda: None)
+    monkeypatch.setattr(call_state_service, "_rtdb_update", lambda paths: writes["update"].append(dict(paths)))
+    monkeypatch.setattr(call_state_service, "_rtdb_delete", lambda paths: writes["delete"].append(list(paths)))
+    monkeypatch.setattr(call_state_service, "_is_not_found", lambda error: isinstance(error, LookupError))
+    return writes
+
+
+def _missing_room():
+    raise LookupError("no such call")
+
+
+def test_missing_room_rollback_deletes_keys_without_prior_value(rtdb):
+    with pytest.raises(CallStateError) as info:
+        call_state_service._apply("room-1", "start", {"calls/room-1/status": "accepted"}, _missing_room)
+    assert info.value.not_found
+    # 상태값을 보낸 update 한 번뿐, None 을 쓰는 update 는 없고 키를 지움
+    assert rtdb["update"] == [{"calls/room-1/status": "accepted"}]
+    assert rtdb["delete"] == [["calls/room-1/status"]]
+
+
+def test_missing_room_rollback_restores_known_prior_value(rtdb):
+    paths = {"calls/room-1/status": "ended", "calls/room-1/ended_by": "doctor"}
+    with pytest.raises(CallStateError):
+        call_state_service._apply("room-1", "end", paths, _missing_room, rtdb_previous={"calls/room-1/status": "accepted"})
+    assert rtdb["update"] == [paths, {"calls/room-1/status": "accepted"}]
+    assert rtdb["delete"] == [["calls/room-1/ended_by"]]
+    assert all(None not in update.values() for update in rtdb["update"])
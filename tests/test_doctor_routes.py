@@ -0,0 +1,67 @@
+# tests/test_doctor_routes.py
+# 🩺 의사 화면: 영상 진료 화면은 실제 진료 신청 기준
+
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.care_request_service import waiting_fields
+from tests.conftest import DOCTOR_ID, HOSPITAL_ID, bearer
+
+client = TestClient(app)
+
+
+def _patient_doc(patient_id: str, **data):
+    doc = mock.Mock(id=patient_id, exists=True)
+    doc.to_dict.return_value = data
+    return doc
+
+
+def _put_request(aws, request_id: int, **fields):
+    item = {"request_id": request_id, "department": "내과", "is_solved": False, **fields}
+    aws.Table("care_requests").put_item(Item=dict(item, **waiting_fields(item)))
+
+
+def test_video_call_renders_real_patient(aws, firestore, doctor_token):
+    _put_request(aws, 501, patient_id="p-501", doctor_id=DOCTOR_ID, hospital_id=HOSPITAL_ID, symptom_type=["기침"])
+    firestore.get_all.return_value = [_patient_doc("p-501", name="김환자", birth_date="900101", gender="여")]
+
+    response = client.get("/doctor/video-call/501", headers=bearer(doctor_token))
+    assert response.status_code == 200
+    assert '"p-501"' in response.text
+    assert "김환자" in response.text
+
+
+def test_video_call_without_patient_id_is_404(aws, firestore, doctor_token):
+    _put_request(aws, 502, doctor_id=DOCTOR_ID)
+    response = client.get("/doctor/video-call/502", headers=bearer(doctor_token))
+    assert response.status_code == 404
+
+
+def test_video_call_unknown_or_other_doctor_is_404(aws, firestore, doctor_token):
+    _put_request(aws, 503, patient_id="p-503", doctor_id=DOCTOR_ID + 1)
+    firestore.get_all.return_value = [_patient_doc("p-503", name="다른환자")]
+
+    for consultation_id in ("503", "999", "c123"):
+        response = client.get(f"/doctor/video-call/{consultation_id}", headers=bearer(doctor_token))
+        assert response.status_code == 404, consultation_id
+
+
+def test_video_call_requires_session_hospital(aws, firestore, doctor_token):
+    firestore.get_all.return_value = [_patient_doc("p-510", name="환자")]
+    # 보건소가 없거나 다른 보건소면 담당 의사가 없어도 / 본인이어도 404
+    _put_request(aws, 510, patient_id="p-510")
+    _put_request(aws, 511, patient_id="p-510", hospital_id=HOSPITAL_ID + 1)
+    _put_request(aws, 512, patient_id="p-510", doctor_id=DOCTOR_ID)
+    _put_request(aws, 513, patient_id="p-510", doctor_id=DOCTOR_ID, hospital_id=HOSPITAL_ID + 1)
+    # 같은 보건소의 아직 배정되지 않은 신청은 볼 수 있음
+    _put_request(aws, 514, patient_id="p-510", hospital_id=HOSPITAL_ID)
+
+    for consultation_id in ("510", "511", "512", "513"):
+        response = client.get(f"/doctor/video-call/{consultation_id}", headers=bearer(doctor_token))
+        assert response.status_code == 404, consultation_id
+        response = client.post("/doctor/video-call/json", json={"consultation_id": consultation_id}, headers=bearer(doctor_token))
+        assert response.json()["status_code"] == 404, consultation_id
+
+    assert client.get("/doctor/video-call/514", headers=bearer(doctor_token)).status_code == 200
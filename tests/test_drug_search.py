@@ -0,0 +1,79 @@
+# tests/test_drug_search.py
+# 💊 의약품 자동완성 인덱스: 검색 종류별 순위, 변경 반영, 갱신 중에도 막히지 않는 검색
+
+import threading
+
+from app.services.drug_search import DrugSearchIndex
+
+CATALOG = [
+    {"drug_id": "D1", "name": "타이레놀정500mg"},
+    {"drug_id": "D2", "name": "타이레놀이알서방정"},
+    {"drug_id": "D3", "name": "어린이타이레놀현탁액"},
+    {"drug_id": "D4", "name": "아모잘탄정"},
+    {"drug_id": "D5", "name": "무코스타정"},
+]
+
+
+def _index(items=CATALOG):
+    index = DrugSearchIndex("drugs")
+    index.sync(items)
+    return index
+
+
+def _ids(results):
+    return [(r["drug_id"], r["match"]) for r in results]
+
+
+def test_search_ranks_prefix_initials_substring_and_fuzzy():
+    index = _index()
+    assert _ids(index.search("타이레놀", k=2)) == [("D2", "prefix"), ("D1", "prefix")]
+    assert _ids(index.search("ㅁㅋㅅㅌ")) == [("D5", "initials")]
+    assert ("D3", "substring") in _ids(index.search("타이레놀"))
+    assert _ids(index.search("아모잘탄정")) == [("D4", "exact")]
+    assert _ids(index.search("아모질탄")) == [("D4", "fuzzy")]
+
+
+def test_sync_applies_only_changes_and_keeps_old_snapshot_intact():
+    index = _index()
+    before = index._snapshot
+
+    changed = index.sync([
+        {"drug_id": "D1", "name": "타이레놀정500mg", "price": 100},  # 내용만 바뀜
+        {"drug_id": "D2", "name": "펠루비정"},                        # 이름이 바뀜
+        {"drug_id": "D4", "name": "아모잘탄정"},
+        {"drug_id": "D5", "name": "무코스타정"},
+        {"drug_id": "D6", "name": "알마겔정"},                        # 새 항목 (D3 은 빠짐)
+    ])
+    assert changed == 4
+    assert len(index) == 5
+    assert [r["item"].get("price") for r in index.search("타이레놀정")] == [100]
+    assert _ids(index.search("펠루비")) == [("D2", "prefix")]
+    assert index.search("어린이") == []
+    assert _ids(index.search("ㅇㅁㄱ")) == [("D6", "initials")]
+
+    # 이전 스냅샷은 그대로 (검색 중이던 요청은 끝까지 같은 내용을 봄)
+    assert set(before.entries) == {"D1", "D2", "D3", "D4", "D5"}
+    assert before.entries["D2"].name == "타이레놀이알서방정"
+    assert [key for key, _ in before.by_jamo] == sorted(key for key, _ in before.by_jamo)
+
+
+def test_upsert_and_remove_keep_sorted_keys_consistent():
+    index = _index()
+    index.upsert({"drug_id": "D7", "name": "가스모틴정"})
+    index.remove("D4")
+    snapshot = index._snapshot
+    assert snapshot.by_jamo == sorted((e.jamo, e.drug_id) for e in snapshot.entries.values())
+    assert snapshot.by_initials == sorted((e.initials, e.drug_id) for e in snapshot.entries.values())
+    assert all(drug_id != "D4" for ids in snapshot.grams.values() for drug_id in ids)
+    assert _ids(index.search("가스")) == [("D7", "prefix")]
+
+
+def test_search_does_not_wait_for_writer():
+    index = _index()
+    results = []
+    with index._write_lock:  # 갱신 중인 상태
+        thread = threading.Thread(target=lambda: results.append(index.search("무코")))
+        thread.start()
+        thread.join(timeout=2)
+        assert not thread.is_alive()
+    assert _ids(results[0]) == [("D5", "prefix")]
@@ -0,0 +1,107 @@
+# tests/test_dynamodb_service.py
+# 🗄 DynamoDB 조회 도우미 (커서 페이지, 세그먼트 병렬 scan)
+
+import base64
+import json
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr
+from fastapi.testclient import TestClient
+
+from app.services.dynamodb_service import decode_cursor, encode_cursor, parallel_scan, scan_page
+from app.test_api import app as api_app
+
+test_client = TestClient(api_app)
+
+
+def _fill(aws, count: int):
+    table = aws.Table("diagnosis_records")
+    with table.batch_writer() as batch:
+        for diagnosis_id in range(1, count + 1):
+            batch.put_item(Item={"diagnosis_id": diagnosis_id, "patient_id": f"p{diagnosis_id}", "diagnosed_at": "2025-05-01"})
+    return table
+
+
+def test_cursor_round_trip_keeps_key_types():
+    key = {"diagnosis_id": 237580774966468608, "big": Decimal("12345678901234567890.5"), "patient_id": "p@x.com"}
+    token = encode_cursor(key)
+    assert "=" not in token
+    assert decode_cursor(token) == key
+    assert encode_cursor(None) is None
+
+
+def _forged(key) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+FORGED_NUMBERS = [{"diagnosis_id": {"$n": value}} for value in ("abc", "", "NaN", "Infinity", 5, [1])]
+
+
+@pytest.mark.parametrize("token", ["not-base64!!", "WzEsMl0", ""] + [_forged(key) for key in FORGED_NUMBERS])
+def test_decode_cursor_rejects_garbage(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_scan_page_walks_whole_table_once(aws):
+    table = _fill(aws, 7)
+    seen, token, pages = [], None, 0
+    while True:
+        items, token = scan_page(table, 3, token)
+        seen.extend(item["diagnosis_id"] for item in items)
+        pages += 1
+        if token is None:
+            break
+    assert sorted(seen) == list(range(1, 8))
+    assert pages == 3
+
+
+def test_list_endpoint_returns_next_token_and_rejects_bad_one(aws):
+    _fill(aws, 5)
+    first = test_client.get("/test/diagnosis-records", params={"limit": 3}).json()
+    second = test_client.get("/test/diagnosis-records", params={"limit": 3, "next": first["next"]}).json()
+    ids = [item["diagnosis_id"] for item in first["diagnosis_records"] + second["diagnosis_records"]]
+    assert sorted(ids) == [1, 2, 3, 4, 5]
+    assert second["next"] is None
+
+    assert test_client.get("/test/diagnosis-records", params={"limit": 3, "next": "%%%"}).status_code == 400
+    # 숫자 자리에 숫자가 아닌 값을 넣은 토큰 (decimal.InvalidOperation) 도 500 이 아니라 400
+    forged = _forged({"diagnosis_id": {"$n": "abc"}})
+    assert test_client.get("/test/diagnosis-records", params={"limit": 3, "next": forged}).status_code == 400
+
+
+def test_parallel_scan_merges_every_segment_and_applies_date_filter(aws):
+    days = [f"2025-05-{day:02d}" for day in range(1, 32)] + [f"2025-06-{day:02d}" for day in range(1, 10)]
+    table = aws.Table("diagnosis_records")
+    with table.batch_writer() as batch:
+        for diagnosis_id in range(1, 201):
+            batch.put_item(Item={"diagnosis_id": diagnosis_id, "diagnosed_at": days[diagnosis_id % len(days)]})
+
+    segments = {}
+
+    def remember_segment(params, context, **_):
+        context["segment"] = params.get("Segment")
+
+    def count_segment(parsed, context, **_):
+        segments[context["segment"]] = segments.get(context["segment"], 0) + parsed.get("ScannedCount", 0)
+
+    events = aws.meta.client.meta.events
+    events.register("before-parameter-build.dynamodb.Scan", remember_segment, unique_id="test-segment")
+    events.register("after-call.dynamodb.Scan", count_segment, unique_id="test-segment-count")
+    try:
+        condition = Attr("diagnosed_at").gte("2025-05-10") & Attr("diagnosed_at").lt("2025-06-01")
+        # Limit 로 세그먼트마다 여러 페이지가 되게 해서 페이지 이어 읽기도 같이 확인
+        rows = list(parallel_scan(table, total_segments=4, FilterExpression=condition, Limit=10))
+    finally:
+        events.unregister("before-parameter-build.dynamodb.Scan", unique_id="test-segment")
+        events.unregister("after-call.dynamodb.Scan", unique_id="test-segment-count")
+
+    expected = {i for i in range(1, 201) if "2025-05-10" <= days[i % len(days)] < "2025-06-01"}
+    ids = [row["diagnosis_id"] for row in rows]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == expected
+    # 네 세그먼트 모두 읽었고, 합치면 테이블 전체를 한 번씩 훑음
+    assert set(segments) == {0, 1, 2, 3}
+    assert all(segments.values())
+    assert sum(segments.values()) == 200
@@ -0,0 +1,95 @@
+# tests/test_export.py
+# 📤 진료 기록 내보내기는 관리자 세션 + 허용된 테이블만, 관리자 보건소 것만
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.session_service import issue_token
+from app.test_api import app as api_app
+from tests.conftest import HOSPITAL_ID, bearer
+
+client = TestClient(api_app)
+main_client = TestClient(app)
+
+
+def test_export_requires_admin_session(aws, doctor_token):
+    assert client.get("/test/export/diagnosis_records").status_code == 401
+    assert client.get("/test/export/diagnosis_records", headers=bearer(doctor_token)).status_code == 403
+
+
+def test_export_only_allow_listed_tables(aws, admin_token):
+    response = client.get("/test/export/hospitals", headers=bearer(admin_token))
+    assert response.status_code == 404
+
+
+def test_export_care_requests_only_for_admin_center(aws, admin_token):
+    table = aws.Table("care_requests")
+    table.put_item(Item={"request_id": 1, "hospital_id": HOSPITAL_ID, "department": "내과", "patient_id": "own"})
+    table.put_item(Item={"request_id": 2, "hospital_id": HOSPITAL_ID + 1, "department": "내과", "patient_id": "other"})
+
+    response = client.get("/test/export/care_requests", params={"format": "ndjson"}, headers=bearer(admin_token))
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines() if line]
+    assert [row["patient_id"] for row in rows] == ["own"]
+
+
+def _seed_records(aws):
+    diagnoses = aws.Table("diagnosis_records")
+    prescriptions = aws.Table("prescription_records")
+    for record_id, hospital_id, patient_id in ((1, HOSPITAL_ID, "own"), (2, HOSPITAL_ID + 1, "other"), (3, None, "legacy")):
+        scope = {} if hospital_id is None else {"hospital_id": hospital_id}
+        diagnoses.put_item(Item={
+            "diagnosis_id": record_id, "patient_id": patient_id, "diagnosed_at": "2025-05-01 10:00:00", **scope,
+        })
+        prescriptions.put_item(Item={
+            "prescription_id": record_id, "diagnosis_id": record_id, "patient_id": patient_id,
+            "prescribed_at": "2025-05-01 10:00:00", **scope,
+        })
+
+
+def _export(table_name, token, **params):
+    response = client.get(f"/test/export/{table_name}", params={"format": "ndjson", **params}, headers=bearer(token))
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_export_diagnosis_and_prescriptions_exclude_other_centers(aws, admin_token):
+    _seed_records(aws)
+    assert [row["patient_id"] for row in _export("diagnosis_records", admin_token)] == ["own"]
+    assert [row["diagnosis_id"] for row in _export("prescription_records", admin_token)] == [1]
+
+
+def test_saved_consultation_is_exported_only_to_its_center(aws, doctor_token, admin_token):
+    response = main_client.post("/api/prescription/batch", headers=bearer(doctor_token), json={
+        "patient_id": "p-1", "disease_code": "J00", "items": [{"medication_code": "M1", "days": 3}],
+    })
+    assert response.status_code == 200
+    assert [row["patient_id"] for row in _export("diagnosis_records", admin_token)] == ["p-1"]
+    assert len(_export("prescription_records", admin_token)) == 1
+    other_admin = issue_token(HOSPITAL_ID + 1, "admin")
+    assert _export("diagnosis_records", other_admin) == []
+    assert _export("prescription_records", other_admin) == []
+
+
+def test_export_date_range_is_inclusive(aws, admin_token):
+    table = aws.Table("diagnosis_records")
+    for diagnosis_id, diagnosed_at in enumerate(("2025-04-30 23:59:59", "2025-05-01 00:00:00", "2025-05-31 23:59:59", "2025-06-01 00:00:00"), 1):
+        table.put_item(Item={"diagnosis_id": diagnosis_id, "hospital_id": HOSPITAL_ID, "diagnosed_at": diagnosed_at})
+    rows = _export("diagnosis_records", admin_token, date_from="2025-05-01", date_to="2025-05-31")
+    assert sorted(row["diagnosis_id"] for row in rows) == [2, 3]
+
+
+def test_backfill_scopes_legacy_records_by_doctor(aws):
+    from scripts.backfill_hospital_id import backfill
+
+    table = aws.Table("diagnosis_records")
+    table.put_item(Item={"diagnosis_id": 1, "doctor_id": 1001, "diagnosed_at": "2025-05-01"})
+    table.put_item(Item={"diagnosis_id": 2, "doctor_id": 9999, "diagnosed_at": "2025-05-01"})
+    table.put_item(Item={"diagnosis_id": 3, "doctor_id": 1001, "hospital_id": 7, "diagnosed_at": "2025-05-01"})
+
+    counts = backfill("diagnosis_records", "diagnosis_id", {1001: HOSPITAL_ID}, dry_run=False)
+    assert counts["updated"] == 1 and counts["unknown_doctor"] == 1
+    hospitals = {item["diagnosis_id"]: item.get("hospital_id") for item in table.scan()["Items"]}
+    assert hospitals == {1: HOSPITAL_ID, 2: None, 3: 7}
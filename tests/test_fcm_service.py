@@ -0,0 +1,87 @@
+# tests/test_fcm_service.py
+# 📲 FCM 일괄 발송: send_each 청크 / 무효 토큰 정리 / 일시 오류 재시도 (messaging.send_each 는 가짜)
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+from firebase_admin import exceptions, messaging
+
+from app.services import fcm_service
+
+# 설치된 SDK 버전에 따라 Message.token 사용 경고가 나옴 (발송 경로는 그대로)
+pytestmark = pytest.mark.filterwarnings("ignore:Message.token is deprecated:DeprecationWarning")
+
+
+class FakeSendEach:
+    def __init__(self, failures=None):
+        # token → 돌려줄 예외 목록 (호출마다 하나씩 꺼내고, 비면 성공)
+        self.failures = failures or {}
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, messages, dry_run=False):
+        with self._lock:
+            self.batches.append([message.token for message in messages])
+        responses = []
+        for message in messages:
+            errors = self.failures.get(message.token)
+            if errors:
+                responses.append(messaging.SendResponse(None, errors.pop(0)))
+            else:
+                responses.append(messaging.SendResponse({"name": f"projects/p/messages/{message.token}"}, None))
+        return SimpleNamespace(responses=responses)
+
+
+@pytest.fixture
+def send_each(monkeypatch):
+    fake = FakeSendEach()
+    monkeypatch.setattr(messaging, "send_each", fake)
+    monkeypatch.setattr(fcm_service, "ensure_firebase", lambda: None)
+    monkeypatch.setattr(fcm_service.time, "sleep", lambda seconds: None)
+    fcm_service._invalid_tokens.clear()
+    return fake
+
+
+def test_recipients_are_sent_in_send_each_sized_chunks(send_each):
+    recipients = [{"token": f"t{i}"} for i in range(1201)]
+    result = fcm_service.send_push_notifications(recipients, title="진료 알림", body="곧 시작합니다")
+
+    assert sorted(len(batch) for batch in send_each.batches) == [201, 500, 500]
+    assert result["success_count"] == 1201
+    # 결과는 청크가 동시에 끝나도 recipients 순서 그대로
+    assert [r["token"] for r in result["results"]] == [r["token"] for r in recipients]
+
+
+def test_invalid_tokens_are_reported_and_skipped_next_time(send_each):
+    send_each.failures = {
+        "gone": [messaging.UnregisteredError("Requested entity was not found.")],
+        "bad": [exceptions.InvalidArgumentError("The registration token is not a valid FCM registration token")],
+    }
+    recipients = [{"token": "ok"}, {"token": "gone"}, {"token": "bad"}]
+
+    first = fcm_service.send_push_notifications(recipients, title="t")
+    assert first["invalid_tokens"] == ["gone", "bad"]
+    assert first["success_count"] == 1
+
+    send_each.batches.clear()
+    second = fcm_service.send_push_notifications(recipients, title="t")
+    assert send_each.batches == [["ok"]]
+    assert second["invalid_tokens"] == ["gone", "bad"]
+
+
+def test_transient_errors_are_retried_only_for_failed_messages(send_each):
+    send_each.failures = {"slow": [exceptions.UnavailableError("backend unavailable")]}
+    result = fcm_service.send_push_notifications([{"token": "ok"}, {"token": "slow"}], title="t")
+
+    assert send_each.batches == [["ok", "slow"], ["slow"]]
+    assert result["success_count"] == 2
+
+
+def test_transient_errors_after_last_retry_are_marked(send_each):
+    send_each.failures = {"down": [exceptions.UnavailableError("unavailable")] * 3}
+    result = fcm_service.send_push_notifications([{"token": "down"}], title="t", max_retries=2)
+
+    assert len(send_each.batches) == 3
+    assert result["results"][0]["transient"] is True
+    assert result["invalid_tokens"] == []
@@ -0,0 +1,87 @@
+# tests/test_firestore_service.py
+# 👤 대기 목록 환자 정보: 요청마다 한 명씩 읽지 않고 get_all 배치 + 짧은 캐시
+
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services import firestore_service
+from app.services.care_request_service import waiting_fields
+from app.services.firestore_service import PATIENT_BATCH_SIZE, get_patients_by_ids
+from app.test_api import app as api_app
+from tests.conftest import DOCTOR_ID
+
+client = TestClient(api_app)
+
+
+def _get_all(refs):
+    for ref in refs:
+        doc = mock.Mock(id=ref.id, exists=not ref.id.startswith("missing"))
+        doc.to_dict.return_value = {"name": f"name-{ref.id}", "birth_date": "900101"}
+        yield doc
+
+
+@pytest.fixture
+def patients(firestore):
+    firestore_service._patient_cache.clear()
+    firestore.collection.return_value.document.side_effect = lambda pid: mock.Mock(id=pid)
+    firestore.get_all.side_effect = _get_all
+    yield firestore
+    firestore_service._patient_cache.clear()
+
+
+def test_repeated_ids_are_fetched_once_in_batches(patients):
+    ids = [f"p{i % 121}" for i in range(250)] + ["missing-1"]
+    found = get_patients_by_ids(ids)
+
+    assert len(found) == 121
+    batch_sizes = [len(call.args[0]) for call in patients.get_all.call_args_list]
+    assert batch_sizes == [PATIENT_BATCH_SIZE, 122 - PATIENT_BATCH_SIZE]
+
+
+def test_cache_serves_the_next_request_including_missing(patients):
+    get_patients_by_ids(["p1", "p2", "missing-1"])
+    patients.get_all.reset_mock()
+
+    assert set(get_patients_by_ids(["p1", "p2", "missing-1"])) == {"p1", "p2"}
+    patients.get_all.assert_not_called()
+
+
+def _put_requests(table, requests):
+    with table.batch_writer() as batch:
+        for item in requests:
+            batch.put_item(Item=dict(item, **waiting_fields(item)))
+
+
+def test_waiting_list_uses_one_query_and_batched_hydration(aws, patients, dynamodb_calls):
+    _put_requests(aws.Table("care_requests"), [
+        {
+            "request_id": request_id, "doctor_id": DOCTOR_ID, "patient_id": f"p{request_id % 121}",
+            "department": "내과", "is_solved": False,
+        }
+        for request_id in range(250)
+    ] + [
+        # 같은 의사의 해결된 신청 (희소 인덱스에 없으므로 읽지 않음)
+        {"request_id": 1000 + i, "doctor_id": DOCTOR_ID, "patient_id": f"solved{i}", "is_solved": True}
+        for i in range(100)
+    ] + [{"request_id": 999, "doctor_id": DOCTOR_ID + 1, "patient_id": "p1", "is_solved": False}])
+    counts = []
+    aws.meta.client.meta.events.register(
+        "after-call.dynamodb.Query",
+        lambda parsed, **_: counts.append((parsed["ScannedCount"], parsed["Count"])),
+        unique_id="tests-query-counts",
+    )
+    dynamodb_calls.clear()
+
+    response = client.get("/test/care-requests/waiting", params={"doctor_id": DOCTOR_ID})
+    assert response.status_code == 200
+    assert len(response.json()["waiting_list"]) == 250
+    # 대기 신청 GSI 로 Query (테이블 scan 없음), 훑은 수 == 반환 수, 환자는 121명 → get_all 2번
+    assert "Scan" not in dynamodb_calls and dynamodb_calls.count("Query") == 1
+    assert counts == [(250, 250)]
+    assert patients.get_all.call_count == 2
+
+    patients.get_all.reset_mock()
+    client.get("/test/care-requests/waiting", params={"doctor_id": DOCTOR_ID})
+    patients.get_all.assert_not_called()
@@ -0,0 +1,69 @@
+# tests/test_gsi_queries.py
+# 🔎 필터 조회가 테이블 크기가 아니라 결과 크기만큼 읽는지 (moto + 요청 단위 집계)
+# moto 는 ConsumedCapacity 를 항상 1 로 돌려주므로 DynamoDB 가 훑은 아이템 수(ScannedCount)로 비교
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import metrics
+from app.services.care_request_service import waiting_fields
+from app.test_api import app as api_app
+from app.utils.request_profile import RouteProfiles
+from tests.conftest import DOCTOR_ID
+
+client = TestClient(api_app)
+
+TABLE_SIZE = 600
+
+
+@pytest.fixture
+def profiles(monkeypatch):
+    routes = RouteProfiles(log_interval=0)
+    monkeypatch.setattr(metrics, "route_profiles", routes)
+    return routes
+
+
+def _route(profiles, path: str) -> dict:
+    return next(row for row in profiles.top(50) if row["route"] == path)
+
+
+@pytest.mark.parametrize("matching", [3, 30])
+def test_patient_history_reads_only_that_patients_records(aws, profiles, matching):
+    with aws.Table("diagnosis_records").batch_writer() as batch:
+        for diagnosis_id in range(TABLE_SIZE):
+            patient_id = "target" if diagnosis_id < matching else f"other{diagnosis_id}"
+            batch.put_item(Item={"diagnosis_id": diagnosis_id, "patient_id": patient_id, "diagnosed_at": f"2025-05-{diagnosis_id % 28 + 1:02d}"})
+
+    response = client.get("/test/diagnosis/patient/target")
+    assert len(response.json()["diagnosis_records"]) == matching
+
+    row = _route(profiles, "/test/diagnosis/patient/{patient_id}")
+    assert row["avg_dynamodb_scanned"] == matching
+    assert row["avg_dynamodb_returned"] == matching
+
+
+def test_waiting_list_reads_only_that_doctors_requests(aws, firestore, profiles):
+    firestore.get_all.return_value = []
+    with aws.Table("care_requests").batch_writer() as batch:
+        for request_id in range(TABLE_SIZE):
+            # 그 의사의 신청 100건 중 절반은 이미 해결됨
+            item = {
+                "request_id": request_id, "doctor_id": DOCTOR_ID if request_id < 100 else DOCTOR_ID + request_id,
+                "patient_id": f"p{request_id}", "is_solved": request_id % 2 == 0,
+            }
+            batch.put_item(Item=dict(item, **waiting_fields(item)))
+
+    client.get("/test/care-requests/waiting", params={"doctor_id": DOCTOR_ID})
+
+    row = _route(profiles, "/test/care-requests/waiting")
+    # 희소 GSI 에는 대기 중인 신청만 있으므로 그 의사의 대기 50건만 훑고 그대로 반환 (해결된 50건은 읽지 않음)
+    assert (row["avg_dynamodb_scanned"], row["avg_dynamodb_returned"]) == (50, 50)
+
+
+def test_full_table_listing_scans_everything_for_contrast(aws, profiles):
+    with aws.Table("diagnosis_records").batch_writer() as batch:
+        for diagnosis_id in range(TABLE_SIZE):
+            batch.put_item(Item={"diagnosis_id": diagnosis_id, "patient_id": "p", "diagnosed_at": "2025-05-01"})
+
+    client.get("/test/diagnosis-records")
+    assert _route(profiles, "/test/diagnosis-records")["avg_dynamodb_scanned"] == TABLE_SIZE
@@ -0,0 +1,66 @@
+# tests/test_id_generator.py
+# 🆔 worker 번호 임대 / 같은 ID 가 나와도 기존 기록을 덮어쓰지 않는지
+
+from unittest import mock
+
+import pytest
+
+from app.services import dynamodb_service, prescription_service
+from app.utils import id_generator
+from app.utils.id_generator import lease_worker_id
+
+
+def test_lease_gives_each_process_its_own_worker(tmp_path):
+    first = lease_worker_id(base=40, slots=2, lock_dir=str(tmp_path))
+    second = lease_worker_id(base=40, slots=2, lock_dir=str(tmp_path))
+    assert {first.worker_id, second.worker_id} == {40, 41}
+
+    # 슬롯을 다 쓰면 같은 번호를 나눠 쓰지 않고 기동 실패
+    with pytest.raises(RuntimeError):
+        lease_worker_id(base=40, slots=2, lock_dir=str(tmp_path))
+
+    # 잠금을 놓으면 (프로세스 종료) 다시 임대 가능
+    first.release()
+    assert lease_worker_id(base=40, slots=2, lock_dir=str(tmp_path)).worker_id == first.worker_id
+    second.release()
+
+
+def test_lease_rejects_out_of_range_worker(tmp_path):
+    with pytest.raises(ValueError):
+        lease_worker_id(base=1020, slots=8, lock_dir=str(tmp_path))
+
+
+def _ids(*values):
+    pending = iter(values)
+    return lambda: next(pending)
+
+
+def test_put_new_item_does_not_overwrite_on_collision(aws):
+    table = aws.Table("diagnosis_records")
+    table.put_item(Item={"diagnosis_id": 7, "patient_id": "first"})
+
+    with mock.patch.object(dynamodb_service, "next_id", _ids(7, 8)):
+        item = dynamodb_service.put_new_item(table, "diagnosis_id", lambda diagnosis_id: {
+            "diagnosis_id": diagnosis_id, "patient_id": "second",
+        })
+
+    assert item["diagnosis_id"] == 8
+    assert table.get_item(Key={"diagnosis_id": 7})["Item"]["patient_id"] == "first"
+    assert table.get_item(Key={"diagnosis_id": 8})["Item"]["patient_id"] == "second"
+
+
+def test_submit_consultation_retries_with_new_ids_on_collision(aws):
+    prescriptions = aws.Table("prescription_records")
+    prescriptions.put_item(Item={"prescription_id": 11, "patient_id": "existing"})
+
+    # 1차: 진단 10 / 처방 11(이미 있음) → 트랜잭션 전체 취소, 2차: 진단 12 / 처방 13
+    with mock.patch.object(prescription_service, "next_id", _ids(10, 11, 12, 13)):
+        result = prescription_service.submit_consultation(1001, 1, "p-1", "J00", [{"medication_code": "M1", "days": 3}])
+
+    assert (result["diagnosis_id"], result["prescription_id"], result["write_calls"]) == (12, 13, 2)
+    assert prescriptions.get_item(Key={"prescription_id": 11})["Item"]["patient_id"] == "existing"
+    assert "Item" not in aws.Table("diagnosis_records").get_item(Key={"diagnosis_id": 10})
+
+
+def test_next_id_uses_leased_worker():
+    assert id_generator.parse_id(id_generator.next_id())["worker_id"] == id_generator.worker_id()
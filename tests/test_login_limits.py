@@ -0,0 +1,81 @@
+# tests/test_login_limits.py
+# 🪣 로그인 시도 제한: 클라이언트 IP 판별 / IP · 보건소 버킷
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.api import deps
+from app.api.deps import client_ip
+from app.main import app
+from app.services import auth_service
+from app.utils.rate_limit import RateLimiter
+from tests.conftest import HOSPITAL_ID
+
+CENTER = "테스트보건소"
+
+
+def _request(peer: str, *forwarded: str) -> Request:
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({"type": "http", "headers": headers, "client": (peer, 5000)})
+
+
+def test_client_ip_ignores_forwarded_header_without_trusted_proxy():
+    assert client_ip(_request("10.0.0.1", "1.2.3.4"), trusted_hops=0) == "10.0.0.1"
+
+
+def test_client_ip_takes_rightmost_hop_not_client_supplied_value():
+    # 클라이언트가 "6.6.6.6" 을 넣어 보내면 프록시가 실제 주소를 오른쪽에 붙임
+    request = _request("10.0.0.1", "6.6.6.6, 203.0.113.7")
+    assert client_ip(request, trusted_hops=1) == "203.0.113.7"
+    assert client_ip(_request("10.0.0.1", "6.6.6.6", "203.0.113.7"), trusted_hops=1) == "203.0.113.7"
+    assert client_ip(_request("10.0.0.1", "6.6.6.6, 203.0.113.7, 10.1.1.1"), trusted_hops=2) == "203.0.113.7"
+
+
+def test_client_ip_falls_back_to_peer_when_header_is_short():
+    assert client_ip(_request("10.0.0.1"), trusted_hops=1) == "10.0.0.1"
+
+
+@pytest.fixture
+def limiters(monkeypatch):
+    # 버킷 크기를 작게 해서 몇 번만에 막히는지 확인
+    monkeypatch.setattr(auth_service, "ip_limiter", RateLimiter(rate=1e-6, burst=3))
+    monkeypatch.setattr(auth_service, "center_limiter", RateLimiter(rate=1e-6, burst=5))
+
+    async def hospital_id(name):
+        return HOSPITAL_ID
+
+    async def no_doctor(hospital_id, department):
+        return None
+
+    monkeypatch.setattr(auth_service, "get_hospital_id_by_name_async", hospital_id)
+    monkeypatch.setattr(auth_service, "get_doctor_by_id_and_department_async", no_doctor)
+
+
+def _login(ip: str) -> dict:
+    return asyncio.run(auth_service.process_login(CENTER, "doctor", "내과", "wrong", client_ip=ip))
+
+
+def test_center_bucket_applies_to_fresh_ips(limiters):
+    # 매번 처음 보는 IP 로 틀린 비밀번호 → 보건소 버킷(5)이 다 차면 새 IP 도 막힘
+    outcomes = [_login(f"10.9.0.{i}") for i in range(8)]
+    assert [bool(result.get("rate_limited")) for result in outcomes] == [False] * 5 + [True] * 3
+
+
+def test_spoofed_forwarded_for_does_not_reset_ip_bucket(limiters, monkeypatch):
+    monkeypatch.setattr(deps, "TRUSTED_PROXY_HOPS", 1)
+    monkeypatch.setattr(auth_service, "center_limiter", RateLimiter(rate=1e-6, burst=100))
+    client = TestClient(app)
+    statuses = []
+    for i in range(5):
+        response = client.post(
+            "/api/login/doctor",
+            json={"public_health_center": CENTER, "department": "내과", "password": "wrong"},
+            headers={"X-Forwarded-For": f"6.6.6.{i}, 203.0.113.7"},
+        )
+        statuses.append(response.status_code)
+    # IP 버킷(3) 은 프록시가 붙인 203.0.113.7 기준
+    assert statuses[3:] == [429, 429]
+    assert 429 not in statuses[:3]
@@ -0,0 +1,102 @@
+# tests/test_metrics.py
+# 📈 /metrics: 라벨은 요청 경로가 아니라 라우트 템플릿 / 5xx·예외는 오류 수에 / METRICS_TOKEN 이 있으면 Bearer 필요
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.api import metrics
+from app.api.metrics import UNMATCHED_ROUTE, MetricsMiddleware
+
+site = FastAPI()
+site.add_middleware(MetricsMiddleware, profiling=False)
+site.include_router(metrics.router)
+
+
+@site.get("/things/{thing_id}")
+async def get_thing(thing_id: int):
+    return {"thing_id": thing_id}
+
+
+@site.get("/things/{thing_id}/broken")
+async def broken_thing(thing_id: int):
+    raise RuntimeError("boom")
+
+
+@site.get("/things/{thing_id}/unavailable")
+async def unavailable_thing(thing_id: int):
+    raise HTTPException(status_code=503, detail="down")
+
+
+client = TestClient(site, raise_server_exceptions=False)
+
+
+def _samples(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def _scrape(**headers) -> dict:
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    return _samples(response.text)
+
+
+def _count(route: str, status: int) -> str:
+    return f'silmedy_http_request_duration_seconds_count{{method="GET",route="{route}",status="{status}"}}'
+
+
+def _errors(route: str, status: int) -> str:
+    return f'silmedy_http_request_errors_total{{method="GET",route="{route}",status="{status}"}}'
+
+
+def test_requests_are_labelled_by_route_template(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    before = _scrape()
+    for thing_id in (1, 2, 3):
+        assert client.get(f"/things/{thing_id}").status_code == 200
+    assert client.get("/nowhere/42").status_code == 404
+    after = _scrape()
+
+    key = _count("/things/{thing_id}", 200)
+    assert after[key] - before.get(key, 0) == 3
+    unmatched = _count(UNMATCHED_ROUTE, 404)
+    assert after[unmatched] - before.get(unmatched, 0) == 1
+    # 요청 경로 / id 는 라벨에 들어가지 않음 (시계열이 요청마다 늘지 않음)
+    assert not any("/things/1" in name or "/nowhere" in name for name in after)
+
+
+def test_5xx_and_unhandled_exceptions_are_counted_as_errors(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "")
+    before = _scrape()
+    assert client.get("/things/7/broken").status_code == 500
+    assert client.get("/things/7/unavailable").status_code == 503
+    assert client.get("/things/7").status_code == 200
+    after = _scrape()
+
+    for route, status in (("/things/{thing_id}/broken", 500), ("/things/{thing_id}/unavailable", 503)):
+        assert after[_errors(route, status)] - before.get(_errors(route, status), 0) == 1
+        assert after[_count(route, status)] - before.get(_count(route, status), 0) == 1
+    assert _errors("/things/{thing_id}", 200) not in after
+    assert after['silmedy_http_requests_in_flight{method="GET"}'] == 1  # 지금 받고 있는 /metrics 요청만
+
+
+@pytest.mark.parametrize("authorization, status", [
+    (None, 401),
+    ("Bearer wrong", 401),
+    ("secret-token", 401),
+    ("Bearer secret-token", 200),
+])
+def test_metrics_token_is_enforced(monkeypatch, authorization, status):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", "secret-token")
+    headers = {"Authorization": authorization} if authorization else {}
+    response = client.get("/metrics", headers=headers)
+    assert response.status_code == status
+    if status == 401:
+        assert response.headers["www-authenticate"] == "Bearer"
+        assert "silmedy_" not in response.text
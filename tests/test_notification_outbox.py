@@ -0,0 +1,152 @@
+# tests/test_notification_outbox.py
+# 📮 아웃박스: 상태 조회는 이벤트 루프 밖에서 (SQLite 카운트 + 발송 스레드와 같은 락),
+#    같은 알림 합치기 / 재시작 후 이어 보내기 / 일시 오류 재시도·영구 오류 폐기 / 임대 만료 건 다시 가져가기
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import notification_outbox as outbox_module
+from app.services.notification_outbox import CLAIM_LEASE, NotificationOutbox, notification_outbox
+
+client = TestClient(app)
+
+
+def test_stats_route_reads_outbox_on_blocking_pool(monkeypatch):
+    threads = []
+
+    def stats():
+        threads.append(threading.current_thread().name)
+        return {"pending": 0}
+
+    monkeypatch.setattr(notification_outbox, "stats", stats)
+    response = client.get("/api/stats/notifications")
+    assert response.status_code == 200
+    assert response.json()["data"] == {"pending": 0}
+    assert threads and threads[0].startswith("blocking-io")
+
+
+# ---------- 저장 / 발송 (워커 스레드 없이 _claim → _process 를 직접 돌림) ----------
+
+class FakeFCM:
+    def __init__(self):
+        self.sent = []
+        self.results = []   # 호출마다 앞에서부터 꺼내 쓸 결과 (없으면 성공)
+
+    def __call__(self, recipients, max_retries=0):
+        self.sent.append([recipient["token"] for recipient in recipients])
+        results = self.results.pop(0) if self.results else [{"success": True, "message_id": "m"}] * len(recipients)
+        if isinstance(results, Exception):
+            raise results
+        return {"results": results}
+
+
+@pytest.fixture
+def fcm(monkeypatch):
+    fake = FakeFCM()
+    monkeypatch.setattr(outbox_module, "send_push_notifications", fake)
+    return fake
+
+
+def _outbox(tmp_path, **kwargs) -> NotificationOutbox:
+    return NotificationOutbox(path=str(tmp_path / "outbox.sqlite3"), workers=0, **kwargs)
+
+
+def _drain(outbox: NotificationOutbox) -> int:
+    rows = outbox._claim(100)
+    if rows:
+        outbox._process(rows)
+    return len(rows)
+
+
+def _row(outbox: NotificationOutbox, notification_id: int) -> dict:
+    cursor = outbox._db().execute("SELECT * FROM notification_outbox WHERE id = ?", (notification_id,))
+    return dict(zip([column[0] for column in cursor.description], cursor.fetchone()))
+
+
+def _age(outbox: NotificationOutbox, column: str, seconds: float):
+    outbox._db().execute(f"UPDATE notification_outbox SET {column} = {column} - ?", (seconds,))
+
+
+def test_duplicate_inside_window_is_coalesced(tmp_path, fcm):
+    outbox = _outbox(tmp_path, coalesce_window=60)
+    first, coalesced = outbox.enqueue("tok", "진료 알림", "곧 시작합니다", {"room": 1})
+    assert not coalesced
+    # 대기 중인 같은 알림 (data 는 문자열로 맞춰서 비교)
+    assert outbox.enqueue("tok", "진료 알림", "곧 시작합니다", {"room": "1"}) == (first, True)
+    assert outbox.enqueue("tok", "진료 알림", "다른 내용")[1] is False
+
+    assert _drain(outbox) == 2
+    # 방금 보낸 같은 알림도 창 안에서는 다시 쌓지 않음
+    assert outbox.enqueue("tok", "진료 알림", "곧 시작합니다", {"room": 1}) == (first, True)
+
+    _age(outbox, "sent_at", 61)
+    second, coalesced = outbox.enqueue("tok", "진료 알림", "곧 시작합니다", {"room": 1})
+    assert not coalesced and second != first
+    assert outbox.stats()["coalesced"] == 2
+
+
+def test_pending_rows_survive_restart(tmp_path, fcm):
+    before = _outbox(tmp_path)
+    ids = [before.enqueue(f"tok-{i}", "알림", "본문")[0] for i in range(3)]
+    before._conn.close()
+
+    after = _outbox(tmp_path)
+    assert after.stats()["queue_depth"] == 3
+    assert _drain(after) == 3
+    assert fcm.sent == [["tok-0", "tok-1", "tok-2"]]
+    assert {_row(after, i)["status"] for i in ids} == {"sent"}
+    assert after.stats()["queue_depth"] == 0
+
+
+def test_transient_errors_back_off_and_permanent_errors_drop(tmp_path, fcm):
+    outbox = _outbox(tmp_path, max_attempts=3)
+    flaky = outbox.enqueue("tok-flaky", "알림", "본문")[0]
+    invalid = outbox.enqueue("tok-invalid", "알림", "본문")[0]
+    fcm.results = [[
+        {"success": False, "transient": True, "error": "UNAVAILABLE"},
+        {"success": False, "transient": False, "error": "UNREGISTERED"},
+    ]]
+
+    started = time.time()
+    assert _drain(outbox) == 2
+    assert _row(outbox, invalid)["status"] == "failed"
+    row = _row(outbox, flaky)
+    assert (row["status"], row["attempts"], row["error"]) == ("pending", 1, "UNAVAILABLE")
+    assert row["available_at"] >= started + 2.0
+    # 미룬 시간이 지나기 전에는 다시 꺼내지 않음
+    assert _drain(outbox) == 0
+
+    # 두 번째 실패는 간격이 두 배, 예외로 실패한 배치도 일시적 오류로 봄
+    _age(outbox, "available_at", 2.0)
+    fcm.results = [RuntimeError("connection reset")]
+    assert _drain(outbox) == 1
+    row = _row(outbox, flaky)
+    assert (row["status"], row["attempts"]) == ("pending", 2)
+    assert row["available_at"] >= time.time() + 3.0
+
+    # max_attempts 번째에도 실패하면 더 보내지 않음
+    _age(outbox, "available_at", 4.0)
+    fcm.results = [[{"success": False, "transient": True, "error": "UNAVAILABLE"}]]
+    assert _drain(outbox) == 1
+    assert (_row(outbox, flaky)["status"], _row(outbox, flaky)["attempts"]) == ("failed", 3)
+    assert fcm.sent == [["tok-flaky", "tok-invalid"], ["tok-flaky"], ["tok-flaky"]]
+    assert outbox.stats()["failed_stored"] == 2
+
+
+def test_row_with_expired_lease_is_reclaimed(tmp_path, fcm):
+    outbox = _outbox(tmp_path)
+    notification_id = outbox.enqueue("tok", "알림", "본문")[0]
+
+    # 가져간 워커가 보내기 전에 죽음 → sending 으로 남음
+    assert [row[0] for row in outbox._claim(10)] == [notification_id]
+    assert outbox._claim(10) == []
+    assert outbox.stats()["in_flight"] == 1
+
+    _age(outbox, "claimed_at", CLAIM_LEASE + 1)
+    assert _drain(outbox) == 1
+    assert _row(outbox, notification_id)["status"] == "sent"
+    assert fcm.sent == [["tok"]]
@@ -0,0 +1,90 @@
+# tests/test_templating.py
+# 🖼 화면 / 정적 파일 캐시: render_cached 의 ETag → 304, 해시 주소만 immutable, gzip 은 Accept-Encoding 이 허용할 때만
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.templating import HashedStaticFiles
+from app.main import app
+from tests.conftest import bearer
+
+client = TestClient(app)
+
+STYLE = ("body { color: #333; }\n" * 100).encode()
+
+
+@pytest.mark.parametrize("path, token", [("/login", None), ("/admin/manage", "admin")])
+def test_cached_page_returns_304_for_matching_etag(path, token, admin_token):
+    headers = bearer(admin_token) if token else {}
+    first = client.get(path, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    again = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b"" and again.headers["etag"] == etag
+
+    stale = client.get(path, headers={**headers, "If-None-Match": '"stale"'})
+    assert stale.status_code == 200 and stale.content == first.content
+
+
+@pytest.fixture
+def static(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.css").write_bytes(STYLE)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG" + bytes(2000))
+    files = HashedStaticFiles(directory=str(tmp_path), max_age=31536000)
+    site = FastAPI()
+    site.mount("/static", files, name="static")
+    return files, TestClient(site)
+
+
+def test_only_hashed_urls_are_immutable(static):
+    files, site = static
+    hashed = files.url("/css/site.css")
+    assert hashed.startswith("/static/css/site.") and hashed != "/static/css/site.css"
+
+    response = site.get(hashed, headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+    response = site.get("/static/css/site.css", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert "immutable" not in response.headers["cache-control"]
+    assert response.content == STYLE
+
+    # 모르는 파일 / 다른 해시는 원래 주소로 취급 (immutable 아님)
+    assert site.get("/static/css/site.00000000.css").status_code == 404
+    assert files.url("missing.js") == "/static/missing.js"
+
+
+def test_gzip_only_when_accept_encoding_allows(static):
+    files, site = static
+    hashed = files.url("css/site.css")
+
+    plain = site.get(hashed, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert plain.content == STYLE
+
+    for refused in ("gzip;q=0", "br, gzip; q=0.0", "deflate, *;q=0"):
+        response = site.get(hashed, headers={"Accept-Encoding": refused})
+        assert "content-encoding" not in response.headers, refused
+
+    zipped = site.get(hashed, headers={"Accept-Encoding": "gzip, deflate"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["vary"] == "Accept-Encoding"
+    assert zipped.headers["content-type"].startswith("text/css")
+    assert int(zipped.headers["content-length"]) < len(STYLE)
+    assert zipped.content == STYLE  # httpx 가 풀어서 돌려줌
+    assert site.get(hashed, headers={"Accept-Encoding": "br;q=1, *;q=0.5"}).headers["content-encoding"] == "gzip"
+
+    # gzip 본의 ETag 로 다시 물으면 304
+    again = site.get(hashed, headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]})
+    assert again.status_code == 304
+
+    # 이미 압축된 형식은 gzip 본을 만들지 않음
+    logo = site.get(files.url("logo.png"), headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in logo.headers and "vary" not in logo.headers
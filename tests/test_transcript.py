@@ -0,0 +1,55 @@
+# tests/test_transcript.py
+# 📝 통화 발화 WebSocket: 잘못된 메시지는 오류만 돌려주고 연결 / 버퍼는 유지, 끊기면 남은 발화 저장
+# TestClient 는 연결을 닫자마자 핸들러 태스크를 취소해서 finally 의 저장이 중간에 끊길 수 있으므로
+# 핸들러를 가짜 WebSocket 으로 직접 돌린다.
+
+import asyncio
+import json
+
+from app.test_api import stream_video_text
+
+
+class FakeWebSocket:
+    def __init__(self, frames):
+        self._frames = list(frames) + [{"type": "websocket.disconnect", "code": 1000}]
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def receive(self):
+        return self._frames.pop(0)
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+
+def _text(data) -> dict:
+    return {"type": "websocket.receive", "text": data if isinstance(data, str) else json.dumps(data)}
+
+
+def _chunk_writes(firestore):
+    chunks = firestore.collection.return_value.document.return_value.collection.return_value
+    return [call.args[0] for call in chunks.document.return_value.set.call_args_list]
+
+
+def test_bad_messages_get_error_frame_and_buffer_is_flushed_on_close(firestore):
+    websocket = FakeWebSocket([
+        _text({"text": "어디가 아프세요?"}),
+        _text("not json"),
+        _text("[1, 2]"),
+        _text('"text"'),
+        _text({"text": 3}),
+        _text({"role": "nurse", "text": "hi"}),
+        {"type": "websocket.receive", "bytes": b"\xff\xfe"},
+        _text({"role": "patient", "text": "머리가 아파요"}),
+    ])
+    asyncio.run(stream_video_text(websocket, "room-1", role="doctor"))
+
+    assert websocket.sent[0] == {"seq": 1}
+    assert all("error" in frame for frame in websocket.sent[1:-1])
+    assert len(websocket.sent) == 8
+    assert websocket.sent[-1] == {"seq": 2}
+
+    writes = _chunk_writes(firestore)
+    assert [item["text"] for chunk in writes for item in chunk["items"]] == ["어디가 아프세요?", "머리가 아파요"]
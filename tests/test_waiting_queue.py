@@ -0,0 +1,165 @@
+# tests/test_waiting_queue.py
+# 📡 실시간 대기열: 감시 루프 하나가 여러 구독자에게 나눠 주는지 / 보건소 경계 / 희소 인덱스 (해결된 신청은 읽지 않음)
+
+import asyncio
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import waiting_queue
+from app.services.care_request_service import waiting_fields
+from app.services.waiting_queue import DepartmentWatcher
+from app.utils.request_profile import end_profile, start_profile
+from scripts.backfill_waiting_index import backfill
+from tests.conftest import HOSPITAL_ID, bearer
+
+client = TestClient(app)
+
+
+def _item(consultation_id: str) -> dict:
+    return {"consultation_id": consultation_id, "name": consultation_id}
+
+
+def test_one_poll_fans_out_to_every_subscriber():
+    calls = []
+    state = {"1": _item("1")}
+
+    def loader(hospital_id, department):
+        calls.append((hospital_id, department))
+        return dict(state)
+
+    async def scenario():
+        watcher = DepartmentWatcher(HOSPITAL_ID, "내과", interval=0.01, loader=loader)
+        subscribers = [watcher.subscribe() for _ in range(500)]
+        snapshots = await asyncio.gather(*(s.queue.get() for s in subscribers))
+
+        polls_before = watcher.polls
+        state["2"] = _item("2")
+        added = await asyncio.gather(*(s.queue.get() for s in subscribers))
+        polls = watcher.polls - polls_before
+        watcher.stop()
+        return snapshots, added, polls
+
+    snapshots, added, polls = asyncio.run(scenario())
+    assert all(event["type"] == "snapshot" and len(event["items"]) == 1 for event in snapshots)
+    assert all(event["type"] == "add" and event["item"]["consultation_id"] == "2" for event in added)
+    # 구독자 500명에게 나눠 준 변경 한 번에 조회는 한두 번 (구독자 수와 무관)
+    assert 1 <= polls <= 2
+    assert set(calls) == {(HOSPITAL_ID, "내과")}
+
+
+def _put(aws, request_id, hospital_id, patient_id, department="내과", is_solved=False, indexed=True):
+    item = {
+        "request_id": request_id, "hospital_id": hospital_id, "department": department,
+        "patient_id": patient_id, "is_solved": is_solved,
+    }
+    aws.Table("care_requests").put_item(Item=dict(item, **waiting_fields(item)) if indexed else item)
+
+
+def _patients(firestore, *patient_ids):
+    docs = []
+    for patient_id in patient_ids:
+        doc = mock.Mock(id=patient_id, exists=True)
+        doc.to_dict.return_value = {"name": patient_id}
+        docs.append(doc)
+    firestore.get_all.return_value = docs
+
+
+def test_load_waiting_only_returns_own_hospital(aws, firestore):
+    _put(aws, 601, HOSPITAL_ID, "wq-own")
+    _put(aws, 602, HOSPITAL_ID + 1, "wq-other")
+    _patients(firestore, "wq-own", "wq-other")
+
+    assert list(waiting_queue.load_waiting(HOSPITAL_ID, "내과")) == ["601"]
+
+
+def test_consultation_list_uses_session_not_query(aws, firestore, doctor_token):
+    _put(aws, 611, HOSPITAL_ID, "wq-page")
+    _put(aws, 612, HOSPITAL_ID + 1, "wq-page-other")
+    _patients(firestore, "wq-page", "wq-page-other")
+
+    try:
+        response = client.get("/doctor/consultation/json?department=외과", headers=bearer(doctor_token))
+        assert [item["consultation_id"] for item in response.json()["data"]] == ["611"]
+
+        page = client.get("/doctor/consultation?department=외과", headers=bearer(doctor_token))
+        assert page.status_code == 200
+        assert "wq-page" in page.text and "wq-page-other" not in page.text
+        assert list(waiting_queue._watchers) == [(HOSPITAL_ID, "내과")]
+    finally:
+        waiting_queue._watchers.clear()
+
+
+def _load_with_profile(hospital_id, department):
+    profile, token = start_profile()
+    try:
+        return waiting_queue.load_waiting(hospital_id, department), profile
+    finally:
+        end_profile(token)
+
+
+def test_load_waiting_reads_only_waiting_requests_of_that_center(aws, firestore):
+    for request_id in range(700, 760):
+        _put(aws, request_id, HOSPITAL_ID, f"wq-solved-{request_id}", is_solved=True)
+    for request_id in range(760, 790):
+        _put(aws, request_id, HOSPITAL_ID + 1, f"wq-other-{request_id}")
+        _put(aws, request_id + 100, HOSPITAL_ID, f"wq-dept-{request_id}", department="외과")
+    for request_id in (791, 792, 793):
+        _put(aws, request_id, HOSPITAL_ID, f"wq-{request_id}")
+    _patients(firestore, "wq-791", "wq-792", "wq-793")
+
+    waiting, profile = _load_with_profile(HOSPITAL_ID, "내과")
+    assert sorted(waiting) == ["791", "792", "793"]
+    # 해결된 / 다른 보건소 / 다른 진료과 신청은 인덱스에 없으므로 훑은 수 == 돌려준 수
+    assert profile.dynamodb_scanned == profile.dynamodb_returned == 3
+
+
+def test_finishing_consultation_drops_request_from_waiting(aws, firestore, doctor_token):
+    _put(aws, 801, HOSPITAL_ID, "wq-801")
+    _put(aws, 802, HOSPITAL_ID, "wq-802")
+    _patients(firestore, "wq-801", "wq-802")
+
+    response = client.post("/api/prescription/batch", headers=bearer(doctor_token), json={
+        "patient_id": "wq-801", "disease_code": "J00", "consultation_id": "801",
+        "items": [{"medication_code": "M1", "days": 3}],
+    })
+    assert response.status_code == 200
+
+    request = aws.Table("care_requests").get_item(Key={"request_id": 801})["Item"]
+    assert request["is_solved"] is True and "waiting_key" not in request
+    waiting, profile = _load_with_profile(HOSPITAL_ID, "내과")
+    assert list(waiting) == ["802"]
+    assert profile.dynamodb_scanned == 1
+
+
+def test_other_centers_request_is_not_solved_and_nothing_is_saved(aws, firestore, doctor_token):
+    _put(aws, 811, HOSPITAL_ID + 1, "wq-811")
+
+    for consultation_id in (811, 999):
+        response = client.post("/api/prescription/batch", headers=bearer(doctor_token), json={
+            "patient_id": "wq-811", "disease_code": "J00", "consultation_id": consultation_id,
+            "items": [{"medication_code": "M1", "days": 3}],
+        })
+        assert response.status_code == 404
+
+    assert "waiting_key" in aws.Table("care_requests").get_item(Key={"request_id": 811})["Item"]
+    assert "Item" not in aws.Table("care_requests").get_item(Key={"request_id": 999})
+    assert aws.Table("diagnosis_records").scan()["Count"] == 0
+    assert aws.Table("prescription_records").scan()["Count"] == 0
+
+
+def test_backfill_indexes_legacy_waiting_requests(aws, firestore):
+    _put(aws, 821, HOSPITAL_ID, "wq-821", indexed=False)
+    _put(aws, 822, HOSPITAL_ID, "wq-822", is_solved=True, indexed=False)
+    aws.Table("care_requests").update_item(
+        Key={"request_id": 822}, UpdateExpression="SET waiting_key = :key", ExpressionAttributeValues={":key": "1#내과"},
+    )
+    _patients(firestore, "wq-821", "wq-822")
+    assert waiting_queue.load_waiting(HOSPITAL_ID, "내과") == {"822": mock.ANY}
+
+    assert backfill(dry_run=True) == {"set": 1, "removed": 1}
+    counts = backfill(dry_run=False)
+    assert (counts["set"], counts["removed"]) == (1, 1)
+    assert list(waiting_queue.load_waiting(HOSPITAL_ID, "내과")) == ["821"]
+    assert backfill(dry_run=False) == {"unchanged": 2}